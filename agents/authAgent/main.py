@@ -5,17 +5,24 @@
 - 포트: 8006
 """
 import os
+import sys
+import time
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from contextlib import asynccontextmanager
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
-import httpx
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import setup_metrics, http_client, record_token_refresh  # noqa: E402
+from common.tracing import setup_tracing  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -26,7 +33,7 @@ logger = logging.getLogger(__name__)
 # 환경변수
 HANSEC_APP_KEY = os.getenv("HANSEC_INVESTMENT_APP_KEY", "")
 HANSEC_APP_SECRET = os.getenv("HANSEC_INVESTMENT_APP_SECRET_KEY", "")
-HANSEC_BASE_URL = "https://openapi.koreainvestment.com:9443"
+HANSEC_BASE_URL = os.getenv("HANSEC_BASE_URL", "https://openapi.koreainvestment.com:9443")
 
 # 토큰 갱신 주기 (23시간 55분 = 86100초)
 TOKEN_REFRESH_INTERVAL = 86100
@@ -97,8 +104,9 @@ class AuthTokenManager:
         retry_delay = 30  # 초
         
         while retry_count < max_retries:
+            attempt_started = time.perf_counter()
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with http_client(timeout=30.0) as client:
                     response = await client.post(url, json=payload)
                     
                     if response.status_code == 200:
@@ -121,6 +129,7 @@ class AuthTokenManager:
                                 expires_in = data.get("expires_in", 86400)
                                 self.expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
                         
+                        record_token_refresh(time.perf_counter() - attempt_started, True)
                         logger.info(f"Token issued successfully, expires at: {self.expires_at}")
                         return True
                     else:
@@ -129,6 +138,7 @@ class AuthTokenManager:
             except Exception as e:
                 logger.error(f"Token issue error: {str(e)}")
             
+            record_token_refresh(time.perf_counter() - attempt_started, False)
             retry_count += 1
             if retry_count < max_retries:
                 logger.info(f"Retrying token issue in {retry_delay} seconds... ({retry_count}/{max_retries})")
@@ -229,6 +239,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+setup_metrics(app)
+setup_tracing(app, "auth-agent")
 
 
 @app.get("/result/auth-token", response_model=TokenResponse)
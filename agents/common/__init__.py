@@ -0,0 +1,3 @@
+"""
+에이전트 공용 모듈
+"""
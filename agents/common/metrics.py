@@ -0,0 +1,263 @@
+"""
+공용 메트릭 (Prometheus)
+- GET /metrics 노출 및 라우트별 요청 지연 히스토그램
+- 외부 호출 지연 (한국투자증권 TR_ID / OpenAI 모델 / S3 작업 / 에이전트 간 호출)
+- 캐시 적중률, 큐 길이, 이벤트 루프 지연, 토큰 발급 시간, LLM 토큰 사용/절약량
+- 외부 호출은 추적 span 도 함께 기록 (에이전트 간 호출에는 traceparent 헤더 전달)
+"""
+import os
+import re
+import time
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from .tracing import TRACEPARENT_HEADER, span, start_span
+
+# 이벤트 루프 지연 측정 주기 (초)
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "quartz_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("quartz_http_requests_in_flight", "HTTP requests being processed")
+OUTBOUND_SECONDS = Histogram(
+    "quartz_outbound_request_duration_seconds",
+    "Outbound call latency (service: kis/openai/s3/agent name, operation: TR_ID/model/S3 operation/path)",
+    ["service", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter("quartz_cache_requests", "Cache lookups", ["cache", "result"])
+CACHE_HIT_RATIO = Gauge("quartz_cache_hit_ratio", "Cache hit ratio since process start", ["cache"])
+QUEUE_DEPTH = Gauge("quartz_queue_depth", "Items waiting in an internal queue", ["queue"])
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "quartz_event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the event loop",
+    buckets=LAG_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "quartz_llm_tokens",
+    "LLM tokens used, or saved by reusing a cached result (kind: prompt/completion, source: called/cached)",
+    ["model", "kind", "source"],
+)
+LLM_SAVED_SECONDS = Counter("quartz_llm_saved_seconds", "LLM wait time saved by cached results", ["model"])
+TOKEN_REFRESH_SECONDS = Histogram(
+    "quartz_token_refresh_duration_seconds",
+    "Access token issue/refresh latency",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# 호스트 → 서비스 이름 (에이전트 간 호출 및 외부 API 구분)
+_SERVICE_URL_ENVS = {
+    "HANSEC_BASE_URL": "kis",
+    "AUTH_AGENT_URL": "auth-agent",
+    "MACRO_AGENT_URL": "macro-agent",
+    "TICKER_SELECTOR_URL": "ticker-selector",
+    "TECHNICAL_AGENT_URL": "technical-agent",
+    "PORTFOLIO_MANAGER_URL": "portfolio-manager",
+    "TRADING_AGENT_URL": "trading-agent",
+    "ECOS_BASE_URL": "ecos",
+    "FRED_BASE_URL": "fred",
+    "WORLD_BANK_BASE_URL": "worldbank",
+    "GEMINI_BASE_URL": "gemini",
+}
+_DEFAULT_SERVICE_HOSTS = {
+    "openapi.koreainvestment.com": "kis",
+    "ecos.bok.or.kr": "ecos",
+    "api.stlouisfed.org": "fred",
+    "api.worldbank.org": "worldbank",
+    "generativelanguage.googleapis.com": "gemini",
+}
+
+# traceparent 헤더를 전달할 내부 서비스
+INTERNAL_SERVICES = {
+    "auth-agent", "macro-agent", "ticker-selector", "technical-agent", "portfolio-manager", "trading-agent"
+}
+
+# 식별자/API 키 경로 조각 (숫자, 긴 16진수, 20자 이상 영숫자)
+_ID_SEGMENT = re.compile(r"\d+|[0-9a-fA-F-]{16,}|[A-Za-z0-9_]{20,}")
+_cache_counts: Dict[str, list] = {}
+
+
+def _build_service_hosts() -> Dict[str, str]:
+    hosts = dict(_DEFAULT_SERVICE_HOSTS)
+    for env, service in _SERVICE_URL_ENVS.items():
+        netloc = urlsplit(os.getenv(env, "")).netloc
+        if netloc:
+            hosts[netloc] = service
+    return hosts
+
+
+SERVICE_HOSTS = _build_service_hosts()
+
+
+def _normalize_path(path: str) -> str:
+    """종목코드/주문번호/API 키 등 식별자 경로는 {id} 로 치환 (라벨 수 제한)"""
+    return "/".join("{id}" if _ID_SEGMENT.fullmatch(seg) else seg for seg in path.split("/"))
+
+
+def _classify(request: httpx.Request):
+    """외부 요청 → (서비스, 작업)"""
+    tr_id = request.headers.get("tr_id")
+    if tr_id:
+        return "kis", tr_id
+    host = request.url.netloc.decode("ascii")
+    service = SERVICE_HOSTS.get(host) or SERVICE_HOSTS.get(request.url.host) or request.url.host
+    return service, f"{request.method} {_normalize_path(request.url.path)}"
+
+
+# ==================== 외부 호출 ====================
+
+class OutboundTransport(httpx.AsyncBaseTransport):
+    """요청별 지연을 기록하는 httpx 전송 계층"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs):
+        self._transport = transport or httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        service, operation = _classify(request)
+        started = time.perf_counter()
+        outcome = "error"
+        with span(f"{service} {operation}", kind="client", service=service) as sp:
+            if service in INTERNAL_SERVICES:
+                request.headers[TRACEPARENT_HEADER] = sp.traceparent
+            try:
+                response = await self._transport.handle_async_request(request)
+                outcome = "ok" if response.status_code < 400 else f"http_{response.status_code // 100}xx"
+                return response
+            finally:
+                sp.set_attribute("outcome", outcome)
+                OUTBOUND_SECONDS.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def http_client(*, verify=True, **kwargs) -> httpx.AsyncClient:
+    """지연 기록이 켜진 httpx.AsyncClient (httpx.AsyncClient 와 같은 인자)"""
+    return httpx.AsyncClient(transport=OutboundTransport(verify=verify), **kwargs)
+
+
+@contextmanager
+def track_outbound(service: str, operation: str) -> Iterator[None]:
+    """SDK 호출 등 httpx 밖의 외부 호출 지연 기록 (예: OpenAI 모델별)"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"{service} {operation}", kind="client", service=service):
+            yield
+        outcome = "ok"
+    finally:
+        OUTBOUND_SECONDS.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+def instrument_s3(client):
+    """boto3 S3 클라이언트의 작업별 지연 기록"""
+    def before_call(context, model, **kwargs):
+        context["quartz_started"] = time.perf_counter()
+        context["quartz_span"] = start_span(f"s3 {model.name}", kind="client", attributes={"service": "s3"})
+
+    def after_call(context, model, http_response=None, **kwargs):
+        started = context.pop("quartz_started", None)
+        if started is None:
+            return
+        status = getattr(http_response, "status_code", 0) or 0
+        outcome = "ok" if status and status < 400 else (f"http_{status // 100}xx" if status else "error")
+        OUTBOUND_SECONDS.labels("s3", model.name, outcome).observe(time.perf_counter() - started)
+        context.pop("quartz_span").end("ok" if outcome == "ok" else "error")
+
+    client.meta.events.register("before-call.s3", before_call)
+    client.meta.events.register("after-call.s3", after_call)
+    client.meta.events.register("after-call-error.s3", after_call)
+    return client
+
+
+# ==================== 캐시 / 큐 / 토큰 / LLM ====================
+
+def record_cache(cache: str, hit: bool):
+    """캐시 조회 결과 기록"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+    counts = _cache_counts.setdefault(cache, [0, 0])
+    counts[0 if hit else 1] += 1
+    CACHE_HIT_RATIO.labels(cache).set(counts[0] / (counts[0] + counts[1]))
+
+
+def track_queue_depth(queue: str, depth: Callable[[], float]):
+    """수집 시점에 depth() 값을 큐 길이로 노출"""
+    QUEUE_DEPTH.labels(queue).set_function(depth)
+
+
+def record_llm_usage(model: str, prompt_tokens: int, completion_tokens: int, cached: bool = False, seconds: float = 0.0):
+    """LLM 토큰 사용량 기록 (cached=True 면 캐시 재사용으로 절약한 양, seconds 는 절약한 대기 시간)"""
+    source = "cached" if cached else "called"
+    LLM_TOKENS.labels(model, "prompt", source).inc(prompt_tokens)
+    LLM_TOKENS.labels(model, "completion", source).inc(completion_tokens)
+    if cached:
+        LLM_SAVED_SECONDS.labels(model).inc(seconds)
+
+
+def record_token_refresh(seconds: float, ok: bool):
+    """토큰 발급/갱신 소요 시간 기록"""
+    TOKEN_REFRESH_SECONDS.labels("ok" if ok else "error").observe(seconds)
+
+
+# ==================== FastAPI 연동 ====================
+
+async def _monitor_event_loop():
+    """이벤트 루프가 예정보다 늦게 깨어난 시간 기록"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - started - EVENT_LOOP_LAG_INTERVAL))
+
+
+def setup_metrics(app: FastAPI):
+    """/metrics 엔드포인트, 요청 지연 미들웨어, 이벤트 루프 지연 측정 등록"""
+
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                str(status)
+            ).observe(time.perf_counter() - started)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app_):
+        monitor = asyncio.create_task(_monitor_event_loop())
+        try:
+            async with original_lifespan(app_) as state:
+                yield state
+        finally:
+            monitor.cancel()
+
+    app.router.lifespan_context = lifespan
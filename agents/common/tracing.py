@@ -0,0 +1,240 @@
+"""
+공용 분산 추적 (경량)
+- W3C traceparent 형식으로 trace id / span id 전파 (HTTP 헤더, WebSocket 주문 메시지)
+- 현재 span 은 contextvars 로 관리 (태스크 경계에서 자동 전달)
+- TRACE_DIR 가 지정되면 span 을 <TRACE_DIR>/<서비스>-<pid>.jsonl 에 한 줄씩 기록
+  (필드 이름은 OTLP 기준: traceId / spanId / parentSpanId / startTimeUnixNano / endTimeUnixNano)
+- 기록된 span 은 scripts/trace_view.py 로 트리 및 임계 경로 확인
+"""
+import os
+import json
+import time
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from fastapi import FastAPI, Request
+
+# span 기록 디렉터리 (비어 있으면 전파만 하고 기록하지 않음)
+TRACE_DIR = os.getenv("TRACE_DIR", "")
+
+# 추적하지 않는 경로 (프로브 / 메트릭 수집)
+UNTRACED_PATH_PREFIXES = ("/health", "/metrics")
+
+TRACEPARENT_HEADER = "traceparent"
+
+_service_name = os.getenv("SERVICE_NAME", "unknown")
+_current_span: ContextVar[Optional["Span"]] = ContextVar("quartz_current_span", default=None)
+
+
+def _parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """'00-<trace_id>-<span_id>-<flags>' → (trace_id, span_id)"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2]
+
+
+class Span:
+    """추적 구간"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind", "service",
+        "attributes", "start_ns", "end_ns", "status", "error"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: str,
+        attributes: Dict[str, Any]
+    ):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.service = _service_name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        """하위 호출에 전달할 traceparent 값"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, status: str = "ok", error: Optional[str] = None):
+        """구간 종료 및 기록 (두 번째 호출부터는 무시)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.status = status
+        self.error = error
+        _writer.write(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": self.service,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _SpanWriter:
+    """span 을 JSON Lines 파일로 기록 (프로세스별 파일, 스레드 안전)"""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, span: Span):
+        if not self._directory:
+            return
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self._directory, exist_ok=True)
+                path = os.path.join(self._directory, f"{_service_name}-{os.getpid()}.jsonl")
+                self._file = open(path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line)
+
+
+_writer = _SpanWriter(TRACE_DIR)
+
+
+# ==================== span API ====================
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """현재 span 의 traceparent (없으면 None)"""
+    span = _current_span.get()
+    return span.traceparent if span else None
+
+
+def start_span(
+    name: str,
+    *,
+    parent: Union[Span, str, None] = None,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None
+) -> Span:
+    """
+    span 시작 (현재 span 으로 설정하지 않음, end() 로 종료)
+    parent: Span / traceparent 문자열 / None (현재 span)
+    """
+    if isinstance(parent, Span):
+        parsed = (parent.trace_id, parent.span_id)
+    elif isinstance(parent, str):
+        parsed = _parse_traceparent(parent)
+    else:
+        current = _current_span.get()
+        parsed = (current.trace_id, current.span_id) if current else None
+
+    if parsed:
+        trace_id, parent_id = parsed
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+    return Span(name, trace_id, parent_id, kind, dict(attributes or {}))
+
+
+@contextmanager
+def activate(span: Span) -> Iterator[Span]:
+    """span 을 현재 span 으로 설정 (종료는 호출자가 담당)"""
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(
+    name: str,
+    *,
+    parent: Union[Span, str, None] = None,
+    kind: str = "internal",
+    **attributes: Any
+) -> Iterator[Span]:
+    """span 시작 → 현재 span 으로 설정 → 블록 종료 시 기록 (예외는 error 로 기록)"""
+    sp = start_span(name, parent=parent, kind=kind, attributes=attributes)
+    token = _current_span.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.end("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        sp.end()
+
+
+def traced(name: str):
+    """비동기 함수 전체를 span 으로 감싸는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==================== FastAPI 연동 ====================
+
+def setup_tracing(app: FastAPI, service: str):
+    """서비스 이름 지정 및 요청별 server span 생성 (traceparent 헤더를 부모로 사용)"""
+    global _service_name
+    _service_name = service
+
+    @app.middleware("http")
+    async def trace_request(request: Request, call_next):
+        path = request.url.path
+        if path.startswith(UNTRACED_PATH_PREFIXES):
+            return await call_next(request)
+
+        sp = start_span(
+            f"{request.method} {path}",
+            parent=request.headers.get(TRACEPARENT_HEADER),
+            kind="server",
+            attributes={"http.method": request.method, "http.target": path}
+        )
+        token = _current_span.set(sp)
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            _current_span.reset(token)
+            route = request.scope.get("route")
+            if route is not None:
+                sp.name = f"{request.method} {route.path}"
+            sp.set_attribute("http.status_code", status)
+            sp.end("ok" if status < 500 else "error")
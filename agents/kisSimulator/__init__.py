@@ -0,0 +1 @@
+"""KIS Simulator Package"""
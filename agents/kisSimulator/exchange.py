@@ -0,0 +1,470 @@
+"""
+모의 거래소 (Matching Engine)
+- 종목별 현재가 랜덤워크 (KRX 호가단위 반영)
+- 시장가 주문은 현재가로 즉시 체결, 지정가 주문은 가격 도달 시 체결
+- 분할 체결(체결 단위 지정) 지원
+- 계좌 예수금/보유수량/미체결 주문 관리
+- 체결/취소 발생 시 리스너에 통보
+"""
+import hashlib
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+
+SIDE_SELL = "01"
+SIDE_BUY = "02"
+
+ORD_DVSN_LIMIT = "00"
+ORD_DVSN_MARKET = "01"
+
+# 기본 종목 (이름, 기준가)
+DEFAULT_INSTRUMENTS = {
+    "005930": ("삼성전자", 71000),
+    "000660": ("SK하이닉스", 178000),
+    "373220": ("LG에너지솔루션", 372000),
+    "207940": ("삼성바이오로직스", 780000),
+    "005380": ("현대차", 245000),
+    "035420": ("NAVER", 188000),
+    "035720": ("카카오", 41000),
+    "051910": ("LG화학", 310000),
+    "006400": ("삼성SDI", 320000),
+    "068270": ("셀트리온", 182000),
+}
+
+
+class ExchangeError(Exception):
+    """주문/조회 거부 (한국투자증권 msg_cd 형식)"""
+
+    def __init__(self, msg_cd: str, msg1: str):
+        super().__init__(msg1)
+        self.msg_cd = msg_cd
+        self.msg1 = msg1
+
+
+def tick_size(price: float) -> int:
+    """KRX 호가단위"""
+    if price < 2000:
+        return 1
+    if price < 5000:
+        return 5
+    if price < 20000:
+        return 10
+    if price < 50000:
+        return 50
+    if price < 200000:
+        return 100
+    if price < 500000:
+        return 500
+    return 1000
+
+
+def round_to_tick(price: float) -> int:
+    """호가단위로 반올림"""
+    tick = tick_size(price)
+    return max(tick, int(round(price / tick)) * tick)
+
+
+def _ticker_seed(seed: int, ticker: str) -> int:
+    digest = hashlib.sha256(f"{seed}:{ticker}".encode()).hexdigest()
+    return int(digest[:12], 16)
+
+
+@dataclass
+class Instrument:
+    """종목 시세"""
+    ticker: str
+    name: str
+    price: int
+    prev_close: int
+    open: int
+    high: int
+    low: int
+    volume: int = 0
+    prev_volume: int = 0
+    history: List[Dict[str, int]] = field(default_factory=list)  # 과거 일봉 (오래된 순)
+
+
+@dataclass
+class SimOrder:
+    """주문"""
+    order_no: str
+    orgno: str
+    ticker: str
+    side: str
+    qty: int
+    price: int
+    ord_dvsn: str
+    created_at: datetime
+    orig_order_no: str = ""
+    filled_qty: int = 0
+    filled_amount: int = 0
+    cancelled_qty: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.qty - self.filled_qty - self.cancelled_qty
+
+    @property
+    def is_open(self) -> bool:
+        return self.remaining > 0
+
+
+@dataclass
+class Position:
+    """보유 종목"""
+    ticker: str
+    qty: int = 0
+    cost: int = 0  # 매입금액 합계
+
+    @property
+    def avg_price(self) -> float:
+        return self.cost / self.qty if self.qty else 0.0
+
+
+class Exchange:
+    """단일 계좌 모의 거래소"""
+
+    def __init__(
+        self,
+        initial_cash: int = 100_000_000,
+        seed: int = 42,
+        volatility: float = 0.002,
+        fill_chunk: int = 0,
+        history_days: int = 400
+    ):
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._volatility = volatility
+        self._fill_chunk = fill_chunk  # 1회 체결 최대 수량 (0: 전량)
+        self._history_days = history_days
+        self._initial_cash = initial_cash
+        self._listeners: List[Callable[[SimOrder, str, int, int], None]] = []
+        self.reset()
+
+    def reset(self):
+        """계좌/시세 초기화"""
+        self.cash = self._initial_cash
+        self.positions: Dict[str, Position] = {}
+        self.orders: Dict[str, SimOrder] = {}
+        self.instruments: Dict[str, Instrument] = {}
+        self._order_seq = 0
+        self.stats = {"orders": 0, "fills": 0, "cancels": 0, "rejects": 0}
+        for ticker in DEFAULT_INSTRUMENTS:
+            self.instrument(ticker)
+
+    def add_listener(self, listener: Callable[[SimOrder, str, int, int], None]):
+        """체결/취소 통보 리스너 등록 (order, kind, qty, price)"""
+        self._listeners.append(listener)
+
+    def _notify(self, order: SimOrder, kind: str, qty: int, price: int):
+        for listener in self._listeners:
+            listener(order, kind, qty, price)
+
+    # ==================== 시세 ====================
+
+    def instrument(self, ticker: str) -> Instrument:
+        """종목 조회 (처음 보는 종목은 결정적으로 생성)"""
+        inst = self.instruments.get(ticker)
+        if inst:
+            return inst
+
+        rng = random.Random(_ticker_seed(self._seed, ticker))
+        name, base = DEFAULT_INSTRUMENTS.get(ticker, (f"SIM{ticker}", rng.randint(5, 300) * 1000))
+        base = round_to_tick(base)
+        prev_volume = rng.randint(100_000, 5_000_000)
+        inst = Instrument(
+            ticker=ticker, name=name, price=base, prev_close=base,
+            open=base, high=base, low=base, prev_volume=prev_volume
+        )
+        inst.history = self._generate_history(rng, base, prev_volume)
+        self.instruments[ticker] = inst
+        return inst
+
+    def _generate_history(self, rng: random.Random, last_close: int, volume: int) -> List[Dict[str, int]]:
+        """전일 종가에서 거꾸로 과거 일봉 생성 (영업일 기준)"""
+        bars = []
+        close = float(last_close)
+        day = datetime.now(KST).date()
+        while len(bars) < self._history_days:
+            day -= timedelta(days=1)
+            if day.weekday() >= 5:
+                continue
+            ret = rng.gauss(0.0003, 0.018)
+            open_ = close / (1 + ret * rng.uniform(0.2, 0.8))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.006)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.006)))
+            bars.append({
+                "date": int(day.strftime("%Y%m%d")),
+                "open": round_to_tick(open_),
+                "high": round_to_tick(high),
+                "low": round_to_tick(low),
+                "close": round_to_tick(close),
+                "volume": int(volume * rng.uniform(0.5, 1.6)),
+            })
+            close = close / (1 + ret)
+        bars.reverse()
+        return bars
+
+    def set_price(self, ticker: str, price: int):
+        """현재가 강제 설정 (급락/급등 시나리오용)"""
+        inst = self.instrument(ticker)
+        self._update_price(inst, round_to_tick(price))
+        self._match(ticker)
+
+    def _update_price(self, inst: Instrument, price: int):
+        inst.price = price
+        inst.high = max(inst.high, price)
+        inst.low = min(inst.low, price)
+
+    def tick(self):
+        """시세 랜덤워크 1스텝 + 미체결 주문 매칭"""
+        for inst in self.instruments.values():
+            move = self._rng.gauss(0, self._volatility)
+            # 상하한가 (전일 종가 ±30%)
+            upper = inst.prev_close * 1.3
+            lower = inst.prev_close * 0.7
+            price = min(upper, max(lower, inst.price * (1 + move)))
+            self._update_price(inst, round_to_tick(price))
+            inst.volume += self._rng.randint(0, max(1, inst.prev_volume // 2000))
+        for ticker in {o.ticker for o in self.orders.values() if o.is_open}:
+            self._match(ticker)
+
+    def daily_chart(self, ticker: str, start: str, end: str, period: str = "D", limit: int = 100) -> List[Dict[str, int]]:
+        """기간별 시세 (최신순)"""
+        inst = self.instrument(ticker)
+        today = int(datetime.now(KST).strftime("%Y%m%d"))
+        bars = inst.history + [{
+            "date": today, "open": inst.open, "high": inst.high,
+            "low": inst.low, "close": inst.price, "volume": inst.volume,
+        }]
+        start_i = int(start or 0)
+        end_i = int(end or today)
+        bars = [b for b in bars if start_i <= b["date"] <= end_i]
+        if period != "D":
+            bars = self._aggregate(bars, period)
+        return list(reversed(bars))[:limit]
+
+    @staticmethod
+    def _aggregate(bars: List[Dict[str, int]], period: str) -> List[Dict[str, int]]:
+        """일봉을 주/월/년봉으로 묶음"""
+        def bucket(d: int):
+            day = date(d // 10000, d // 100 % 100, d % 100)
+            if period == "W":
+                return day.isocalendar()[:2]
+            if period == "M":
+                return (day.year, day.month)
+            return (day.year,)
+
+        grouped: Dict[tuple, Dict[str, int]] = {}
+        for bar in bars:
+            key = bucket(bar["date"])
+            agg = grouped.get(key)
+            if agg is None:
+                grouped[key] = dict(bar)
+            else:
+                agg["date"] = bar["date"]
+                agg["high"] = max(agg["high"], bar["high"])
+                agg["low"] = min(agg["low"], bar["low"])
+                agg["close"] = bar["close"]
+                agg["volume"] += bar["volume"]
+        return list(grouped.values())
+
+    # ==================== 주문 ====================
+
+    def _next_order_no(self) -> str:
+        self._order_seq += 1
+        return f"{self._order_seq:010d}"
+
+    def _reserved_cash(self) -> int:
+        """미체결 매수 주문에 묶인 금액"""
+        total = 0
+        for order in self.orders.values():
+            if order.side == SIDE_BUY and order.is_open:
+                price = order.price or self.instrument(order.ticker).price
+                total += order.remaining * price
+        return total
+
+    def _pending_sell_qty(self, ticker: str) -> int:
+        return sum(
+            o.remaining for o in self.orders.values()
+            if o.ticker == ticker and o.side == SIDE_SELL and o.is_open
+        )
+
+    def orderable_cash(self) -> int:
+        """주문가능현금"""
+        return max(0, self.cash - self._reserved_cash())
+
+    def sellable_qty(self, ticker: str) -> int:
+        """매도가능수량"""
+        position = self.positions.get(ticker)
+        held = position.qty if position else 0
+        return max(0, held - self._pending_sell_qty(ticker))
+
+    def place_order(self, ticker: str, side: str, qty: int, ord_dvsn: str, price: int) -> SimOrder:
+        """주문 접수 (시장가는 즉시 매칭)"""
+        if qty <= 0:
+            self.stats["rejects"] += 1
+            raise ExchangeError("APBK0506", "주문수량을 확인하여 주십시오.")
+        if ord_dvsn != ORD_DVSN_MARKET and price <= 0:
+            self.stats["rejects"] += 1
+            raise ExchangeError("APBK0507", "주문단가를 확인하여 주십시오.")
+
+        inst = self.instrument(ticker)
+        if side == SIDE_BUY:
+            ref_price = price if ord_dvsn != ORD_DVSN_MARKET else inst.price
+            if qty * ref_price > self.orderable_cash():
+                self.stats["rejects"] += 1
+                raise ExchangeError("APBK0952", "주문가능금액을 초과 했습니다")
+        elif qty > self.sellable_qty(ticker):
+            self.stats["rejects"] += 1
+            raise ExchangeError("APBK0400", "주문 가능한 수량을 초과하였습니다.")
+
+        order = SimOrder(
+            order_no=self._next_order_no(),
+            orgno="06010",
+            ticker=ticker,
+            side=side,
+            qty=qty,
+            price=0 if ord_dvsn == ORD_DVSN_MARKET else price,
+            ord_dvsn=ord_dvsn,
+            created_at=datetime.now(KST)
+        )
+        self.orders[order.order_no] = order
+        self.stats["orders"] += 1
+        self._match(ticker)
+        return order
+
+    def cancel_order(self, orig_order_no: str, qty: int, all_qty: bool) -> SimOrder:
+        """취소 (잔량 전부 또는 일부)"""
+        orig = self._open_order(orig_order_no)
+        cancel_qty = orig.remaining if all_qty else min(qty, orig.remaining)
+        if cancel_qty <= 0:
+            raise ExchangeError("APBK0506", "주문수량을 확인하여 주십시오.")
+        orig.cancelled_qty += cancel_qty
+        self.stats["cancels"] += 1
+
+        record = SimOrder(
+            order_no=self._next_order_no(),
+            orgno=orig.orgno,
+            ticker=orig.ticker,
+            side=orig.side,
+            qty=cancel_qty,
+            price=orig.price,
+            ord_dvsn=orig.ord_dvsn,
+            created_at=datetime.now(KST),
+            orig_order_no=orig.order_no,
+            cancelled_qty=cancel_qty
+        )
+        self._notify(record, "cancel", cancel_qty, 0)
+        return record
+
+    def modify_order(self, orig_order_no: str, qty: int, price: int, ord_dvsn: str, all_qty: bool) -> SimOrder:
+        """정정 (잔량을 취소하고 새 가격으로 재접수)"""
+        orig = self._open_order(orig_order_no)
+        new_qty = orig.remaining if all_qty else min(qty, orig.remaining)
+        orig.cancelled_qty += new_qty
+
+        order = SimOrder(
+            order_no=self._next_order_no(),
+            orgno=orig.orgno,
+            ticker=orig.ticker,
+            side=orig.side,
+            qty=new_qty,
+            price=0 if ord_dvsn == ORD_DVSN_MARKET else price,
+            ord_dvsn=ord_dvsn,
+            created_at=datetime.now(KST),
+            orig_order_no=orig.order_no
+        )
+        self.orders[order.order_no] = order
+        self._match(order.ticker)
+        return order
+
+    def _open_order(self, order_no: str) -> SimOrder:
+        order = self.orders.get(order_no)
+        if order is None or not order.is_open:
+            raise ExchangeError("APBK0919", "정정/취소할 수량이 없습니다.")
+        return order
+
+    def open_orders(self) -> List[SimOrder]:
+        """정정취소가능 주문"""
+        return [o for o in self.orders.values() if o.is_open]
+
+    def _match(self, ticker: str):
+        """해당 종목 미체결 주문 체결 처리 (접수 순)"""
+        inst = self.instrument(ticker)
+        for order in list(self.orders.values()):
+            if order.ticker != ticker or not order.is_open:
+                continue
+            if order.ord_dvsn != ORD_DVSN_MARKET:
+                if order.side == SIDE_BUY and inst.price > order.price:
+                    continue
+                if order.side == SIDE_SELL and inst.price < order.price:
+                    continue
+            qty = order.remaining
+            if self._fill_chunk:
+                qty = min(qty, self._fill_chunk)
+            self._fill(order, inst, qty)
+
+    def _fill(self, order: SimOrder, inst: Instrument, qty: int):
+        price = inst.price if order.ord_dvsn == ORD_DVSN_MARKET else order.price
+        amount = qty * price
+        position = self.positions.setdefault(order.ticker, Position(order.ticker))
+
+        if order.side == SIDE_BUY:
+            if amount > self.cash:
+                # 시장가 주문 접수 후 가격 상승으로 잔고 부족 → 가능한 만큼만 체결
+                qty = self.cash // price
+                if qty <= 0:
+                    order.cancelled_qty += order.remaining
+                    self._notify(order, "reject", 0, 0)
+                    return
+                amount = qty * price
+            self.cash -= amount
+            position.qty += qty
+            position.cost += amount
+        else:
+            avg = position.avg_price
+            self.cash += amount
+            position.qty -= qty
+            position.cost = int(round(avg * position.qty))
+            if position.qty <= 0:
+                del self.positions[order.ticker]
+
+        order.filled_qty += qty
+        order.filled_amount += amount
+        inst.volume += qty
+        self.stats["fills"] += 1
+        self._notify(order, "fill", qty, price)
+
+    # ==================== 잔고 ====================
+
+    def holdings(self) -> List[Dict[str, float]]:
+        """보유 종목 평가"""
+        result = []
+        for ticker, position in self.positions.items():
+            inst = self.instrument(ticker)
+            evlu_amt = position.qty * inst.price
+            pfls = evlu_amt - position.cost
+            result.append({
+                "ticker": ticker,
+                "name": inst.name,
+                "qty": position.qty,
+                "sellable": self.sellable_qty(ticker),
+                "avg_price": position.avg_price,
+                "cost": position.cost,
+                "price": inst.price,
+                "evlu_amt": evlu_amt,
+                "pfls_amt": pfls,
+                "pfls_rt": pfls / position.cost * 100 if position.cost else 0.0,
+            })
+        return result
+
+    def max_buy_qty(self, ticker: str, price: int = 0) -> int:
+        """최대 매수가능수량"""
+        unit = price or self.instrument(ticker).price
+        return int(math.floor(self.orderable_cash() / unit)) if unit else 0
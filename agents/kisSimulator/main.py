@@ -0,0 +1,599 @@
+"""
+한국투자증권 OpenAPI 시뮬레이터 (KIS Simulator)
+- 에이전트들이 사용하는 엔드포인트/TR_ID를 로컬에서 흉내냄
+  (oauth2/tokenP, order-cash, order-rvsecncl, inquire-balance, inquire-psbl-*,
+   inquire-daily-itemchartprice, inquire-ccnl, 실시간 체결통보 H0STCNI0)
+- 응답 지연/오류 주입, 초당 호출 수 제한(EGW00201) 재현
+- 각 에이전트의 HANSEC_BASE_URL 을 http://<host>:9443 으로 지정해서 사용
+- 포트: 9443
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Optional, Set
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from exchange import (
+    Exchange, ExchangeError, SimOrder, KST,
+    SIDE_BUY, SIDE_SELL, ORD_DVSN_MARKET
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "agent": "kis-simulator", "message": "%(message)s"}'
+)
+logger = logging.getLogger(__name__)
+
+# 환경변수
+SIM_PORT = int(os.getenv("SIM_PORT", "9443"))
+SIM_SEED = int(os.getenv("SIM_SEED", "42"))
+SIM_INITIAL_CASH = int(os.getenv("SIM_INITIAL_CASH", "100000000"))
+SIM_TICK_SECONDS = float(os.getenv("SIM_TICK_SECONDS", "1.0"))  # 시세 갱신 주기
+SIM_VOLATILITY = float(os.getenv("SIM_VOLATILITY", "0.002"))  # 틱당 변동성
+SIM_FILL_CHUNK = int(os.getenv("SIM_FILL_CHUNK", "0"))  # 1회 체결 최대 수량 (0: 전량)
+SIM_TOKEN_TTL_SECONDS = int(os.getenv("SIM_TOKEN_TTL_SECONDS", "86400"))
+SIM_TOKEN_MIN_INTERVAL = float(os.getenv("SIM_TOKEN_MIN_INTERVAL", "60"))  # 토큰 발급 최소 간격 (EGW00133)
+SIM_STRICT_AUTH = os.getenv("SIM_STRICT_AUTH", "true").lower() == "true"
+
+EXECUTION_NOTICE_TR_ID = "H0STCNI0"
+
+# TR_ID (실전/모의/구 TR_ID 모두 허용)
+TR_BUY = {"TTTC0012U", "TTTC0802U", "VTTC0012U", "VTTC0802U"}
+TR_SELL = {"TTTC0011U", "TTTC0801U", "VTTC0011U", "VTTC0801U"}
+TR_RVSECNCL = {"TTTC0013U", "TTTC0803U", "VTTC0013U", "VTTC0803U"}
+TR_PSBL_RVSECNCL = {"TTTC0084R", "TTTC8036R"}
+TR_BALANCE = {"TTTC8434R", "VTTC8434R"}
+TR_PSBL_ORDER = {"TTTC8908R", "VTTC8908R"}
+TR_PSBL_SELL = {"TTTC8408R"}
+TR_CCNL = {"FHKST01010300"}
+TR_DAILY_CHART = {"FHKST03010100"}
+
+
+class FaultConfig(BaseModel):
+    """지연/오류 주입 설정"""
+    latency_ms: float = float(os.getenv("SIM_LATENCY_MS", "30"))  # 기본 지연
+    jitter_ms: float = float(os.getenv("SIM_JITTER_MS", "20"))  # 지수분포 꼬리 지연 평균
+    error_rate: float = float(os.getenv("SIM_ERROR_RATE", "0"))  # 500 오류 비율
+    timeout_rate: float = float(os.getenv("SIM_TIMEOUT_RATE", "0"))  # 응답 지연(타임아웃 유발) 비율
+    timeout_seconds: float = float(os.getenv("SIM_TIMEOUT_SECONDS", "35"))
+    rate_limit_rps: int = int(os.getenv("SIM_RATE_LIMIT_RPS", "20"))  # appkey당 초당 호출 수 (0: 제한 없음)
+
+
+class PriceUpdate(BaseModel):
+    """현재가 강제 설정 요청"""
+    ticker: str
+    price: int
+
+
+def kis_error(msg_cd: str, msg1: str, status_code: int = 200) -> JSONResponse:
+    """한국투자증권 오류 응답 형식"""
+    return JSONResponse(status_code=status_code, content={"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg1})
+
+
+def kis_ok(msg1: str = "정상처리 되었습니다.", **outputs: Any) -> Dict[str, Any]:
+    """한국투자증권 정상 응답 형식"""
+    return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": msg1, **outputs}
+
+
+class FaultInjector:
+    """응답 지연/오류/호출 수 제한"""
+
+    def __init__(self, config: FaultConfig, seed: int):
+        self.config = config
+        self._rng = random.Random(seed)
+        self._calls: Dict[str, Deque[float]] = {}
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "timeouts": 0}
+
+    def check_rate(self, appkey: str) -> bool:
+        """1초 슬라이딩 윈도우 기준 호출 수 제한"""
+        limit = self.config.rate_limit_rps
+        if limit <= 0:
+            return True
+        now = time.monotonic()
+        window = self._calls.setdefault(appkey, deque())
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        if len(window) >= limit:
+            self.stats["rate_limited"] += 1
+            return False
+        window.append(now)
+        return True
+
+    async def delay(self):
+        """기본 지연 + 꼬리 지연"""
+        seconds = self.config.latency_ms / 1000
+        if self.config.jitter_ms > 0:
+            seconds += self._rng.expovariate(1000 / self.config.jitter_ms)
+        if self.config.timeout_rate and self._rng.random() < self.config.timeout_rate:
+            self.stats["timeouts"] += 1
+            seconds = self.config.timeout_seconds
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        if self.config.error_rate and self._rng.random() < self.config.error_rate:
+            self.stats["errors"] += 1
+            return True
+        return False
+
+
+class TokenIssuer:
+    """접근토큰 발급/검증"""
+
+    def __init__(self):
+        self._tokens: Dict[str, datetime] = {}
+        self._last_issue: Dict[str, float] = {}
+
+    def issue(self, appkey: str) -> Optional[Dict[str, Any]]:
+        """토큰 발급 (최소 간격 내 재요청이면 None)"""
+        now = time.monotonic()
+        last = self._last_issue.get(appkey)
+        if last is not None and now - last < SIM_TOKEN_MIN_INTERVAL:
+            return None
+        self._last_issue[appkey] = now
+
+        token = uuid.uuid4().hex + uuid.uuid4().hex
+        expires_at = datetime.now(KST) + timedelta(seconds=SIM_TOKEN_TTL_SECONDS)
+        self._tokens[token] = expires_at
+        return {
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": SIM_TOKEN_TTL_SECONDS,
+            "access_token_token_expired": expires_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def is_valid(self, authorization: str) -> bool:
+        token = authorization.removeprefix("Bearer ").strip()
+        expires_at = self._tokens.get(token)
+        return expires_at is not None and expires_at > datetime.now(KST)
+
+
+class NoticeHub:
+    """실시간 체결통보 구독자 관리 (암호화 없이 평문 전송)"""
+
+    def __init__(self):
+        self.clients: Set[WebSocket] = set()
+
+    @staticmethod
+    def format_notice(order: SimOrder, kind: str, qty: int, price: int) -> str:
+        """H0STCNI0 필드 순서로 직렬화"""
+        is_fill = kind == "fill"
+        fields = [
+            "SIMUSER", "00000000", order.order_no, order.orig_order_no, order.side,
+            "2" if kind == "cancel" else "0",  # 정정구분
+            order.ord_dvsn, "0", order.ticker,
+            str(qty) if is_fill else "0",
+            str(price) if is_fill else "0",
+            datetime.now(KST).strftime("%H%M%S"),
+            "1" if kind == "reject" else "0",  # 거부여부
+            "2" if is_fill else "1",  # 체결여부
+            "1", order.orgno, str(order.qty), "SIM", order.ticker, "10", "", order.ticker,
+            str(order.price),
+        ]
+        return f"0|{EXECUTION_NOTICE_TR_ID}|001|" + "^".join(fields)
+
+    def publish(self, order: SimOrder, kind: str, qty: int, price: int):
+        if not self.clients:
+            return
+        message = self.format_notice(order, kind, qty, price)
+        for websocket in list(self.clients):
+            asyncio.create_task(self._send(websocket, message))
+
+    async def _send(self, websocket: WebSocket, message: str):
+        try:
+            await websocket.send_text(message)
+        except Exception:
+            self.clients.discard(websocket)
+
+
+# 전역 상태
+exchange = Exchange(
+    initial_cash=SIM_INITIAL_CASH,
+    seed=SIM_SEED,
+    volatility=SIM_VOLATILITY,
+    fill_chunk=SIM_FILL_CHUNK
+)
+faults = FaultInjector(FaultConfig(), SIM_SEED)
+tokens = TokenIssuer()
+notices = NoticeHub()
+exchange.add_listener(notices.publish)
+
+
+async def price_loop():
+    """시세 갱신 루프"""
+    while True:
+        await asyncio.sleep(SIM_TICK_SECONDS)
+        exchange.tick()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 생명주기 관리"""
+    logger.info("KIS Simulator starting...")
+    ticker_task = asyncio.create_task(price_loop())
+    yield
+    logger.info("KIS Simulator shutting down...")
+    ticker_task.cancel()
+
+
+app = FastAPI(
+    title="KIS Simulator",
+    description="한국투자증권 OpenAPI 로컬 시뮬레이터",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    """호출 수 제한 → 지연 → 오류 주입 → 인증 확인 순으로 처리"""
+    path = request.url.path
+    if not (path.startswith("/uapi/") or path.startswith("/oauth2/")):
+        return await call_next(request)
+
+    faults.stats["requests"] += 1
+    appkey = request.headers.get("appkey", "")
+    if path.startswith("/uapi/") and not faults.check_rate(appkey):
+        return kis_error("EGW00201", "초당 거래건수를 초과하였습니다.", status_code=500)
+
+    await faults.delay()
+    if faults.should_fail():
+        return kis_error("EGW00500", "시스템 오류가 발생했습니다.", status_code=500)
+
+    if path.startswith("/uapi/") and SIM_STRICT_AUTH:
+        if not tokens.is_valid(request.headers.get("authorization", "")):
+            return kis_error("EGW00123", "기간이 만료된 token 입니다.", status_code=500)
+
+    return await call_next(request)
+
+
+def _tr_id(request: Request) -> str:
+    return request.headers.get("tr_id", "")
+
+
+def _invalid_tr_id(request: Request) -> JSONResponse:
+    return kis_error("EGW00203", f"TR_ID 값이 올바르지 않습니다. ({_tr_id(request)})", status_code=500)
+
+
+def _ord_tmd(order: SimOrder) -> str:
+    return order.created_at.strftime("%H%M%S")
+
+
+# ==================== 인증 ====================
+
+@app.post("/oauth2/tokenP")
+async def issue_token(body: Dict[str, Any]):
+    """접근토큰 발급"""
+    issued = tokens.issue(body.get("appkey", ""))
+    if issued is None:
+        return JSONResponse(status_code=403, content={
+            "error_description": "접근토큰 발급 잠시 후 다시 시도하세요(1분당 1회)",
+            "error_code": "EGW00133"
+        })
+    return issued
+
+
+@app.post("/oauth2/Approval")
+async def issue_approval_key(body: Dict[str, Any]):
+    """실시간 접속키 발급"""
+    return {"approval_key": str(uuid.uuid4())}
+
+
+# ==================== 주문 ====================
+
+@app.post("/uapi/domestic-stock/v1/trading/order-cash")
+async def order_cash(request: Request, body: Dict[str, Any]):
+    """주식주문(현금)"""
+    tr_id = _tr_id(request)
+    if tr_id in TR_BUY:
+        side = SIDE_BUY
+    elif tr_id in TR_SELL:
+        side = SIDE_SELL
+    else:
+        return _invalid_tr_id(request)
+
+    try:
+        order = exchange.place_order(
+            ticker=body.get("PDNO", ""),
+            side=side,
+            qty=int(body.get("ORD_QTY", 0) or 0),
+            ord_dvsn=body.get("ORD_DVSN", ORD_DVSN_MARKET),
+            price=int(body.get("ORD_UNPR", 0) or 0)
+        )
+    except ExchangeError as e:
+        return kis_error(e.msg_cd, e.msg1)
+
+    return kis_ok(
+        "주문 전송 완료 되었습니다.",
+        output={"KRX_FWDG_ORD_ORGNO": order.orgno, "ODNO": order.order_no, "ORD_TMD": _ord_tmd(order)}
+    )
+
+
+@app.post("/uapi/domestic-stock/v1/trading/order-rvsecncl")
+async def order_rvsecncl(request: Request, body: Dict[str, Any]):
+    """주식주문(정정취소)"""
+    if _tr_id(request) not in TR_RVSECNCL:
+        return _invalid_tr_id(request)
+
+    orig_no = body.get("ORGN_ODNO", "")
+    qty = int(body.get("ORD_QTY", 0) or 0)
+    all_qty = body.get("QTY_ALL_ORD_YN", "Y") == "Y"
+    try:
+        if body.get("RVSE_CNCL_DVSN_CD") == "01":
+            order = exchange.modify_order(
+                orig_no, qty, int(body.get("ORD_UNPR", 0) or 0),
+                body.get("ORD_DVSN", "00"), all_qty
+            )
+        else:
+            order = exchange.cancel_order(orig_no, qty, all_qty)
+    except ExchangeError as e:
+        return kis_error(e.msg_cd, e.msg1)
+
+    return kis_ok(
+        "주문 전송 완료 되었습니다.",
+        output={"KRX_FWDG_ORD_ORGNO": order.orgno, "ODNO": order.order_no, "ORD_TMD": _ord_tmd(order)}
+    )
+
+
+# ==================== 조회 ====================
+
+@app.get("/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl")
+async def inquire_psbl_rvsecncl(request: Request):
+    """주식정정취소가능주문조회"""
+    if _tr_id(request) not in TR_PSBL_RVSECNCL:
+        return _invalid_tr_id(request)
+
+    output = []
+    for order in exchange.open_orders():
+        output.append({
+            "ord_gno_brno": order.orgno,
+            "odno": order.order_no,
+            "orgn_odno": order.orig_order_no,
+            "ord_dvsn_name": "시장가" if order.ord_dvsn == ORD_DVSN_MARKET else "지정가",
+            "pdno": order.ticker,
+            "prdt_name": exchange.instrument(order.ticker).name,
+            "rvse_cncl_dvsn_name": "",
+            "ord_qty": str(order.qty),
+            "ord_unpr": str(order.price),
+            "ord_tmd": _ord_tmd(order),
+            "tot_ccld_qty": str(order.filled_qty),
+            "tot_ccld_amt": str(order.filled_amount),
+            "psbl_qty": str(order.remaining),
+            "sll_buy_dvsn_cd": order.side,
+            "ord_dvsn_cd": order.ord_dvsn,
+        })
+    return kis_ok(output=output, ctx_area_fk100="", ctx_area_nk100="")
+
+
+@app.get("/uapi/domestic-stock/v1/trading/inquire-balance")
+async def inquire_balance(request: Request):
+    """주식잔고조회"""
+    if _tr_id(request) not in TR_BALANCE:
+        return _invalid_tr_id(request)
+
+    output1 = []
+    scts_evlu = 0
+    pchs_total = 0
+    for item in exchange.holdings():
+        scts_evlu += item["evlu_amt"]
+        pchs_total += item["cost"]
+        output1.append({
+            "pdno": item["ticker"],
+            "prdt_name": item["name"],
+            "trad_dvsn_name": "현금",
+            "hldg_qty": str(item["qty"]),
+            "ord_psbl_qty": str(item["sellable"]),
+            "pchs_avg_pric": f"{item['avg_price']:.4f}",
+            "pchs_amt": str(item["cost"]),
+            "prpr": str(item["price"]),
+            "evlu_amt": str(item["evlu_amt"]),
+            "evlu_pfls_amt": str(item["pfls_amt"]),
+            "evlu_pfls_rt": f"{item['pfls_rt']:.2f}",
+        })
+
+    output2 = [{
+        "dnca_tot_amt": str(exchange.cash),
+        "scts_evlu_amt": str(scts_evlu),
+        "tot_evlu_amt": str(exchange.cash + scts_evlu),
+        "nass_amt": str(exchange.cash + scts_evlu),
+        "pchs_amt_smtl_amt": str(pchs_total),
+        "evlu_amt_smtl_amt": str(scts_evlu),
+        "evlu_pfls_smtl_amt": str(scts_evlu - pchs_total),
+    }]
+    return kis_ok(output1=output1, output2=output2, ctx_area_fk100="", ctx_area_nk100="")
+
+
+@app.get("/uapi/domestic-stock/v1/trading/inquire-psbl-order")
+async def inquire_psbl_order(request: Request):
+    """매수가능조회"""
+    if _tr_id(request) not in TR_PSBL_ORDER:
+        return _invalid_tr_id(request)
+
+    ticker = request.query_params.get("PDNO", "")
+    price = int(request.query_params.get("ORD_UNPR", "0") or 0)
+    cash = exchange.orderable_cash()
+    qty = exchange.max_buy_qty(ticker, price) if ticker else 0
+    unit = price or (exchange.instrument(ticker).price if ticker else 0)
+    return kis_ok(output={
+        "ord_psbl_cash": str(cash),
+        "nrcvb_buy_amt": str(qty * unit if ticker else cash),
+        "nrcvb_buy_qty": str(qty),
+        "max_buy_amt": str(qty * unit if ticker else cash),
+        "max_buy_qty": str(qty),
+        "psbl_qty_calc_unpr": str(unit),
+    })
+
+
+@app.get("/uapi/domestic-stock/v1/trading/inquire-psbl-sell")
+async def inquire_psbl_sell(request: Request):
+    """매도가능수량조회"""
+    if _tr_id(request) not in TR_PSBL_SELL:
+        return _invalid_tr_id(request)
+
+    ticker = request.query_params.get("PDNO", "")
+    position = exchange.positions.get(ticker)
+    return kis_ok(output={
+        "pdno": ticker,
+        "prdt_name": exchange.instrument(ticker).name if ticker else "",
+        "buy_qty": str(position.qty if position else 0),
+        "ord_psbl_qty": str(exchange.sellable_qty(ticker)),
+        "pchs_avg_pric": f"{position.avg_price:.4f}" if position else "0",
+    })
+
+
+@app.get("/uapi/domestic-stock/v1/quotations/inquire-ccnl")
+async def inquire_ccnl(request: Request):
+    """주식현재가 체결"""
+    if _tr_id(request) not in TR_CCNL:
+        return _invalid_tr_id(request)
+
+    inst = exchange.instrument(request.query_params.get("FID_INPUT_ISCD", ""))
+    now = datetime.now(KST).strftime("%H%M%S")
+    output = [{
+        "stck_cntg_hour": now,
+        "stck_prpr": str(inst.price),
+        "prdy_vrss": str(inst.price - inst.prev_close),
+        "prdy_ctrt": f"{(inst.price / inst.prev_close - 1) * 100:.2f}",
+        "cntg_vol": "1",
+    }]
+    # 누적/전일 거래량 요약 (포트폴리오 관리 에이전트 거래량 판단용)
+    output1 = {"acml_vol": str(inst.volume), "prdy_vol": str(inst.prev_volume)}
+    return kis_ok(output=output, output1=output1)
+
+
+@app.get("/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice")
+async def inquire_daily_itemchartprice(request: Request):
+    """국내주식기간별시세(일/주/월/년)"""
+    if _tr_id(request) not in TR_DAILY_CHART:
+        return _invalid_tr_id(request)
+
+    params = request.query_params
+    ticker = params.get("FID_INPUT_ISCD", "")
+    inst = exchange.instrument(ticker)
+    bars = exchange.daily_chart(
+        ticker,
+        params.get("FID_INPUT_DATE_1", ""),
+        params.get("FID_INPUT_DATE_2", ""),
+        params.get("FID_PERIOD_DIV_CODE", "D")
+    )
+    output1 = {
+        "stck_shrn_iscd": ticker,
+        "hts_kor_isnm": inst.name,
+        "stck_prpr": str(inst.price),
+        "prdy_vrss": str(inst.price - inst.prev_close),
+        "prdy_ctrt": f"{(inst.price / inst.prev_close - 1) * 100:.2f}",
+        "stck_prdy_clpr": str(inst.prev_close),
+        "stck_oprc": str(inst.open),
+        "stck_hgpr": str(inst.high),
+        "stck_lwpr": str(inst.low),
+        "acml_vol": str(inst.volume),
+        "prdy_vol": str(inst.prev_volume),
+    }
+    output2 = [{
+        "stck_bsop_date": str(bar["date"]),
+        "stck_clpr": str(bar["close"]),
+        "stck_oprc": str(bar["open"]),
+        "stck_hgpr": str(bar["high"]),
+        "stck_lwpr": str(bar["low"]),
+        "acml_vol": str(bar["volume"]),
+    } for bar in bars]
+    return kis_ok(output1=output1, output2=output2)
+
+
+# ==================== 실시간 체결통보 ====================
+
+@app.websocket("/ws")
+async def websocket_notices(websocket: WebSocket):
+    """실시간 체결통보 (H0STCNI0 구독 시 평문 데이터 전송)"""
+    await websocket.accept()
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            header = message.get("header", {})
+            tr_id = message.get("body", {}).get("input", {}).get("tr_id", "")
+            if tr_id != EXECUTION_NOTICE_TR_ID:
+                await websocket.send_text(json.dumps({
+                    "header": {"tr_id": tr_id},
+                    "body": {"rt_cd": "1", "msg_cd": "OPSP0011", "msg1": "invalid tr_id"}
+                }))
+                continue
+            if header.get("tr_type") == "2":
+                notices.clients.discard(websocket)
+                msg1 = "UNSUBSCRIBE SUCCESS"
+            else:
+                notices.clients.add(websocket)
+                msg1 = "SUBSCRIBE SUCCESS"
+            await websocket.send_text(json.dumps({
+                "header": {"tr_id": tr_id, "tr_key": "", "encrypt": "N"},
+                "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": msg1, "output": {}}
+            }))
+    except (WebSocketDisconnect, json.JSONDecodeError):
+        pass
+    finally:
+        notices.clients.discard(websocket)
+
+
+# ==================== 시뮬레이터 제어 ====================
+
+@app.get("/sim/config", response_model=FaultConfig)
+async def get_fault_config():
+    """지연/오류 주입 설정 조회"""
+    return faults.config
+
+
+@app.put("/sim/config", response_model=FaultConfig)
+async def update_fault_config(config: FaultConfig):
+    """지연/오류 주입 설정 변경 (실행 중 적용)"""
+    faults.config = config
+    logger.info(f"Fault config updated: {config.model_dump()}")
+    return faults.config
+
+
+@app.post("/sim/price")
+async def set_price(update: PriceUpdate):
+    """현재가 강제 설정 (손절 시나리오 등)"""
+    exchange.set_price(update.ticker, update.price)
+    return {"ticker": update.ticker, "price": exchange.instrument(update.ticker).price}
+
+
+@app.post("/sim/reset")
+async def reset():
+    """계좌/시세/통계 초기화"""
+    exchange.reset()
+    return {"status": "reset"}
+
+
+@app.get("/sim/state")
+async def get_state():
+    """계좌 및 통계 조회"""
+    return {
+        "cash": exchange.cash,
+        "orderable_cash": exchange.orderable_cash(),
+        "holdings": exchange.holdings(),
+        "open_orders": len(exchange.open_orders()),
+        "exchange": exchange.stats,
+        "faults": faults.stats,
+        "notice_clients": len(notices.clients),
+    }
+
+
+@app.get("/health/live")
+async def liveness_probe():
+    """Liveness probe"""
+    return {"status": "ok"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=SIM_PORT)
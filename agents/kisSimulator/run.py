@@ -0,0 +1,8 @@
+"""
+한국투자증권 시뮬레이터 실행 스크립트
+"""
+import uvicorn
+from main import app, SIM_PORT
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=SIM_PORT)
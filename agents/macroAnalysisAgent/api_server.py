@@ -3,9 +3,11 @@
 Python 분석 프로그램의 결과를 S3에서 조회하여 제공
 """
 import os
+import sys
 import logging
 import asyncio
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
 
@@ -13,7 +15,12 @@ import boto3
 from fastapi import FastAPI
 from pydantic import BaseModel
 
-from main import run_analysis
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import setup_metrics, instrument_s3  # noqa: E402
+from common.tracing import setup_tracing  # noqa: E402
+
+from main import run_analysis  # noqa: E402
 
 # 로깅 설정
 logging.basicConfig(
@@ -44,6 +51,7 @@ def init_s3_client():
             )
         else:
             s3_client = boto3.client('s3', region_name=AWS_REGION)
+        instrument_s3(s3_client)
         logger.info("S3 client initialized")
     except Exception as e:
         logger.error(f"Failed to initialize S3 client: {e}")
@@ -277,6 +285,8 @@ app = FastAPI(
     version="2.0.0",
     lifespan=lifespan
 )
+setup_metrics(app)
+setup_tracing(app, "macro-agent")
 
 
 @app.get("/health/live", tags=["Health"])
@@ -7,15 +7,20 @@
 - S3: 보고서 업로드
 """
 import os
+import sys
 import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 
-import httpx
 import boto3
 from botocore.exceptions import ClientError
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import http_client, instrument_s3  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +33,12 @@ ECOS_API_KEY = os.getenv("ECOS_API_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 FRED_API_KEY = os.getenv("FRED_API_KEY", "")
 
+# 외부 API 주소 (로컬 테스트 시 대체 서버 지정)
+ECOS_BASE_URL = os.getenv("ECOS_BASE_URL", "https://ecos.bok.or.kr")
+FRED_BASE_URL = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org")
+WORLD_BANK_BASE_URL = os.getenv("WORLD_BANK_BASE_URL", "https://api.worldbank.org")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "quartz-bucket")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
@@ -50,19 +61,19 @@ class S3Uploader:
         
         if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
             try:
-                self.client = boto3.client(
+                self.client = instrument_s3(boto3.client(
                     's3',
                     region_name=region,
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-                )
+                ))
                 logger.info("S3 client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize S3 client: {e}")
         else:
             # 환경변수 없이 기본 자격 증명 사용 (EC2 IAM Role 등)
             try:
-                self.client = boto3.client('s3', region_name=region)
+                self.client = instrument_s3(boto3.client('s3', region_name=region))
                 logger.info("S3 client initialized with default credentials")
             except Exception as e:
                 logger.error(f"Failed to initialize S3 client: {e}")
@@ -97,7 +108,7 @@ async def perform_request(
     
     for i in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, verify=False) as client:
+            async with http_client(timeout=REQUEST_TIMEOUT, verify=False) as client:
                 if post_data:
                     response = await client.post(url, headers=headers, content=post_data)
                 else:
@@ -137,7 +148,7 @@ async def fetch_ecos_data(
     Returns:
         [(날짜, 값), ...] 형태의 리스트
     """
-    url = f"https://ecos.bok.or.kr/api/StatisticSearch/{key}/json/kr/1/100/{table}/M/{start}/{end}/{item}"
+    url = f"{ECOS_BASE_URL}/api/StatisticSearch/{key}/json/kr/1/100/{table}/M/{start}/{end}/{item}"
     
     results: List[Tuple[str, str]] = []
     resp = await perform_request(url)
@@ -187,7 +198,7 @@ async def fetch_fred_series(
         [(날짜, 값), ...] 형태의 리스트
     """
     url = (
-        f"https://api.stlouisfed.org/fred/series/observations"
+        f"{FRED_BASE_URL}/fred/series/observations"
         f"?series_id={series_id}"
         f"&api_key={fred_key}"
         f"&file_type=json"
@@ -238,7 +249,7 @@ async def fetch_world_bank_series(
         [(연도, 값), ...] 형태의 리스트
     """
     url = (
-        f"https://api.worldbank.org/v2/country/{country}"
+        f"{WORLD_BANK_BASE_URL}/v2/country/{country}"
         f"/indicator/{indicator}"
         f"?date={start_year}:{end_year}"
         f"&format=json&per_page=2000"
@@ -295,7 +306,7 @@ async def generate_gemini_report(
     """
     # Gemini 모델 (C++ 버전과 동일)
     gemini_url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"
+        f"{GEMINI_BASE_URL}/v1beta/models/"
         "gemini-3-pro-preview:generateContent"
     )
     
@@ -382,7 +393,7 @@ async def summarize_report(
     """
     # Gemini 모델 (C++ 버전과 동일)
     gemini_url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"
+        f"{GEMINI_BASE_URL}/v1beta/models/"
         "gemini-3-pro-preview:generateContent"
     )
     
@@ -0,0 +1,169 @@
+"""
+매매 결정 캐시 (GPT 입력 지문 기반)
+- GPT 입력을 허용 오차 단위로 정규화(가격 구간, RSI 구간, 감성 반올림 등)한 뒤 해시를 키로 사용
+- 이전 사이클과 입력이 사실상 같으면 GPT 호출 없이 이전 결정을 재사용
+- 적중률, 절약한 토큰 수 / GPT 대기 시간 집계
+"""
+import copy
+import json
+import math
+import time
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+def _log_bucket(value: float, tolerance: float) -> Optional[int]:
+    """양수 값을 tolerance 비율 간격의 로그 구간 번호로 변환 (예: 1% 간격)"""
+    if not value or value <= 0:
+        return None
+    return int(round(math.log(value) / math.log1p(tolerance)))
+
+
+def _canonical_technical(technical: Dict[str, Any], rsi_bucket: int) -> Dict[str, Any]:
+    day = technical.get("day", {})
+    rsi = day.get("rsi", 50)
+    return {
+        "day": {
+            "trend": day.get("trend"),
+            "rsi": int(float(rsi if rsi is not None else 50) // rsi_bucket),
+            "macd_signal": day.get("macd_signal"),
+            "bollinger_position": day.get("bollinger_position"),
+        },
+        "week": technical.get("week", {}),
+        "month": technical.get("month", {}),
+    }
+
+
+def fingerprint(
+    gpt_input: Dict[str, Any],
+    price_tolerance: float = 0.01,
+    rsi_bucket: int = 5,
+    extra: str = ""
+) -> str:
+    """
+    GPT 입력 지문 (sha256)
+    - 시각(now_utc), 뉴스 헤드라인 문구는 제외
+    - 가격/평가금액은 price_tolerance 비율 구간, RSI 는 rsi_bucket 단위, 감성은 0.05 단위
+    - extra: 모델/프롬프트 등 입력 외 조건 (바뀌면 캐시 무효화)
+    """
+    portfolio = gpt_input.get("portfolio", {})
+    total_value = float(portfolio.get("total_value", 0) or 0)
+    cash = float(portfolio.get("cash_krw", 0) or 0)
+
+    canonical = {
+        "macro": {
+            "bias": gpt_input.get("macro", {}).get("market_bias_hint"),
+            # 보고서가 바뀌면 요약 문구도 바뀜
+            "summary": hashlib.sha256(json.dumps(
+                [gpt_input.get("macro", {}).get(k, "") for k in ("positive_summary", "negative_summary")],
+                ensure_ascii=False
+            ).encode("utf-8")).hexdigest()[:16],
+        },
+        "portfolio": {
+            "total_value": _log_bucket(total_value, price_tolerance),
+            "cash_ratio": round(cash / total_value / price_tolerance) if total_value > 0 else None,
+            "positions": sorted(
+                (p.get("ticker"), p.get("shares")) for p in portfolio.get("positions", [])
+            ),
+        },
+        "universe": sorted(
+            (
+                {
+                    "ticker": item.get("ticker"),
+                    "price": _log_bucket(float(item.get("current_price", 0) or 0), price_tolerance),
+                    "technical": _canonical_technical(item.get("technical", {}), rsi_bucket),
+                    "sentiment": (
+                        round(item["fundamental"]["sentiment_score"] * 20) / 20
+                        if item.get("fundamental", {}).get("sentiment_score") is not None else None
+                    ),
+                    "in_portfolio": bool(item.get("is_in_portfolio")),
+                }
+                for item in gpt_input.get("universe", [])
+            ),
+            key=lambda item: item["ticker"] or ""
+        ),
+        "constraints": gpt_input.get("constraints", {}),
+        "extra": extra,
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedDecision:
+    """캐시된 결정과 원래 GPT 호출 비용"""
+    decision: Dict[str, Any]
+    stored_at: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+
+
+class DecisionCache:
+    """지문 → 결정 캐시 (TTL, 최대 항목 수 제한)"""
+
+    def __init__(self, ttl_seconds: float = 5400.0, max_entries: int = 32):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedDecision]" = OrderedDict()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "saved_prompt_tokens": 0,
+            "saved_completion_tokens": 0,
+            "saved_seconds": 0.0,
+        }
+
+    def get(self, key: str) -> Optional[CachedDecision]:
+        """유효한 이전 결정 (결정은 재사용 표시를 붙인 사본), 없으면 None"""
+        entry = self._entries.get(key)
+        if entry and time.time() - entry.stored_at > self._ttl:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        self._stats["saved_prompt_tokens"] += entry.prompt_tokens
+        self._stats["saved_completion_tokens"] += entry.completion_tokens
+        self._stats["saved_seconds"] += entry.seconds
+
+        decision = copy.deepcopy(entry.decision)
+        meta = decision.setdefault("meta", {})
+        meta["reused_from"] = meta.get("decision_time_utc")
+        return CachedDecision(decision, entry.stored_at, entry.prompt_tokens, entry.completion_tokens, entry.seconds)
+
+    def put(
+        self,
+        key: str,
+        decision: Dict[str, Any],
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        seconds: float = 0.0
+    ):
+        """GPT 결정 저장 (호출 비용도 함께 기록해 재사용 시 절약량으로 집계)"""
+        self._entries[key] = CachedDecision(
+            decision=copy.deepcopy(decision),
+            stored_at=time.time(),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            seconds=seconds
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "saved_seconds": round(self._stats["saved_seconds"], 3),
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self._ttl,
+        }
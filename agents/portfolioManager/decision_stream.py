@@ -0,0 +1,104 @@
+"""
+GPT 결정 스트림 파서
+- 스트리밍 응답 조각을 받으면서 JSON 구조(문자열/괄호 깊이)를 추적
+- ticker_decisions 배열의 원소 객체가 닫히는 즉시 파싱해서 반환 (전체 응답을 기다리지 않음)
+- 코드 펜스(```json ... ```) 등 JSON 밖의 문자는 무시
+"""
+import json
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+
+class TickerDecision(BaseModel):
+    """ticker_decisions 원소 검증 모델"""
+    ticker: str = Field(min_length=1, max_length=12)
+    action: Literal["BUY", "SELL", "HOLD"]
+    target_weight: float = Field(default=0.0, ge=0.0, le=1.0)
+    priority: int = 0
+    strength: float = 0.0
+    reason: str = ""
+
+    @field_validator("action", mode="before")
+    @classmethod
+    def _upper(cls, value: Any) -> Any:
+        return value.upper() if isinstance(value, str) else value
+
+
+def validate_ticker_decision(element: Any) -> Optional[Dict[str, Any]]:
+    """원소가 유효하면 정규화된 dict, 아니면 None"""
+    try:
+        return TickerDecision.model_validate(element).model_dump()
+    except ValidationError:
+        return None
+
+
+class DecisionStreamParser:
+    """스트리밍 텍스트에서 배열(array_key) 원소를 완성되는 대로 추출"""
+
+    def __init__(self, array_key: str = "ticker_decisions"):
+        self._array_key = array_key
+        self._text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._array_depth: Optional[int] = None  # 대상 배열이 열린 스택 깊이
+        self._element_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """조각 추가 후 새로 완성된 배열 원소 목록 반환"""
+        self._text += chunk
+        completed = []
+        text = self._text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:self._pos]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch == ":":
+                if self._stack and self._stack[-1] == "{":
+                    self._pending_key = self._last_string
+            elif ch == ",":
+                self._pending_key = None
+            elif ch in "{[":
+                if (
+                    ch == "["
+                    and self._array_depth is None
+                    and self._pending_key == self._array_key
+                    and self._stack and self._stack[-1] == "{"
+                ):
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(ch)
+                self._pending_key = None
+                if ch == "{" and self._array_depth is not None and len(self._stack) == self._array_depth + 1:
+                    self._element_start = self._pos
+            elif ch in "}]" and self._stack:
+                depth = len(self._stack)
+                if ch == "}" and self._element_start is not None and depth == self._array_depth + 1:
+                    try:
+                        completed.append(json.loads(text[self._element_start:self._pos + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._element_start = None
+                elif ch == "]" and self._array_depth is not None and depth == self._array_depth:
+                    self._array_depth = None
+                self._stack.pop()
+            self._pos += 1
+        return completed
@@ -6,12 +6,16 @@
 - 포트: 8004
 """
 import os
+import sys
 import asyncio
 import json
 import logging
+import time
+import hashlib
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple
 from contextlib import asynccontextmanager
+from pathlib import Path
 from uuid import uuid4
 import math
 
@@ -23,6 +27,20 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import websockets
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import (  # noqa: E402
+    setup_metrics, http_client, instrument_s3, track_outbound, record_cache, record_llm_usage
+)
+from common.tracing import setup_tracing, current_traceparent, span, traced  # noqa: E402
+
+import rule_engine  # noqa: E402
+from decision_cache import DecisionCache, fingerprint  # noqa: E402
+import payload_encoder  # noqa: E402
+from decision_stream import DecisionStreamParser, validate_ticker_decision  # noqa: E402
+import map_reduce  # noqa: E402
+import order_compiler  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -35,8 +53,35 @@ HANSEC_APP_KEY = os.getenv("HANSEC_INVESTMENT_APP_KEY", "")
 HANSEC_APP_SECRET = os.getenv("HANSEC_INVESTMENT_APP_SECRET_KEY", "")
 HANSEC_CANO = os.getenv("HANSEC_INVESTMENT_CANO", "")
 HANSEC_ACNT_PRDT_CD = os.getenv("HANSEC_INVESTMENT_ACNT_PRDT_CD", "01")
-HANSEC_BASE_URL = "https://openapi.koreainvestment.com:9443"
+HANSEC_BASE_URL = os.getenv("HANSEC_BASE_URL", "https://openapi.koreainvestment.com:9443")
 GPT_API_KEY = os.getenv("GPT_API_KEY", "")
+GPT_MODEL = "gpt-4o-mini"
+GPT_MAX_TOKENS = int(os.getenv("GPT_MAX_TOKENS", "2048"))
+# GPT 응답 스트리밍 (완성된 ticker_decisions 원소를 응답 완료 전에 처리)
+GPT_STREAMING = os.getenv("GPT_STREAMING", "true").lower() == "true"
+# 스트리밍 중 즉시 주문할 action (쉼표 구분, 비우면 응답 완료 후 일괄 실행)
+GPT_STREAM_EARLY_ACTIONS = {
+    a.strip().upper() for a in os.getenv("GPT_STREAM_EARLY_ACTIONS", "SELL").split(",") if a.strip()
+}
+# GPT 입력 형식 (compact: 종목별 CSV 행 + 짧은 키, json: 기존 JSON 그대로)
+GPT_PAYLOAD_FORMAT = os.getenv("GPT_PAYLOAD_FORMAT", "compact").lower()
+GPT_PAYLOAD_TOKEN_BUDGET = int(os.getenv("GPT_PAYLOAD_TOKEN_BUDGET", "1500"))  # compact 입력 토큰 상한 (0: 제한 없음)
+# GPT 응답 대기 한도 (초과 시 규칙 기반 결정 사용)
+GPT_DECISION_DEADLINE = float(os.getenv("GPT_DECISION_DEADLINE", "60"))
+# GPT 지연/실패 시 규칙 기반 결정으로 대체 (false: 기존처럼 이번 사이클 건너뜀)
+RULE_FALLBACK_ENABLED = os.getenv("RULE_FALLBACK_ENABLED", "true").lower() == "true"
+# 입력이 허용 오차 내에서 같으면 이전 GPT 결정 재사용
+DECISION_CACHE_ENABLED = os.getenv("DECISION_CACHE_ENABLED", "true").lower() == "true"
+DECISION_CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", "5400"))  # 초 (결정 주기 3회)
+DECISION_CACHE_PRICE_TOLERANCE = float(os.getenv("DECISION_CACHE_PRICE_TOLERANCE", "0.01"))  # 가격 변동 1% 단위
+DECISION_CACHE_RSI_BUCKET = int(os.getenv("DECISION_CACHE_RSI_BUCKET", "5"))
+# 결정 방식 (single: 프롬프트 하나로 전체 결정, map_reduce: 섹터 묶음별 점수 → 규칙 기반 비중 배분)
+DECISION_MODE = os.getenv("DECISION_MODE", "single").lower()
+DECISION_CANDIDATES = int(os.getenv("DECISION_CANDIDATES", "5"))  # universe 에 넣을 후보 종목 수
+MAP_REDUCE_BATCH_SIZE = int(os.getenv("MAP_REDUCE_BATCH_SIZE", "6"))  # map 프롬프트당 종목 수
+MAP_REDUCE_TOKEN_BUDGET = int(os.getenv("MAP_REDUCE_TOKEN_BUDGET", "700"))  # map 입력 토큰 상한
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", "4"))  # OpenAI 동시 호출 수 (rate limit)
+TECHNICAL_FETCH_CONCURRENCY = int(os.getenv("TECHNICAL_FETCH_CONCURRENCY", "8"))  # 기술적 분석 동시 조회 수
 
 # 에이전트 URL
 AUTH_AGENT_URL = os.getenv("AUTH_AGENT_URL", "http://auth-agent:8006")
@@ -44,6 +89,7 @@ MACRO_AGENT_URL = os.getenv("MACRO_AGENT_URL", "http://macro-agent:8001")
 TICKER_SELECTOR_URL = os.getenv("TICKER_SELECTOR_URL", "http://ticker-selector:8002")
 TECHNICAL_AGENT_URL = os.getenv("TECHNICAL_AGENT_URL", "http://technical-agent:8003")
 TRADING_AGENT_WS_URL = os.getenv("TRADING_AGENT_WS_URL", "ws://trading-agent:8005/ws/orders")
+ORDER_SEND_MAX_ATTEMPTS = 3  # 거래 에이전트 backpressure 시 재전송 횟수
 
 # AWS S3 설정
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
@@ -58,6 +104,9 @@ MAX_TURNOVER_RATIO = float(os.getenv("MAX_TURNOVER_RATIO", "0.3"))
 MAX_BUY_CANDIDATES = int(os.getenv("MAX_BUY_CANDIDATES", "3"))
 MAX_SELL_CANDIDATES = int(os.getenv("MAX_SELL_CANDIDATES", "3"))
 
+# 자동 매매 루프 사용 여부 (false: 수동 트리거만, 부하 테스트 등)
+AUTO_TRADING_ENABLED = os.getenv("AUTO_TRADING_ENABLED", "true").lower() == "true"
+
 # 손절/익절 기준
 STOP_LOSS_RATE = -0.05  # -5%
 TAKE_PROFIT_RATE = 0.15  # +15%
@@ -142,6 +191,16 @@ Apply these principles:
 Output must be **valid JSON**. Do **not** include any text outside the JSON.
 """
 
+if GPT_PAYLOAD_FORMAT == "compact":
+    GPT_SYSTEM_PROMPT += payload_encoder.COMPACT_INPUT_NOTE
+
+# 모델/프롬프트/입력 형식/결정 방식이 바뀌면 결정 캐시 무효화
+DECISION_CACHE_SALT = (
+    f"{GPT_MODEL}:{GPT_PAYLOAD_FORMAT}:{GPT_PAYLOAD_TOKEN_BUDGET}:"
+    f"{DECISION_MODE}:{MAP_REDUCE_BATCH_SIZE}:{MAP_REDUCE_TOKEN_BUDGET}:"
+    f"{hashlib.sha256((GPT_SYSTEM_PROMPT + map_reduce.MAP_SYSTEM_PROMPT).encode('utf-8')).hexdigest()[:16]}"
+)
+
 
 class PortfolioManager:
     """포트폴리오 관리 클래스"""
@@ -154,18 +213,21 @@ class PortfolioManager:
         self._decision_task: Optional[asyncio.Task] = None
         self._rebalance_task: Optional[asyncio.Task] = None
         self._openai_client = AsyncOpenAI(api_key=GPT_API_KEY) if GPT_API_KEY else None
+        self._openai_semaphore = asyncio.Semaphore(GPT_MAX_CONCURRENCY)
         self._s3_client = None
         self._high_volume_mode = False  # 거래량 높음 모드
+        self.decision_cache = DecisionCache(ttl_seconds=DECISION_CACHE_TTL)
+        self._decision_prices: Dict[str, float] = {}  # 마지막 결정 universe 의 현재가 (주문 수량 계산용)
         
         # S3 클라이언트 초기화
         if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
             try:
-                self._s3_client = boto3.client(
+                self._s3_client = instrument_s3(boto3.client(
                     's3',
                     region_name=AWS_REGION,
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-                )
+                ))
                 logger.info("S3 client initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize S3 client: {e}")
@@ -173,6 +235,9 @@ class PortfolioManager:
     async def initialize(self):
         """초기화"""
         logger.info("Initializing Portfolio Manager...")
+        if not AUTO_TRADING_ENABLED:
+            logger.info("Auto trading disabled, decision/rebalance loops not started")
+            return
         # 스케줄러 태스크 시작
         self._decision_task = asyncio.create_task(self._decision_loop())
         self._rebalance_task = asyncio.create_task(self._rebalance_loop())
@@ -189,7 +254,7 @@ class PortfolioManager:
     async def _get_auth_token(self) -> str:
         """인증 토큰 조회"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client(timeout=10.0) as client:
                 response = await client.get(f"{AUTH_AGENT_URL}/result/auth-token")
                 if response.status_code == 200:
                     data = response.json()
@@ -235,7 +300,7 @@ class PortfolioManager:
         headers = self._get_headers(TR_ID_BALANCE)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client(timeout=30.0) as client:
                 response = await client.get(url, headers=headers, params=params)
                 data = response.json()
                 
@@ -312,7 +377,7 @@ class PortfolioManager:
         
         headers = self._get_headers(TR_ID_PSBL_ORDER)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(url, headers=headers, params=params)
             data = response.json()
             
@@ -340,7 +405,7 @@ class PortfolioManager:
         
         headers = self._get_headers(TR_ID_PSBL_SELL)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(url, headers=headers, params=params)
             data = response.json()
             
@@ -351,8 +416,8 @@ class PortfolioManager:
                 logger.error(f"Sellable qty query failed: {data.get('msg1')}")
                 return 0
     
-    async def _save_decision_to_s3(self, gpt_input: Dict, gpt_output: Dict):
-        """GPT 결정 결과를 S3에 저장"""
+    async def _save_decision_to_s3(self, gpt_input: Dict, gpt_output: Dict, rule_output: Optional[Dict] = None):
+        """GPT 결정 결과를 S3에 저장 (규칙 기반 결정 및 비교 결과 포함)"""
         if not self._s3_client:
             return
         
@@ -365,6 +430,9 @@ class PortfolioManager:
                 "input": gpt_input,
                 "output": gpt_output
             }
+            if rule_output is not None:
+                data["rule_output"] = rule_output
+                data["comparison"] = rule_engine.compare(gpt_output, rule_output)
             
             body = json.dumps(data, ensure_ascii=False, indent=2)
             
@@ -392,7 +460,7 @@ class PortfolioManager:
             
             headers = self._get_headers(TR_ID_CCNL)
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client(timeout=10.0) as client:
                 response = await client.get(url, headers=headers, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -416,7 +484,7 @@ class PortfolioManager:
         try:
             # S3에서 최신 _short 보고서 조회 (실제 구현에서는 boto3 사용)
             # 여기서는 간소화된 버전 - 거시경제 에이전트 API 호출
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client(timeout=30.0) as client:
                 response = await client.get(f"{MACRO_AGENT_URL}/result/analysis")
                 if response.status_code == 200:
                     data = response.json()
@@ -437,7 +505,7 @@ class PortfolioManager:
     async def get_candidate_tickers(self, top_n: int = 5) -> List[Dict]:
         """후보 종목 조회"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client(timeout=30.0) as client:
                 response = await client.post(
                     f"{TICKER_SELECTOR_URL}/api/candidates",
                     json={"top_n": top_n}
@@ -453,7 +521,7 @@ class PortfolioManager:
     async def get_technical_analysis(self, ticker: str) -> Dict[str, Any]:
         """기술적 분석 조회"""
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with http_client(timeout=60.0) as client:
                 response = await client.post(
                     f"{TECHNICAL_AGENT_URL}/result/analysis",
                     json={"ticker": ticker}
@@ -465,100 +533,162 @@ class PortfolioManager:
         
         return {}
     
+    @traced("trading-agent ws order")
     async def _send_order_via_websocket(self, order: Dict) -> Dict:
-        """WebSocket으로 주문 전송"""
+        """WebSocket으로 주문 전송 (traceparent 를 주문 메시지에 포함)"""
+        message = json.dumps({**order, "traceparent": current_traceparent()})
         try:
             async with websockets.connect(TRADING_AGENT_WS_URL) as ws:
-                await ws.send(json.dumps(order))
-                response = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                return json.loads(response)
+                await ws.send(message)
+                attempts = 1
+                while True:
+                    response = json.loads(await asyncio.wait_for(ws.recv(), timeout=30.0))
+
+                    # ping 등 다른 주문/이벤트 메시지는 무시
+                    if response.get("request_id") != order["request_id"]:
+                        continue
+
+                    # 거래 에이전트 큐가 가득 찬 경우 잠시 후 재전송
+                    if response.get("type") == "backpressure":
+                        if attempts >= ORDER_SEND_MAX_ATTEMPTS:
+                            return {"status": "failed", "message": response.get("message", "Order queue full")}
+                        attempts += 1
+                        await asyncio.sleep(float(response.get("retry_after", 1.0)))
+                        await ws.send(message)
+                        continue
+
+                    return response
         except Exception as e:
             logger.error(f"WebSocket order failed: {e}")
             return {"status": "failed", "message": str(e)}
     
-    async def execute_decision(self, decision: Dict) -> List[Dict]:
-        """매매 결정 실행"""
-        results = []
-        portfolio = await self.get_portfolio()
+    @traced("execute_decision")
+    async def execute_decision(
+        self,
+        decision: Dict,
+        skip_tickers: Optional[Set[str]] = None,
+        portfolio: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        매매 결정 실행
+        - 전체 결정을 한 번에 주문 목록으로 컴파일 (회전율/현금/최소 주문/비중 상한 적용, 매도 → 매수 순)
+        - skip_tickers: 이미 주문한 종목 (컴파일에는 포함해서 회전율/현금 계산에 반영)
+        - portfolio: 결정 시점 스냅샷 (없으면 새로 조회)
+        """
+        if portfolio is None:
+            portfolio = await self.get_portfolio()
+        orders = await self._compile_orders(decision.get("ticker_decisions", []), portfolio)
+        if skip_tickers:
+            orders = [order for order in orders if order.ticker not in skip_tickers]
+        return await self._send_orders(orders)
+    
+    async def _execute_ticker_decision(self, ticker_decision: Dict, portfolio: Dict) -> Optional[Dict]:
+        """종목 하나의 결정 실행 (주문 없으면 None)"""
+        results = await self._send_orders(await self._compile_orders([ticker_decision], portfolio))
+        return results[0] if results else None
+    
+    async def _compile_orders(
+        self, ticker_decisions: List[Dict], portfolio: Dict
+    ) -> List[order_compiler.CompiledOrder]:
+        """결정 → 주문 목록 (가격은 결정 universe 의 현재가, 없는 종목만 기술적 분석 조회)"""
+        prices = dict(self._decision_prices)
+        known = set(prices) | {p["ticker"] for p in portfolio["positions"]}
+        missing = [
+            d.get("ticker") for d in ticker_decisions
+            if str(d.get("action", "HOLD")).upper() == "BUY" and d.get("ticker") not in known
+        ]
+        if missing:
+            techs = await asyncio.gather(*(self.get_technical_analysis(t) for t in missing))
+            prices.update({t: tech.get("current_price", 0) for t, tech in zip(missing, techs)})
         
-        for ticker_decision in decision.get("ticker_decisions", []):
-            ticker = ticker_decision.get("ticker")
-            action = ticker_decision.get("action", "HOLD").upper()
-            target_weight = ticker_decision.get("target_weight", 0)
-            
-            if action == "HOLD":
-                continue
-            
-            # 현재 포지션 확인
-            current_position = next(
-                (p for p in portfolio["positions"] if p["ticker"] == ticker),
-                None
+        orders, report = order_compiler.compile_orders(
+            portfolio,
+            ticker_decisions,
+            prices,
+            min_order_krw=MIN_ORDER_KRW,
+            max_single_weight=MAX_SINGLE_TICKER_WEIGHT,
+            max_turnover_ratio=MAX_TURNOVER_RATIO
+        )
+        if report.buy_scale < 1.0 or report.skipped:
+            logger.info(
+                f"Order compiler: turnover {report.turnover_ratio:.2%}, buy scale {report.buy_scale}, "
+                f"skipped {report.skipped}"
             )
-            
-            if action == "BUY":
-                # 매수 수량 계산
-                target_amount = portfolio["total_value"] * target_weight
-                current_amount = current_position["eval_amount"] if current_position else 0
-                order_amount = target_amount - current_amount
-                
-                if order_amount < MIN_ORDER_KRW:
-                    continue
-                
-                # 기술 분석에서 현재가 조회
-                tech = await self.get_technical_analysis(ticker)
-                current_price = tech.get("current_price", 0)
-                if current_price <= 0:
-                    continue
-                
-                order_qty = int(order_amount / current_price)
-                if order_qty <= 0:
-                    continue
-                
-                order = {
-                    "request_id": str(uuid4()),
-                    "action": "buy",
-                    "ticker": ticker,
-                    "qty": order_qty,
-                    "order_type": "market",
-                    "price": 0,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
-                }
-                
-                result = await self._send_order_via_websocket(order)
-                results.append({"ticker": ticker, "action": "BUY", "result": result})
-                
-            elif action == "SELL":
-                if not current_position:
-                    continue
-                
-                if target_weight == 0:
-                    # 전량 매도
-                    sell_qty = await self.get_sellable_qty(ticker)
-                else:
-                    # 일부 매도
-                    target_amount = portfolio["total_value"] * target_weight
-                    current_amount = current_position["eval_amount"]
-                    sell_amount = current_amount - target_amount
-                    sell_qty = int(sell_amount / current_position["current_price"])
-                
-                if sell_qty <= 0:
-                    continue
-                
-                order = {
-                    "request_id": str(uuid4()),
-                    "action": "sell",
-                    "ticker": ticker,
-                    "qty": sell_qty,
-                    "order_type": "market",
-                    "price": 0,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
-                }
-                
-                result = await self._send_order_via_websocket(order)
-                results.append({"ticker": ticker, "action": "SELL", "result": result})
         
+        # 전량 매도는 매도 가능 수량(미체결/결제 대기 제외)으로 보정
+        exits = [order.ticker for order in orders if order.full_exit]
+        if exits:
+            sellable = await asyncio.gather(*(self.get_sellable_qty(t) for t in exits))
+            orders = order_compiler.cap_quantities(orders, dict(zip(exits, sellable)))
+        return orders
+    
+    async def _send_orders(self, orders: List[order_compiler.CompiledOrder]) -> List[Dict]:
+        """컴파일된 주문을 순서대로 전송"""
+        results = []
+        for compiled in orders:
+            order = {
+                "request_id": str(uuid4()),
+                "action": compiled.action.lower(),
+                "ticker": compiled.ticker,
+                "qty": compiled.qty,
+                "order_type": "market",
+                "price": 0,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "reason": "rebalance"
+            }
+            result = await self._send_order_via_websocket(order)
+            results.append({"ticker": compiled.ticker, "action": compiled.action, "result": result})
         return results
     
+    @traced("decision_cycle")
+    async def run_decision_cycle(self) -> Dict[str, Any]:
+        """
+        매매 결정 + 실행
+        - 스트리밍 중 완성된 GPT_STREAM_EARLY_ACTIONS 결정(기본 SELL)은 응답 완료 전에 바로 주문
+        - 나머지는 전체 결정 확정 후 실행
+        - 먼저 나간 주문이 있는데 GPT 결정이 완성되지 못하면(마감 초과/파싱 실패 등) 규칙 기반 대체 결정은
+          실행하지 않음 (GPT 결정 절반 + 규칙 결정 절반이 섞이지 않도록), 결과에 partial 로 기록
+        """
+        early: Dict[str, asyncio.Task] = {}
+        portfolio_task: Optional[asyncio.Task] = None
+        
+        async def execute_early(ticker_decision: Dict) -> Optional[Dict]:
+            portfolio = await portfolio_task
+            return await self._execute_ticker_decision(ticker_decision, portfolio)
+        
+        def dispatch(ticker_decision: Dict):
+            nonlocal portfolio_task
+            if ticker_decision["action"] not in GPT_STREAM_EARLY_ACTIONS or ticker_decision["ticker"] in early:
+                return
+            if portfolio_task is None:
+                portfolio_task = asyncio.create_task(self.get_portfolio())
+            logger.info(f"Early dispatch: {ticker_decision['action']} {ticker_decision['ticker']}")
+            early[ticker_decision["ticker"]] = asyncio.create_task(execute_early(ticker_decision))
+        
+        decision = await self.make_decision(on_ticker_decision=dispatch)
+        
+        results = []
+        for outcome in await asyncio.gather(*early.values(), return_exceptions=True):
+            if isinstance(outcome, Exception):
+                logger.error(f"Early order failed: {outcome}")
+            elif outcome:
+                results.append(outcome)
+        
+        partial = bool(early) and decision.get("meta", {}).get("source") == "rules"
+        if partial:
+            logger.warning(
+                f"GPT decision incomplete after {len(early)} early orders "
+                f"({', '.join(early)}), skipping rule-based fallback for this cycle"
+            )
+        elif decision.get("ticker_decisions"):
+            snapshot = None
+            if portfolio_task and not portfolio_task.cancelled() and portfolio_task.exception() is None:
+                snapshot = portfolio_task.result()
+            results += await self.execute_decision(decision, skip_tickers=set(early), portfolio=snapshot)
+        
+        return {"decision": decision, "execution_results": results, "partial": partial}
+    
+    @traced("risk_check")
     async def _check_stop_loss_take_profit(self) -> List[Dict]:
         """손절/익절 체크"""
         portfolio = await self.get_portfolio()
@@ -579,7 +709,8 @@ class PortfolioManager:
                         "qty": sell_qty,
                         "order_type": "market",
                         "price": 0,
-                        "timestamp": datetime.utcnow().isoformat() + "Z"
+                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "reason": "stop_loss"
                     }
                     result = await self._send_order_via_websocket(order)
                     orders.append({"ticker": position["ticker"], "action": "STOP_LOSS", "result": result})
@@ -596,15 +727,113 @@ class PortfolioManager:
                         "qty": sell_qty,
                         "order_type": "market",
                         "price": 0,
-                        "timestamp": datetime.utcnow().isoformat() + "Z"
+                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "reason": "take_profit"
                     }
                     result = await self._send_order_via_websocket(order)
                     orders.append({"ticker": position["ticker"], "action": "TAKE_PROFIT", "result": result})
         
         return orders
     
-    async def make_decision(self) -> Dict[str, Any]:
-        """GPT를 통한 매매 결정"""
+    def _gpt_request(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        return dict(
+            model=GPT_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
+            ],
+            temperature=0.2,
+            max_tokens=GPT_MAX_TOKENS
+        )
+    
+    async def _complete(self, system_prompt: str, user_content: str) -> Tuple[str, int, int]:
+        """GPT 호출 (스트리밍 없음, 동시 호출 수 제한) → (응답 본문, prompt 토큰, completion 토큰)"""
+        async with self._openai_semaphore:
+            response = await self._openai_client.chat.completions.create(
+                **self._gpt_request(system_prompt, user_content)
+            )
+        usage = response.usage
+        return (
+            response.choices[0].message.content,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0
+        )
+    
+    async def _call_gpt(
+        self,
+        user_content: str,
+        on_ticker_decision: Optional[Callable[[Dict], None]] = None
+    ) -> Tuple[str, int, int]:
+        """GPT 호출 → (응답 본문, prompt 토큰, completion 토큰), 스트리밍 시 완성된 결정 원소를 콜백으로 전달"""
+        if not GPT_STREAMING:
+            return await self._complete(GPT_SYSTEM_PROMPT, user_content)
+        
+        parser = DecisionStreamParser()
+        prompt_tokens = completion_tokens = 0
+        async with self._openai_semaphore:
+            stream = await self._openai_client.chat.completions.create(
+                **self._gpt_request(GPT_SYSTEM_PROMPT, user_content),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.usage:
+                    prompt_tokens = chunk.usage.prompt_tokens
+                    completion_tokens = chunk.usage.completion_tokens
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for element in parser.feed(chunk.choices[0].delta.content):
+                    ticker_decision = validate_ticker_decision(element)
+                    if ticker_decision is None:
+                        logger.warning(f"Invalid ticker decision in stream: {element}")
+                    elif on_ticker_decision:
+                        on_ticker_decision(ticker_decision)
+        return parser.text, prompt_tokens, completion_tokens
+    
+    @traced("map_reduce_decision")
+    async def _map_reduce_decision(
+        self, gpt_input: Dict, rule_decision: Dict, fallback: Dict, cache_key: Optional[str]
+    ) -> Dict:
+        """섹터 묶음별 GPT 점수(map) → 제약조건 내 비중 배분(reduce)"""
+        async def complete(system_prompt: str, user_content: str) -> Tuple[str, int, int]:
+            with track_outbound("openai", GPT_MODEL):
+                return await self._complete(system_prompt, user_content)
+        
+        started = time.perf_counter()
+        scores, report = await map_reduce.map_scores(
+            complete, gpt_input, MAP_REDUCE_BATCH_SIZE, MAP_REDUCE_TOKEN_BUDGET, timeout=GPT_DECISION_DEADLINE
+        )
+        seconds = time.perf_counter() - started
+        record_llm_usage(GPT_MODEL, report["prompt_tokens"], report["completion_tokens"])
+        logger.info(
+            f"Map-reduce: {len(scores)}/{len(gpt_input['universe'])} tickers scored in {report['batches']} batches "
+            f"({report['failed']} failed), prompt {report['prompt_tokens']}, "
+            f"completion {report['completion_tokens']} tokens, {seconds:.2f}s"
+        )
+        if not scores:
+            logger.warning("No map scores, using rule-based decision")
+            return fallback
+        
+        # 점수가 없는 종목은 규칙 점수 (규칙 대체 꺼져 있으면 HOLD 에 해당하는 0점)
+        rule_scores = None if RULE_FALLBACK_ENABLED else [0.0] * len(gpt_input["universe"])
+        decision = map_reduce.reduce(gpt_input, scores, rule_scores)
+        comparison = rule_engine.compare(decision, rule_decision)
+        logger.info(f"Map-reduce/rule agreement: {comparison['agreement']} ({comparison['agree']}/{comparison['tickers']})")
+        
+        # 일부 묶음이 실패한 결정은 재사용하지 않음
+        if cache_key and not report["failed"]:
+            self.decision_cache.put(
+                cache_key, decision, report["prompt_tokens"], report["completion_tokens"], seconds
+            )
+        asyncio.create_task(self._save_decision_to_s3(gpt_input, decision, rule_decision))
+        return decision
+    
+    @traced("make_decision")
+    async def make_decision(self, on_ticker_decision: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+        """
+        GPT를 통한 매매 결정
+        on_ticker_decision: 스트리밍 중 검증된 ticker_decisions 원소마다 호출 (캐시/규칙 기반 결정일 때는 호출 안 됨)
+        """
         if not self._openai_client:
             logger.warning("OpenAI client not configured")
             return {"ticker_decisions": []}
@@ -617,7 +846,21 @@ class PortfolioManager:
             return {"ticker_decisions": []}  # 포트폴리오 조회 실패 시 결정 불가
         
         macro = await self.get_macro_summary()
-        candidates = await self.get_candidate_tickers(5)
+        candidates = await self.get_candidate_tickers(DECISION_CANDIDATES)
+        sentiment_by_ticker = {c.get("ticker"): c.get("avg_sentiment") for c in candidates}
+        sector_by_ticker = {c.get("ticker"): c.get("sector", "") for c in candidates}
+        
+        # 기술적 분석 동시 조회 (보유 종목 + 후보 종목)
+        held_tickers = [pos["ticker"] for pos in portfolio["positions"]]
+        candidate_tickers = [c.get("ticker", "") for c in candidates[:DECISION_CANDIDATES]]
+        tech_tickers = list(dict.fromkeys(held_tickers + candidate_tickers))
+        tech_semaphore = asyncio.Semaphore(TECHNICAL_FETCH_CONCURRENCY)
+        
+        async def fetch_technical(ticker: str) -> Dict[str, Any]:
+            async with tech_semaphore:
+                return await self.get_technical_analysis(ticker)
+        
+        tech_by_ticker = dict(zip(tech_tickers, await asyncio.gather(*(fetch_technical(t) for t in tech_tickers))))
         
         # universe 구성 (현재 보유 종목 + 후보 종목)
         universe = []
@@ -625,24 +868,30 @@ class PortfolioManager:
         
         # 보유 종목 추가 (기술분석 실패해도 포트폴리오 데이터로 추가)
         for pos in portfolio["positions"]:
-            tech = await self.get_technical_analysis(pos["ticker"])
+            tech = tech_by_ticker.get(pos["ticker"])
             universe.append({
                 "ticker": pos["ticker"],
                 "name": pos["name"],
+                "sector": sector_by_ticker.get(pos["ticker"], ""),
                 "current_price": pos["current_price"],
                 "technical": self._simplify_technical(tech) if tech else self._get_empty_technical(),
-                "fundamental": {"valuation": "fair", "quality": "medium", "growth": "medium"},
+                "fundamental": {
+                    "valuation": "fair",
+                    "quality": "medium",
+                    "growth": "medium",
+                    "sentiment_score": sentiment_by_ticker.get(pos["ticker"])
+                },
                 "is_in_portfolio": True
             })
             processed_tickers.add(pos["ticker"])
         
         # 후보 종목 추가 (기술분석 실패 시 해당 종목 스킵)
-        for candidate in candidates[:5]:
+        for candidate in candidates[:DECISION_CANDIDATES]:
             ticker = candidate.get("ticker", "")
             if ticker in processed_tickers:
                 continue
             
-            tech = await self.get_technical_analysis(ticker)
+            tech = tech_by_ticker.get(ticker)
             
             # 기술분석 실패 또는 현재가 없으면 스킵
             if not tech or tech.get("current_price", 0) <= 0:
@@ -652,18 +901,22 @@ class PortfolioManager:
             universe.append({
                 "ticker": ticker,
                 "name": candidate.get("name", ""),
+                "sector": candidate.get("sector", ""),
                 "current_price": tech.get("current_price", 0),
                 "technical": self._simplify_technical(tech),
                 "fundamental": {
                     "valuation": "fair",
                     "quality": "medium",
                     "growth": "medium",
+                    "sentiment_score": candidate.get("avg_sentiment"),
                     "recent_events": candidate.get("top_headlines", [])[:3]
                 },
                 "is_in_portfolio": False
             })
             processed_tickers.add(ticker)
         
+        self._decision_prices = {item["ticker"]: item["current_price"] for item in universe}
+        
         # universe가 비어있으면 기본 결정 반환 (모두 HOLD)
         if not universe:
             logger.warning("Universe is empty, returning default HOLD decision")
@@ -696,19 +949,53 @@ class PortfolioManager:
             }
         }
         
-        # GPT 호출
-        try:
-            response = await self._openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": GPT_SYSTEM_PROMPT},
-                    {"role": "user", "content": json.dumps(gpt_input, ensure_ascii=False)}
-                ],
-                temperature=0.2,
-                max_tokens=2048
+        # 규칙 기반 결정 (GPT 지연/실패 시 대체, 평소에는 비교용으로 기록)
+        with span("rule_engine"):
+            rule_decision = rule_engine.decide(gpt_input)
+        fallback = rule_decision if RULE_FALLBACK_ENABLED else {"ticker_decisions": []}
+        
+        # 입력이 이전 사이클과 사실상 같으면 GPT 호출 생략
+        cache_key = None
+        if DECISION_CACHE_ENABLED:
+            cache_key = fingerprint(
+                gpt_input, DECISION_CACHE_PRICE_TOLERANCE, DECISION_CACHE_RSI_BUCKET, DECISION_CACHE_SALT
             )
-            
-            content = response.choices[0].message.content
+            cached = self.decision_cache.get(cache_key)
+            record_cache("gpt_decision", cached is not None)
+            if cached is not None:
+                record_llm_usage(
+                    GPT_MODEL, cached.prompt_tokens, cached.completion_tokens, cached=True, seconds=cached.seconds
+                )
+                logger.info(f"Inputs unchanged, reusing decision from {cached.decision['meta'].get('reused_from')}")
+                return cached.decision
+        
+        if DECISION_MODE == "map_reduce":
+            return await self._map_reduce_decision(gpt_input, rule_decision, fallback, cache_key)
+        
+        # GPT 입력 인코딩 (compact: 토큰 예산 내로 축약, 토크나이저/인코딩 실패 시 JSON 그대로)
+        user_content = json.dumps(gpt_input, ensure_ascii=False)
+        if GPT_PAYLOAD_FORMAT == "compact":
+            try:
+                user_content, payload_report = payload_encoder.encode(gpt_input, GPT_PAYLOAD_TOKEN_BUDGET)
+                logger.info(
+                    f"GPT payload: {payload_report['tokens']} tokens "
+                    f"(json {payload_report['json_tokens']}, budget {payload_report['budget']}, "
+                    f"dropped {payload_report['dropped'] or 'none'})"
+                )
+            except Exception as e:
+                logger.error(f"Compact payload encoding failed, sending JSON: {e}")
+        
+        # GPT 호출 (GPT_DECISION_DEADLINE 초과 시 취소)
+        try:
+            gpt_started = time.perf_counter()
+            with track_outbound("openai", GPT_MODEL):
+                content, prompt_tokens, completion_tokens = await asyncio.wait_for(
+                    self._call_gpt(user_content, on_ticker_decision),
+                    timeout=GPT_DECISION_DEADLINE
+                )
+            gpt_seconds = time.perf_counter() - gpt_started
+            record_llm_usage(GPT_MODEL, prompt_tokens, completion_tokens)
+            logger.info(f"GPT usage: prompt {prompt_tokens}, completion {completion_tokens} tokens, {gpt_seconds:.2f}s")
             
             # JSON 파싱 시도
             try:
@@ -720,19 +1007,27 @@ class PortfolioManager:
                 
                 decision = json.loads(content.strip())
                 logger.info(f"GPT decision: {decision.get('meta', {}).get('overall_comment', '')}")
+                comparison = rule_engine.compare(decision, rule_decision)
+                logger.info(f"GPT/rule agreement: {comparison['agreement']} ({comparison['agree']}/{comparison['tickers']})")
+                
+                if cache_key:
+                    self.decision_cache.put(cache_key, decision, prompt_tokens, completion_tokens, gpt_seconds)
                 
                 # S3에 결정 결과 저장 (비동기)
-                asyncio.create_task(self._save_decision_to_s3(gpt_input, decision))
+                asyncio.create_task(self._save_decision_to_s3(gpt_input, decision, rule_decision))
                 
                 return decision
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse GPT response: {e}")
-                return {"ticker_decisions": []}
+                return fallback
                 
+        except asyncio.TimeoutError:
+            logger.warning(f"GPT call exceeded {GPT_DECISION_DEADLINE}s deadline, using rule-based decision")
+            return fallback
         except Exception as e:
             logger.error(f"GPT call failed: {e}")
-            return {"ticker_decisions": []}
+            return fallback
     
     def _get_empty_technical(self) -> Dict:
         """빈 기술분석 데이터 (기본값)"""
@@ -806,10 +1101,9 @@ class PortfolioManager:
                 
                 if 9 <= hour < 15 or (hour == 15 and minute <= 30):
                     logger.info("Starting decision cycle...")
-                    decision = await self.make_decision()
-                    if decision.get("ticker_decisions"):
-                        results = await self.execute_decision(decision)
-                        logger.info(f"Decision executed: {len(results)} orders")
+                    cycle = await self.run_decision_cycle()
+                    if cycle["execution_results"]:
+                        logger.info(f"Decision executed: {len(cycle['execution_results'])} orders")
                 else:
                     logger.info("Market closed, skipping decision cycle")
                 
@@ -864,6 +1158,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+setup_metrics(app)
+setup_tracing(app, "portfolio-manager")
 
 
 @app.get("/api/portfolio", response_model=PortfolioStatus)
@@ -885,12 +1181,23 @@ async def get_portfolio():
 async def trigger_decision():
     """수동 매매 결정 트리거"""
     try:
-        decision = await portfolio_manager.make_decision()
-        results = await portfolio_manager.execute_decision(decision)
-        return {
-            "decision": decision,
-            "execution_results": results
-        }
+        return await portfolio_manager.run_decision_cycle()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/decision-cache/stats")
+async def get_decision_cache_stats():
+    """결정 캐시 통계 (적중률, 절약한 토큰/대기 시간)"""
+    return portfolio_manager.decision_cache.stats()
+
+
+@app.post("/api/risk-check")
+async def trigger_risk_check():
+    """수동 손절/익절 점검 트리거"""
+    try:
+        orders = await portfolio_manager._check_stop_loss_take_profit()
+        return {"orders": orders}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -915,7 +1222,7 @@ async def liveness_probe():
 async def readiness_probe():
     """Readiness probe"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        async with http_client(timeout=5.0) as client:
             response = await client.get(f"{AUTH_AGENT_URL}/health/live")
             if response.status_code != 200:
                 raise HTTPException(status_code=503, detail="Auth agent not ready")
@@ -0,0 +1,177 @@
+"""
+map-reduce 매매 결정 (큰 universe 용)
+- map: 섹터별 종목 묶음마다 작은 GPT 프롬프트로 종목 점수(-1 ~ 1)만 받음 (동시 호출 수 제한)
+- reduce: rule_engine.allocate 로 점수를 제약조건 안의 목표 비중으로 변환 (결정적, GPT 호출 없음)
+- 점수를 받지 못한 묶음(실패/시간 초과)은 규칙 기반 점수로 채움
+"""
+import json
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, ValidationError
+
+import payload_encoder
+import rule_engine
+
+logger = logging.getLogger(__name__)
+
+MAP_SYSTEM_PROMPT = """# Role
+
+You are the **Ticker Scoring Agent** for an automated trading system in the Korean stock market.
+You see a small batch of tickers (usually one sector) together with the macro view and the account state.
+Score each ticker for the next trading days. Another component turns the scores into orders,
+so do not output actions or weights.
+
+# Output format (JSON only)
+
+```json
+{
+  "scores": [
+    {"ticker": "005930", "score": 0.4, "confidence": 0.7, "reason": "max 1 sentence"}
+  ]
+}
+```
+
+- score: -1 (strong sell) .. 0 (hold) .. 1 (strong buy). Held tickers with deteriorating signals deserve negative scores.
+- confidence: 0..1. Prefer scores near 0 when signals conflict or data is missing.
+- Include every ticker of the batch exactly once. Output must be valid JSON only.
+""" + payload_encoder.COMPACT_INPUT_NOTE
+
+# (system_prompt, user_content) → (응답 본문, prompt 토큰, completion 토큰)
+CompleteFn = Callable[[str, str], Awaitable[Tuple[str, int, int]]]
+
+
+class TickerScore(BaseModel):
+    """map 응답의 종목 점수"""
+    ticker: str = Field(min_length=1, max_length=12)
+    score: float = Field(ge=-1.0, le=1.0)
+    confidence: float = Field(default=1.0, ge=0.0, le=1.0)
+    reason: str = ""
+
+
+def group_batches(universe: List[Dict[str, Any]], batch_size: int) -> List[List[Dict[str, Any]]]:
+    """섹터별로 묶은 뒤 batch_size 단위로 자르고, 작은 묶음끼리는 합쳐서 호출 수를 줄임"""
+    batch_size = max(1, batch_size)
+    by_sector: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for item in universe:
+        by_sector[item.get("sector") or ""].append(item)
+
+    chunks = [
+        items[i:i + batch_size]
+        for _, items in sorted(by_sector.items())
+        for i in range(0, len(items), batch_size)
+    ]
+    batches: List[List[Dict[str, Any]]] = []
+    for chunk in sorted(chunks, key=len, reverse=True):
+        target = next((b for b in batches if len(b) + len(chunk) <= batch_size), None)
+        if target is None:
+            batches.append(list(chunk))
+        else:
+            target.extend(chunk)
+    return batches
+
+
+def batch_input(gpt_input: Dict[str, Any], batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """묶음 종목만 남긴 GPT 입력 (계좌 합계/제약조건/거시 판단은 그대로)"""
+    tickers = {item.get("ticker") for item in batch}
+    portfolio = dict(gpt_input.get("portfolio", {}))
+    portfolio["positions"] = [p for p in portfolio.get("positions", []) if p.get("ticker") in tickers]
+    return {**gpt_input, "portfolio": portfolio, "universe": batch}
+
+
+def parse_scores(content: str) -> Dict[str, TickerScore]:
+    """map 응답 → 종목별 점수 (형식이 틀린 항목은 건너뜀)"""
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0]
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0]
+    data = json.loads(content.strip())
+    scores = {}
+    for element in data.get("scores", []) if isinstance(data, dict) else []:
+        try:
+            score = TickerScore.model_validate(element)
+        except ValidationError:
+            logger.warning(f"Invalid ticker score: {element}")
+            continue
+        scores[score.ticker] = score
+    return scores
+
+
+async def map_scores(
+    complete: CompleteFn,
+    gpt_input: Dict[str, Any],
+    batch_size: int,
+    token_budget: int = 0,
+    timeout: Optional[float] = None
+) -> Tuple[Dict[str, TickerScore], Dict[str, Any]]:
+    """
+    묶음별 GPT 점수를 동시에 요청 (동시 호출 수 제한은 complete 쪽 책임)
+    timeout 안에 끝나지 않은 묶음은 취소하고 실패로 집계 (끝난 묶음의 점수는 사용)
+    반환: (종목별 점수, 보고서: batches / failed / prompt_tokens / completion_tokens)
+    """
+    batches = group_batches(gpt_input.get("universe", []), batch_size)
+
+    async def run(batch: List[Dict[str, Any]]):
+        user_content, _ = payload_encoder.encode(batch_input(gpt_input, batch), token_budget)
+        content, prompt_tokens, completion_tokens = await complete(MAP_SYSTEM_PROMPT, user_content)
+        return parse_scores(content), prompt_tokens, completion_tokens
+
+    tasks = [asyncio.create_task(run(batch)) for batch in batches]
+    scores: Dict[str, TickerScore] = {}
+    report = {"batches": len(batches), "failed": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    if not tasks:
+        return scores, report
+
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    for batch, task in zip(batches, tasks):
+        tickers = [item.get("ticker") for item in batch]
+        if task in pending:
+            report["failed"] += 1
+            logger.warning(f"Map batch {tickers} timed out after {timeout}s")
+            continue
+        if task.exception() is not None:
+            report["failed"] += 1
+            logger.warning(f"Map batch {tickers} failed: {task.exception()!r}")
+            continue
+        batch_scores, prompt_tokens, completion_tokens = task.result()
+        scores.update({t: s for t, s in batch_scores.items() if t in tickers})
+        report["prompt_tokens"] += prompt_tokens
+        report["completion_tokens"] += completion_tokens
+    return scores, report
+
+
+def reduce(
+    gpt_input: Dict[str, Any],
+    scores: Dict[str, TickerScore],
+    rule_scores: Optional[Sequence[float]] = None
+) -> Dict[str, Any]:
+    """
+    점수 → 결정 (rule_engine.allocate)
+    - 신뢰도만큼 GPT 점수를 반영하고 나머지는 규칙 점수로 채움
+    - GPT 점수가 없는 종목은 규칙 점수 사용
+    """
+    universe = gpt_input.get("universe", [])
+    if rule_scores is None:
+        macro_bias = gpt_input.get("macro", {}).get("market_bias_hint", "uncertain")
+        rule_scores = rule_engine.score_universe(universe, macro_bias)
+
+    combined = []
+    reasons = []
+    for item, rule_score in zip(universe, rule_scores):
+        score = scores.get(item.get("ticker"))
+        if score is None:
+            combined.append(float(rule_score))
+            reasons.append(f"No LLM score; rule score {rule_score:+.2f}.")
+        else:
+            combined.append(score.confidence * score.score + (1 - score.confidence) * float(rule_score))
+            reasons.append(score.reason or f"LLM score {score.score:+.2f}.")
+
+    decision = rule_engine.allocate(gpt_input, np.array(combined), reasons, source="map_reduce")
+    decision["meta"]["scored_tickers"] = sum(1 for item in universe if item.get("ticker") in scores)
+    return decision
@@ -0,0 +1,142 @@
+"""
+목표 비중 → 주문 목록 컴파일러
+- 포트폴리오 스냅샷, 가격 벡터, 목표 비중으로 모든 주문 수량을 한 번에(벡터 연산) 계산
+- 제약조건: 종목 비중 상한, 최소 주문 금액, 회전율 상한, 현금 (매도 대금을 먼저 반영한 뒤 매수)
+- 매도는 위험 축소이므로 회전율/현금 제약으로 줄이지 않고, 매수 수량만 비례 축소
+- 주문 순서: 매도(priority 순) → 매수(priority 순)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CompiledOrder:
+    """컴파일된 주문 (full_exit: 전량 매도, 실제 수량은 매도 가능 수량으로 보정)"""
+    ticker: str
+    action: str  # "BUY" | "SELL"
+    qty: int
+    price: float
+    priority: int = 0
+    full_exit: bool = False
+
+    @property
+    def amount(self) -> float:
+        return self.qty * self.price
+
+
+@dataclass
+class CompileReport:
+    """컴파일 결과 요약 (로그/디버깅용)"""
+    sell_amount: float = 0.0
+    buy_amount: float = 0.0
+    turnover_ratio: float = 0.0
+    buy_scale: float = 1.0
+    skipped: Dict[str, str] = field(default_factory=dict)  # ticker → 사유
+
+
+def compile_orders(
+    portfolio: Dict[str, Any],
+    ticker_decisions: List[Dict[str, Any]],
+    prices: Dict[str, float],
+    min_order_krw: float = 0.0,
+    max_single_weight: float = 1.0,
+    max_turnover_ratio: float = 1.0
+) -> Tuple[List[CompiledOrder], CompileReport]:
+    """
+    ticker_decisions(BUY/SELL/HOLD + target_weight) → 주문 목록
+    prices: 종목별 현재가 (없으면 보유 포지션의 current_price 사용, 둘 다 없으면 제외)
+    """
+    report = CompileReport()
+    positions = {p["ticker"]: p for p in portfolio.get("positions", [])}
+    total_value = float(portfolio.get("total_value", 0) or 0)
+
+    decisions = []
+    for decision in ticker_decisions:
+        action = str(decision.get("action", "HOLD")).upper()
+        ticker = decision.get("ticker")
+        if action not in ("BUY", "SELL") or not ticker:
+            continue
+        price = prices.get(ticker) or positions.get(ticker, {}).get("current_price") or 0
+        if price <= 0:
+            report.skipped[ticker] = "no_price"
+            continue
+        decisions.append((ticker, action, float(price), decision))
+
+    if not decisions or total_value <= 0:
+        return [], report
+
+    tickers = [d[0] for d in decisions]
+    is_buy = np.array([d[1] == "BUY" for d in decisions])
+    price = np.array([d[2] for d in decisions])
+    shares = np.array([float(positions.get(t, {}).get("shares", 0) or 0) for t in tickers])
+    target_weight = np.clip(
+        np.array([float(d[3].get("target_weight", 0) or 0) for d in decisions]), 0.0, max_single_weight
+    )
+    priority = np.array([int(d[3].get("priority", 0) or 0) for d in decisions])
+
+    # 목표 금액과 현재 평가금액의 차이 → 수량 (매수는 내림, 매도는 내림 후 보유 수량 이내)
+    delta = target_weight * total_value - shares * price
+    full_exit = ~is_buy & (target_weight == 0) & (shares > 0)
+    buy_qty = np.where(is_buy & (delta > 0), np.floor(delta / price), 0)
+    sell_qty = np.where(~is_buy & (delta < 0), np.minimum(np.floor(-delta / price), shares), 0)
+    sell_qty = np.where(full_exit, shares, sell_qty)
+
+    # 최소 주문 금액 (전량 매도는 예외)
+    small_sell = (sell_qty > 0) & (sell_qty * price < min_order_krw) & ~full_exit
+    sell_qty = np.where(small_sell, 0, sell_qty)
+    buy_qty = np.where(buy_qty * price < min_order_krw, 0, buy_qty)
+
+    # 회전율 / 현금: 매도 대금을 먼저 반영하고 남는 한도 안에서 매수를 비례 축소
+    sell_amount = float((sell_qty * price).sum())
+    buy_amount = float((buy_qty * price).sum())
+    if buy_amount > 0:
+        turnover_room = max(0.0, max_turnover_ratio * total_value - sell_amount)
+        cash_room = max(0.0, float(portfolio.get("cash_krw", 0) or 0) + sell_amount)
+        scale = min(1.0, turnover_room / buy_amount, cash_room / buy_amount)
+        if scale < 1.0:
+            buy_qty = np.floor(buy_qty * scale)
+            buy_qty = np.where(buy_qty * price < min_order_krw, 0, buy_qty)
+            report.buy_scale = round(scale, 4)
+        buy_amount = float((buy_qty * price).sum())
+
+    report.sell_amount = sell_amount
+    report.buy_amount = buy_amount
+    report.turnover_ratio = round((sell_amount + buy_amount) / total_value, 4)
+
+    qty = np.where(is_buy, buy_qty, sell_qty).astype(int)
+    wants_trade = np.where(is_buy, delta > 0, (delta < 0) | full_exit)
+    for i, ticker in enumerate(tickers):
+        if qty[i] <= 0:
+            report.skipped[ticker] = "below_min_order" if wants_trade[i] else "no_change"
+
+    # 매도 먼저 (현금 확보), 같은 종류 안에서는 priority 순
+    order_idx = sorted(np.flatnonzero(qty > 0), key=lambda i: (bool(is_buy[i]), priority[i]))
+    orders = [
+        CompiledOrder(
+            ticker=tickers[i],
+            action="BUY" if is_buy[i] else "SELL",
+            qty=int(qty[i]),
+            price=float(price[i]),
+            priority=int(priority[i]),
+            full_exit=bool(full_exit[i]),
+        )
+        for i in order_idx
+    ]
+    return orders, report
+
+
+def cap_quantities(orders: List[CompiledOrder], sellable: Dict[str, int]) -> List[CompiledOrder]:
+    """매도 수량을 매도 가능 수량(미체결/결제 대기 제외) 이내로 보정"""
+    capped = []
+    for order in orders:
+        if order.action == "SELL" and order.ticker in sellable:
+            limit = sellable[order.ticker]
+            qty = limit if order.full_exit else min(order.qty, limit)
+            if qty <= 0:
+                continue
+            order = CompiledOrder(order.ticker, order.action, qty, order.price, order.priority, order.full_exit)
+        capped.append(order)
+    return capped
+
@@ -0,0 +1,204 @@
+"""
+GPT 입력 압축 인코더
+- gpt_input(dict) → 짧은 키와 종목별 CSV 행으로 이루어진 텍스트
+- 토큰 예산을 넘으면 우선순위가 낮은 정보부터 제거
+  (헤드라인 → 거시 요약 축약 → 주/월 신호 → 볼린저/손익률 → 종목명 → 거시 요약 → 후보 종목 행)
+- 보유 종목 행과 제약조건은 제거하지 않음
+- 토큰 수는 tiktoken 이 있으면 실제 인코딩으로, 없으면 근사치로 계산
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - 근사치로 대체
+    tiktoken = None
+
+# GPT 시스템 프롬프트에 덧붙이는 입력 형식 설명
+COMPACT_INPUT_NOTE = """
+# Input format (compact)
+
+The user message is plain text, not JSON:
+- `macro bias=<bias>`, then optional `macro+` (positive) / `macro-` (negative) summaries
+- `account cash=<KRW> total=<KRW>`
+- `limits max_buy max_sell min_order max_turnover max_weight risk` = constraints
+- a CSV table, one row per ticker. Columns:
+  t=ticker, n=name, px=current price, h=held (1/0), w=portfolio weight, pl=profit/loss rate,
+  dT/wT/mT=day/week/month trend (u=up, d=down, s=sideway), rsi=day RSI,
+  dM/wM=day/week MACD signal (+ bullish, - bearish, 0 neutral), bb=day Bollinger position (U/M/L),
+  s=news sentiment (0..1, 0.5 neutral). Missing columns were omitted to save space.
+- `events` lines: `<ticker>: headline | headline`
+"""
+
+TREND_CODE = {"up": "u", "down": "d", "sideway": "s"}
+MACD_CODE = {"bullish": "+", "bearish": "-", "neutral": "0"}
+BOLLINGER_CODE = {"upper": "U", "middle": "M", "lower": "L"}
+
+ALL_COLUMNS = ["t", "n", "px", "h", "w", "pl", "dT", "rsi", "dM", "bb", "wT", "wM", "mT", "s"]
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 (tiktoken 없으면 ASCII 4자당 1토큰, 한글 등 그 외 문자 1.5자당 1토큰으로 근사)"""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def _fmt(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.3f}".rstrip("0").rstrip(".") or "0"
+    return str(value).replace(",", " ")
+
+
+class _Payload:
+    """압축 표현 상태 (제거 단계마다 갱신 후 다시 렌더링)"""
+
+    def __init__(self, gpt_input: Dict[str, Any]):
+        self.gpt_input = gpt_input
+        self.columns = list(ALL_COLUMNS)
+        self.headlines_per_ticker = 3
+        self.macro_summary_chars: Optional[int] = None  # None: 전체, 0: 제외
+        self.candidate_rows = sum(1 for item in gpt_input.get("universe", []) if not item.get("is_in_portfolio"))
+
+    def _rows(self) -> List[Dict[str, str]]:
+        portfolio = self.gpt_input.get("portfolio", {})
+        positions = {p.get("ticker"): p for p in portfolio.get("positions", [])}
+        rows = []
+        candidates_left = self.candidate_rows
+        for item in self.gpt_input.get("universe", []):
+            held = bool(item.get("is_in_portfolio"))
+            if not held:
+                if candidates_left <= 0:
+                    continue
+                candidates_left -= 1
+            position = positions.get(item.get("ticker"), {})
+            technical = item.get("technical", {})
+            day, week, month = technical.get("day", {}), technical.get("week", {}), technical.get("month", {})
+            rsi = day.get("rsi")
+            rows.append({
+                "t": item.get("ticker", ""),
+                "n": item.get("name", ""),
+                "px": _fmt(item.get("current_price")),
+                "h": "1" if held else "0",
+                "w": _fmt(round(position.get("weight_in_portfolio", 0.0), 3)) if held else "0",
+                "pl": _fmt(round(position.get("profit_loss_rate", 0.0), 3)) if held else "",
+                "dT": TREND_CODE.get(day.get("trend"), "s"),
+                "rsi": str(int(round(rsi))) if isinstance(rsi, (int, float)) else "",
+                "dM": MACD_CODE.get(day.get("macd_signal"), "0"),
+                "bb": BOLLINGER_CODE.get(day.get("bollinger_position"), "M"),
+                "wT": TREND_CODE.get(week.get("trend"), "s"),
+                "wM": MACD_CODE.get(week.get("macd_signal"), "0"),
+                "mT": TREND_CODE.get(month.get("trend"), "s"),
+                "s": _fmt(item.get("fundamental", {}).get("sentiment_score")),
+                "_events": item.get("fundamental", {}).get("recent_events", []) or [],
+            })
+        return rows
+
+    def render(self) -> str:
+        macro = self.gpt_input.get("macro", {})
+        portfolio = self.gpt_input.get("portfolio", {})
+        constraints = self.gpt_input.get("constraints", {})
+
+        lines = [f"time={self.gpt_input.get('now_utc', '')}", f"macro bias={macro.get('market_bias_hint', 'uncertain')}"]
+        if self.macro_summary_chars != 0:
+            for prefix, key in (("macro+", "positive_summary"), ("macro-", "negative_summary")):
+                text = " ".join(str(macro.get(key, "")).split())
+                if self.macro_summary_chars:
+                    text = text[:self.macro_summary_chars]
+                if text:
+                    lines.append(f"{prefix} {text}")
+        lines.append(f"account cash={portfolio.get('cash_krw', 0)} total={portfolio.get('total_value', 0)}")
+        lines.append(
+            f"limits max_buy={constraints.get('max_buy_candidates')} max_sell={constraints.get('max_sell_candidates')} "
+            f"min_order={constraints.get('min_order_krw')} max_turnover={constraints.get('max_turnover_ratio')} "
+            f"max_weight={constraints.get('target_max_single_ticker_weight')} risk={constraints.get('risk_mode')}"
+        )
+
+        rows = self._rows()
+        lines.append(",".join(self.columns))
+        lines.extend(",".join(row[col] for col in self.columns) for row in rows)
+
+        if self.headlines_per_ticker > 0:
+            events = [
+                f"{row['t']}: " + " | ".join(" ".join(str(h).split()) for h in row["_events"][:self.headlines_per_ticker])
+                for row in rows if row["_events"]
+            ]
+            if events:
+                lines.append("events")
+                lines.extend(events)
+        return "\n".join(lines)
+
+
+def _drop_columns(*columns: str) -> Callable[[_Payload], bool]:
+    def step(payload: _Payload) -> bool:
+        before = len(payload.columns)
+        payload.columns = [c for c in payload.columns if c not in columns]
+        return len(payload.columns) != before
+    step.__name__ = f"columns:{'/'.join(columns)}"
+    return step
+
+
+def _set(attr: str, value: Any, name: str) -> Callable[[_Payload], bool]:
+    def step(payload: _Payload) -> bool:
+        if getattr(payload, attr) == value:
+            return False
+        setattr(payload, attr, value)
+        return True
+    step.__name__ = name
+    return step
+
+
+# 예산 초과 시 적용 순서 (앞쪽이 우선순위 낮음)
+DROP_STEPS = [
+    _set("headlines_per_ticker", 1, "headlines:1"),
+    _set("headlines_per_ticker", 0, "headlines"),
+    _set("macro_summary_chars", 200, "macro_summary:200"),
+    _drop_columns("wT", "wM", "mT"),
+    _drop_columns("bb", "pl"),
+    _drop_columns("n"),
+    _set("macro_summary_chars", 0, "macro_summary"),
+]
+
+
+def encode(gpt_input: Dict[str, Any], token_budget: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """
+    압축 텍스트와 보고서 반환
+    token_budget: 0 이면 제한 없음 (보고서: tokens / json_tokens / dropped)
+    """
+    payload = _Payload(gpt_input)
+    text = payload.render()
+    tokens = count_tokens(text)
+    dropped: List[str] = []
+
+    if token_budget > 0:
+        for step in DROP_STEPS:
+            if tokens <= token_budget:
+                break
+            if step(payload):
+                dropped.append(step.__name__)
+                text = payload.render()
+                tokens = count_tokens(text)
+        # 마지막 수단: 후보 종목 행을 뒤에서부터 제거 (보유 종목은 유지)
+        while tokens > token_budget and payload.candidate_rows > 0:
+            payload.candidate_rows -= 1
+            dropped.append("candidate_row")
+            text = payload.render()
+            tokens = count_tokens(text)
+
+    report = {
+        "tokens": tokens,
+        "json_tokens": count_tokens(json.dumps(gpt_input, ensure_ascii=False)),
+        "budget": token_budget,
+        "over_budget": bool(token_budget) and tokens > token_budget,
+        "dropped": dropped,
+        "counter": "tiktoken" if tiktoken is not None else "approx",
+    }
+    return text, report
@@ -0,0 +1,211 @@
+"""
+규칙 기반 매매 결정 엔진 (GPT 대체/비교용)
+- GPT 와 같은 입력(universe / portfolio / macro / constraints)을 받아 같은 JSON 형식으로 결정
+- 종목별 신호(추세, MACD, RSI, 볼린저 위치, 뉴스 감성)를 행렬로 만들어 가중합으로 점수 계산
+- 결정적(deterministic)이고 가벼워서 매 사이클 GPT 결과와 함께 계산해 비교 가능
+- allocate() 는 임의의 종목 점수(예: map-reduce GPT 점수)를 제약조건 안의 목표 비중으로 변환
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 매수/매도 점수 기준 (점수 범위 -1 ~ 1)
+RULE_BUY_THRESHOLD = float(os.getenv("RULE_BUY_THRESHOLD", "0.35"))
+RULE_SELL_THRESHOLD = float(os.getenv("RULE_SELL_THRESHOLD", "-0.3"))
+RULE_FULL_EXIT_THRESHOLD = float(os.getenv("RULE_FULL_EXIT_THRESHOLD", "-0.6"))
+
+# 신호 열 순서와 가중치
+FEATURES = (
+    "day_trend", "week_trend", "month_trend",
+    "day_macd", "week_macd",
+    "rsi", "bollinger", "sentiment",
+)
+WEIGHTS = np.array([0.15, 0.15, 0.10, 0.15, 0.10, 0.10, 0.05, 0.20])
+
+TREND_SCORE = {"up": 1.0, "down": -1.0}
+MACD_SCORE = {"bullish": 1.0, "bearish": -1.0}
+BOLLINGER_SCORE = {"lower": 1.0, "upper": -1.0}
+
+# 거시 판단별 (점수 보정, 목표 현금 비중, 위험 조치)
+MACRO_POLICY = {
+    "bullish": (0.10, 0.2, "increase_exposure"),
+    "neutral": (0.0, 0.3, "keep_exposure"),
+    "uncertain": (-0.05, 0.4, "keep_exposure"),
+    "bearish": (-0.15, 0.5, "reduce_exposure"),
+}
+
+
+def _feature_row(item: Dict[str, Any]) -> List[float]:
+    """universe 항목 → 신호 벡터 (각 값 -1 ~ 1)"""
+    technical = item.get("technical", {})
+    day = technical.get("day", {})
+    week = technical.get("week", {})
+    month = technical.get("month", {})
+
+    # RSI: 30 이하 과매도(+1), 70 이상 과매수(-1), 그 사이는 선형
+    rsi = float(day.get("rsi", 50) or 50)
+    rsi_score = float(np.clip((50 - rsi) / 20, -1.0, 1.0))
+
+    # 뉴스 감성: 0~1 (0.5 중립) → -1~1, 정보 없으면 0
+    sentiment = item.get("fundamental", {}).get("sentiment_score")
+    sentiment_score = float(np.clip(sentiment * 2 - 1, -1.0, 1.0)) if sentiment is not None else 0.0
+
+    return [
+        TREND_SCORE.get(day.get("trend"), 0.0),
+        TREND_SCORE.get(week.get("trend"), 0.0),
+        TREND_SCORE.get(month.get("trend"), 0.0),
+        MACD_SCORE.get(day.get("macd_signal"), 0.0),
+        MACD_SCORE.get(week.get("macd_signal"), 0.0),
+        rsi_score,
+        BOLLINGER_SCORE.get(day.get("bollinger_position"), 0.0),
+        sentiment_score,
+    ]
+
+
+def score_universe(universe: List[Dict[str, Any]], macro_bias: str = "neutral") -> np.ndarray:
+    """종목별 점수 (-1 ~ 1, 거시 판단 보정 포함)"""
+    if not universe:
+        return np.zeros(0)
+    features = np.array([_feature_row(item) for item in universe])
+    offset = MACRO_POLICY.get(macro_bias, MACRO_POLICY["uncertain"])[0]
+    return np.clip(features @ WEIGHTS / WEIGHTS.sum() + offset, -1.0, 1.0)
+
+
+def _reason(item: Dict[str, Any], score: float) -> str:
+    day = item.get("technical", {}).get("day", {})
+    week = item.get("technical", {}).get("week", {})
+    return (
+        f"Rule score {score:+.2f}: trend {day.get('trend', 'sideway')}/{week.get('trend', 'sideway')}, "
+        f"MACD {day.get('macd_signal', 'neutral')}, RSI {day.get('rsi', 50)}."
+    )
+
+
+def _macro_bias(gpt_input: Dict[str, Any]) -> str:
+    macro_bias = gpt_input.get("macro", {}).get("market_bias_hint", "uncertain")
+    return macro_bias if macro_bias in MACRO_POLICY else "uncertain"
+
+
+def decide(gpt_input: Dict[str, Any]) -> Dict[str, Any]:
+    """GPT 입력과 같은 payload 로 GPT 출력 형식의 결정 생성"""
+    universe = gpt_input.get("universe", [])
+    scores = score_universe(universe, _macro_bias(gpt_input))
+    reasons = [_reason(item, float(score)) for item, score in zip(universe, scores)]
+    return allocate(gpt_input, scores, reasons)
+
+
+def allocate(
+    gpt_input: Dict[str, Any],
+    scores: np.ndarray,
+    reasons: Optional[Sequence[str]] = None,
+    source: str = "rules"
+) -> Dict[str, Any]:
+    """
+    종목 점수(universe 순서, -1 ~ 1) → 제약조건을 지키는 목표 비중과 GPT 출력 형식의 결정
+    (매수/매도 종목 수, 종목 비중 상한, 회전율, 거시 판단별 현금 비중)
+    """
+    universe = gpt_input.get("universe", [])
+    portfolio = gpt_input.get("portfolio", {})
+    constraints = gpt_input.get("constraints", {})
+    macro_bias = _macro_bias(gpt_input)
+    _, target_cash_ratio, risk_action = MACRO_POLICY[macro_bias]
+    scores = np.asarray(scores, dtype=float)
+    if reasons is None:
+        reasons = [f"Score {score:+.2f}." for score in scores]
+
+    max_weight = float(constraints.get("target_max_single_ticker_weight", 0.2))
+    max_buys = int(constraints.get("max_buy_candidates", 3))
+    max_sells = int(constraints.get("max_sell_candidates", 3))
+    max_turnover = float(constraints.get("max_turnover_ratio", 0.3))
+
+    total_value = float(portfolio.get("total_value", 0) or 0)
+    eval_amounts = {p["ticker"]: float(p.get("eval_amount", 0) or 0) for p in portfolio.get("positions", [])}
+    current = np.array([
+        eval_amounts.get(item["ticker"], 0.0) / total_value if total_value > 0 else 0.0
+        for item in universe
+    ])
+    held = np.array([bool(item.get("is_in_portfolio")) for item in universe], dtype=bool)
+
+    # 매도: 보유 종목 중 점수 낮은 순
+    sell_idx = [i for i in np.argsort(scores) if held[i] and scores[i] <= RULE_SELL_THRESHOLD][:max_sells]
+    # 매수: 현재 비중이 상한 미만인 종목 중 점수 높은 순
+    buy_idx = [
+        i for i in np.argsort(-scores)
+        if scores[i] >= RULE_BUY_THRESHOLD and current[i] < max_weight
+    ][:max_buys]
+
+    target = current.copy()
+    for i in sell_idx:
+        target[i] = 0.0 if scores[i] <= RULE_FULL_EXIT_THRESHOLD else current[i] / 2
+
+    if buy_idx:
+        # 투자 가능 비중을 점수 비례로 배분 (종목 상한 적용)
+        others = np.ones(len(universe), dtype=bool)
+        others[buy_idx] = False
+        investable = max(0.0, 1.0 - target_cash_ratio - target[others].sum())
+        buy_scores = scores[buy_idx]
+        alloc = np.minimum(max_weight, current[buy_idx] + investable * buy_scores / buy_scores.sum())
+        target[buy_idx] = np.maximum(alloc, current[buy_idx])
+
+    # 회전율 제한: 매수 증가분을 비례 축소
+    turnover = np.abs(target - current).sum()
+    if turnover > max_turnover and buy_idx:
+        sold = np.abs(target - current)[sell_idx].sum() if sell_idx else 0.0
+        room = max(0.0, max_turnover - sold)
+        added = (target - current)[buy_idx]
+        if added.sum() > 0:
+            target[buy_idx] = current[buy_idx] + added * min(1.0, room / added.sum())
+
+    decisions = []
+    for rank, i in enumerate(list(sell_idx) + list(buy_idx), start=1):
+        decisions.append({
+            "ticker": universe[i]["ticker"],
+            "action": "SELL" if i in sell_idx else "BUY",
+            "target_weight": round(float(target[i]), 4),
+            "priority": rank,
+            "strength": round(abs(float(scores[i])), 3),
+            "reason": reasons[i],
+        })
+    acted = set(sell_idx) | set(buy_idx)
+    for i in np.flatnonzero(held):
+        if i not in acted:
+            decisions.append({
+                "ticker": universe[i]["ticker"],
+                "action": "HOLD",
+                "target_weight": round(float(current[i]), 4),
+                "priority": len(decisions) + 1,
+                "strength": round(abs(float(scores[i])), 3),
+                "reason": reasons[i],
+            })
+
+    return {
+        "meta": {
+            "decision_time_utc": datetime.utcnow().isoformat() + "Z",
+            "overall_comment": (
+                f"{'Rule-based' if source == 'rules' else source} decision with {macro_bias} macro bias: "
+                f"{len(buy_idx)} buy, {len(sell_idx)} sell."
+            ),
+            "source": source,
+        },
+        "global_view": {
+            "macro_bias": macro_bias,
+            "risk_action": risk_action,
+            "target_cash_ratio": target_cash_ratio,
+        },
+        "ticker_decisions": decisions,
+    }
+
+
+def compare(primary: Dict[str, Any], fallback: Dict[str, Any]) -> Dict[str, Any]:
+    """두 결정의 종목별 action 일치 정도 (GPT vs 규칙 비교 기록용)"""
+    a = {d.get("ticker"): str(d.get("action", "HOLD")).upper() for d in primary.get("ticker_decisions", [])}
+    b = {d.get("ticker"): str(d.get("action", "HOLD")).upper() for d in fallback.get("ticker_decisions", [])}
+    tickers = sorted(set(a) | set(b))
+    agree = [t for t in tickers if a.get(t, "HOLD") == b.get(t, "HOLD")]
+    return {
+        "tickers": len(tickers),
+        "agree": len(agree),
+        "agreement": round(len(agree) / len(tickers), 3) if tickers else 1.0,
+        "diff": {t: [a.get(t, "HOLD"), b.get(t, "HOLD")] for t in tickers if t not in agree},
+    }
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import logging
 from pathlib import Path
@@ -11,6 +12,11 @@ from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import setup_metrics, instrument_s3  # noqa: E402
+from common.tracing import setup_tracing  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +29,9 @@ AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "quartz-bucket")
 S3_CANDIDATES_KEY = "select-ticker/stock_candidates.json"
 
+# 한 번에 반환할 수 있는 최대 후보 수 (map-reduce 결정 등 큰 universe 용)
+CANDIDATES_MAX_TOP_N = int(os.getenv("CANDIDATES_MAX_TOP_N", "60"))
+
 # S3 클라이언트 (지연 초기화)
 _s3_client = None
 
@@ -30,7 +39,7 @@ def get_s3_client():
     """S3 클라이언트 반환 (싱글톤)"""
     global _s3_client
     if _s3_client is None:
-        _s3_client = boto3.client('s3', region_name=AWS_REGION)
+        _s3_client = instrument_s3(boto3.client('s3', region_name=AWS_REGION))
     return _s3_client
 
 app = FastAPI(
@@ -38,6 +47,8 @@ app = FastAPI(
     description="거래 종목 선택 에이전트 API",
     version="1.0.0"
 )
+setup_metrics(app)
+setup_tracing(app, "ticker-selector")
 
 # ==================== 데이터 모델 ====================
 
@@ -223,7 +234,8 @@ async def get_stock_candidates(request: CandidatesRequest = CandidatesRequest())
     거래 후보 종목 리스트 반환 (중요도 기반)
     
     Request Body:
-    - **top_n**: 반환할 상위 종목 개수 (기본: 5, 최대: 10)
+    - **top_n**: 반환할 상위 종목 개수 (기본: 5, 최대: CANDIDATES_MAX_TOP_N)
+      저장된 상위 후보보다 많이 요청하면 all_stocks 를 중요도 점수 순으로 이어 붙임
     
     중요도 점수 기준:
     - 시총 등급 (LARGE/MID/SMALL): 25%
@@ -235,8 +247,7 @@ async def get_stock_candidates(request: CandidatesRequest = CandidatesRequest())
         최신 거래 후보 종목 리스트 (중요도 순)
         데이터가 없으면 빈 리스트 반환
     """
-    # 최대 10개로 제한
-    top_n = min(request.top_n, 10)
+    top_n = min(request.top_n, CANDIDATES_MAX_TOP_N)
     logger.info(f"Received request for top {top_n} candidates (importance-based)")
     
     try:
@@ -251,6 +262,14 @@ async def get_stock_candidates(request: CandidatesRequest = CandidatesRequest())
         
         # top_n만큼만 반환
         top_candidates = data.get('top_candidates', [])[:top_n]
+        if len(top_candidates) < top_n:
+            listed = {c.get('ticker') for c in top_candidates}
+            rest = sorted(
+                (s for s in data.get('all_stocks', {}).values() if s.get('ticker') not in listed),
+                key=lambda s: s.get('final_score') or 0,
+                reverse=True
+            )
+            top_candidates = top_candidates + rest[:top_n - len(top_candidates)]
         
         response = CandidatesResponse(
             timestamp=data.get('timestamp', datetime.now().isoformat()),
@@ -2,10 +2,20 @@ from .base_crawler import BaseCrawler
 from .naver_crawler import NaverFinanceCrawler
 from .hankyung_crawler import HankyungCrawler
 from .mk_crawler import MKCrawler
+from .async_engine import AsyncCrawlEngine, HostLimiter
+from .crawl_state import CrawlState, SourceState
+from .url_index import UrlIndex, canonicalize_url, get_url_index
 
 __all__ = [
     'BaseCrawler',
     'NaverFinanceCrawler',
     'HankyungCrawler',
     'MKCrawler',
+    'AsyncCrawlEngine',
+    'HostLimiter',
+    'CrawlState',
+    'SourceState',
+    'UrlIndex',
+    'canonicalize_url',
+    'get_url_index',
 ]
\ No newline at end of file
@@ -0,0 +1,173 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from itertools import takewhile
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from .base_crawler import BaseCrawler
+from .crawl_state import CrawlState
+from .url_index import canonicalize_url
+
+CRAWL_MODE = os.getenv("CRAWL_MODE", "incremental")  # incremental | full
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "1"))
+CRAWL_HOST_DELAY = tuple(float(x) for x in os.getenv("CRAWL_HOST_DELAY", "1,3").split(","))
+CRAWL_DEADLINE_SECONDS = float(os.getenv("CRAWL_DEADLINE_SECONDS", "120"))
+CRAWL_MAX_CONNECTIONS = int(os.getenv("CRAWL_MAX_CONNECTIONS", "10"))
+
+
+class HostLimiter:
+    """
+    호스트별 예의(politeness) 제한: 동시 요청 수 + 요청 간 최소 간격 (delay 범위에서 랜덤)
+    - 간격은 이전 요청이 끝난 시점부터 (기존 crawl_multiple_pages 처럼 페이지를 받은 뒤 1~3초 대기)
+    - 동시 요청을 여러 개 허용할 때도 시작 시점끼리 간격 유지
+    """
+
+    def __init__(self, concurrency: int, delay: Tuple[float, float]):
+        self.delay = delay
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_at - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_at = loop.time() + random.uniform(*self.delay)
+            try:
+                yield
+            finally:
+                loop = asyncio.get_running_loop()
+                self._next_at = max(self._next_at, loop.time() + random.uniform(*self.delay))
+
+
+class AsyncCrawlEngine:
+    """
+    여러 소스를 asyncio 로 동시에 크롤링
+    - HTTP 연결 풀 하나(httpx.AsyncClient)를 모든 크롤러가 공유
+    - 소스끼리는 병렬, 같은 호스트는 HostLimiter 로 기존과 같은 간격 유지
+    - 전체 마감 시간(deadline)이 지나면 남은 페이지는 취소하고 받은 페이지만 반환
+    - state 를 주면 증분 모드: 소스마다 1페이지부터 이전에 본 기사(high-water mark)를 만날 때까지만 넘김
+      (1페이지는 ETag / Last-Modified 조건부 요청, 304 면 요청 1번으로 끝)
+    """
+
+    def __init__(
+        self,
+        host_concurrency: int = CRAWL_HOST_CONCURRENCY,
+        host_delay: Tuple[float, float] = CRAWL_HOST_DELAY,
+        deadline: float = CRAWL_DEADLINE_SECONDS,
+        max_connections: int = CRAWL_MAX_CONNECTIONS
+    ):
+        self.host_concurrency = host_concurrency
+        self.host_delay = host_delay
+        self.deadline = deadline
+        self.max_connections = max_connections
+        self.logger = logging.getLogger(__name__)
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+            },
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections),
+        )
+
+    async def crawl(self, crawlers: Dict[str, BaseCrawler], pages: int,
+                    state: Optional[CrawlState] = None) -> Dict[str, List[Dict]]:
+        """{소스 이름: 크롤러} → {소스 이름: 뉴스 목록} (소스 안에서는 페이지 순서 유지)"""
+        started = time.perf_counter()
+        limiters: Dict[str, HostLimiter] = {}
+        collected: Dict[str, Dict[int, List[Dict]]] = {name: {} for name in crawlers}
+
+        async with self._create_client() as client:
+            tasks = {}
+            for name, crawler in crawlers.items():
+                host = urlparse(crawler.get_news_list_url(1)).netloc
+                if host not in limiters:
+                    limiters[host] = HostLimiter(self.host_concurrency, self.host_delay)
+                if state is None:
+                    for page in range(1, pages + 1):
+                        task = asyncio.create_task(
+                            self._crawl_page(crawler, client, page, limiters[host], collected[name])
+                        )
+                        tasks[task] = f"{name} page {page}"
+                else:
+                    task = asyncio.create_task(
+                        self._crawl_incremental(name, crawler, client, limiters[host], pages, state, collected[name])
+                    )
+                    tasks[task] = name
+
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.logger.warning(f"Crawl deadline {self.deadline:.0f}s exceeded: {len(pending)} tasks cancelled")
+
+        for task in done:
+            if task.exception() is not None:
+                self.logger.error(f"❌ Error crawling {tasks[task]}: {task.exception()}")
+
+        # 마감 시간에 취소된 소스도 이미 받은 페이지는 포함
+        results: Dict[str, List[Dict]] = {}
+        for name, crawler in crawlers.items():
+            items = [item for page in sorted(collected[name]) for item in collected[name][page]]
+            results[name] = crawler.deduplicate(items)
+
+        self.logger.info(
+            f"Crawled {sum(len(v) for v in results.values())} news from {len(crawlers)} sources "
+            f"({len(limiters)} hosts) in {time.perf_counter() - started:.2f}s"
+        )
+        return results
+
+    @staticmethod
+    async def _crawl_page(crawler: BaseCrawler, client: httpx.AsyncClient, page: int,
+                          limiter: HostLimiter, collected: Dict[int, List[Dict]]):
+        collected[page] = await crawler.fetch_page_async(client, page, limiter)
+
+    async def _crawl_incremental(self, name: str, crawler: BaseCrawler, client: httpx.AsyncClient,
+                                 limiter: HostLimiter, pages: int, state: CrawlState,
+                                 collected: Dict[int, List[Dict]]):
+        """이전에 본 기사를 만날 때까지 페이지를 넘기고, 끝까지 성공하면 high-water mark 갱신"""
+        source_state = state.get(name)
+        known = {canonicalize_url(url) for url in source_state.recent_urls}
+        new_urls: List[str] = []
+        etag = last_modified = None
+
+        for page in range(1, pages + 1):
+            headers = source_state.conditional_headers() if page == 1 else None
+            response = await crawler.fetch_response_async(client, page, limiter, headers)
+            if response is None:
+                return  # 실패한 실행은 mark 를 옮기지 않음 (다음 실행에서 다시 수집)
+            if response.status_code == 304:
+                self.logger.info(f"{crawler.name}: not modified since last crawl")
+                break
+            if page == 1:
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+
+            items = crawler.parse_news_list(response.text)
+            urls = [canonicalize_url(item['url']) for item in items]
+            fresh_urls = list(takewhile(lambda url: url not in known, urls))
+            collected[page] = items[:len(fresh_urls)]
+            new_urls.extend(fresh_urls)
+            if not items or len(fresh_urls) < len(items):
+                break
+        else:
+            if known:
+                self.logger.warning(f"{crawler.name}: last-seen article not reached within {pages} pages")
+
+        self.logger.info(f"{crawler.name}: {len(new_urls)} new articles")
+        state.update(name, new_urls, etag, last_modified)
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod  # ✅ 추가
 from bs4 import BeautifulSoup
 import requests
+import httpx
+import asyncio
 import logging
 import random
 import time
@@ -8,6 +10,8 @@ from typing import List, Dict, Optional
 from urllib.parse import urljoin
 from datetime import datetime
 
+from .url_index import get_url_index
+
 
 class BaseCrawler(ABC):
     """모든 뉴스 크롤러의 베이스 클래스"""
@@ -15,9 +19,13 @@ class BaseCrawler(ABC):
     def __init__(self, name: str):
         self.name = name
         self.session = self._create_session()
-        self.crawled_urls = set()
         self.logger = logging.getLogger(f"{__name__}.{name}")
         
+    @property
+    def crawled_urls(self):
+        """수집한 URL 인덱스 (모든 크롤러 공용, 재시작 후에도 유지, 처음 쓸 때 열림)"""
+        return get_url_index()
+    
     def _create_session(self) -> requests.Session:
         """HTTP 세션 생성"""
         session = requests.Session()
@@ -56,6 +64,31 @@ class BaseCrawler(ABC):
                     return None
         return None
     
+    async def _request_with_retry_async(self, client: httpx.AsyncClient, url: str, limiter=None,
+                                        headers: Optional[Dict[str, str]] = None,
+                                        max_retries: int = 3) -> Optional[httpx.Response]:
+        """비동기 HTTP 요청 (재시도 포함, limiter: 호스트별 동시 요청/간격 제한)"""
+        headers = {'User-Agent': self.session.headers['User-Agent'], **(headers or {})}
+        for attempt in range(max_retries):
+            try:
+                if limiter is not None:
+                    async with limiter.slot():
+                        response = await client.get(url, headers=headers)
+                else:
+                    response = await client.get(url, headers=headers)
+                if response.status_code != 304:  # 조건부 요청의 "변경 없음"은 정상 응답
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                wait_time = 2 * (2 ** attempt)
+                self.logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.logger.error(f"Failed to fetch {url}")
+                    return None
+        return None
+    
     @abstractmethod
     def get_news_list_url(self, page: int = 1) -> str:
         """뉴스 리스트 페이지 URL 반환 (반드시 구현해야 함)"""
@@ -77,27 +110,25 @@ class BaseCrawler(ABC):
         
         news_items = self.parse_news_list(response.text)
         
-        # 중복 제거
-        unique_items = []
-        for item in news_items:
-            if item['url'] not in self.crawled_urls:
-                unique_items.append(item)
-                self.crawled_urls.add(item['url'])
-        
+        unique_items = self.deduplicate(news_items)
         self.logger.info(f"Parsed {len(unique_items)} unique news items from {self.name}")
         return unique_items
     
-    def crawl_multiple_pages(self, max_pages: int = 3, delay: tuple = (1, 3)) -> List[Dict]:
-        """여러 페이지 크롤링"""
-        all_news = []
-        
-        for page in range(1, max_pages + 1):
-            news = self.crawl_page(page)
-            all_news.extend(news)
-            
-            if page < max_pages:
-                wait_time = random.uniform(*delay)
-                self.logger.info(f"Waiting {wait_time:.2f} seconds...")
-                time.sleep(wait_time)
-        
-        return all_news
\ No newline at end of file
+    async def fetch_response_async(self, client: httpx.AsyncClient, page: int = 1, limiter=None,
+                                   headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """목록 페이지 응답 (조건부 요청이면 304 일 수 있음)"""
+        url = self.get_news_list_url(page)
+        self.logger.info(f"Crawling {self.name} page {page}: {url}")
+        return await self._request_with_retry_async(client, url, limiter, headers)
+    
+    async def fetch_page_async(self, client: httpx.AsyncClient, page: int = 1, limiter=None) -> List[Dict]:
+        """한 페이지 비동기 크롤링 (중복 제거 전, 여러 페이지를 모은 뒤 deduplicate)"""
+        response = await self.fetch_response_async(client, page, limiter)
+        if response is None:
+            return []
+        return self.parse_news_list(response.text)
+    
+    def deduplicate(self, news_items: List[Dict]) -> List[Dict]:
+        """이미 수집한 URL 제외 (정규화 URL 기준)"""
+        is_new = self.crawled_urls.add_new([item['url'] for item in news_items])
+        return [item for item, new in zip(news_items, is_new) if new]
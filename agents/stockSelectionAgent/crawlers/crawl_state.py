@@ -0,0 +1,75 @@
+import os
+import json
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CRAWL_STATE_FILE = os.getenv("CRAWL_STATE_FILE", "./data/crawl_state.json")
+CRAWL_HIGH_WATER_SIZE = int(os.getenv("CRAWL_HIGH_WATER_SIZE", "50"))
+
+
+@dataclass
+class SourceState:
+    """소스별 high-water mark: 최근에 본 기사 URL (정규화, 최신순) + 목록 1페이지 조건부 요청 헤더"""
+    recent_urls: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CrawlState:
+    """
+    증분 크롤링 상태 (JSON 파일, 스케줄러 재시작 후에도 유지)
+    - 최근 기사 URL 을 소스마다 CRAWL_HIGH_WATER_SIZE 개까지 보관 (최상단 기사가 삭제돼도 다음 기사로 멈춤)
+    """
+
+    def __init__(self, path: Optional[str] = None, high_water_size: int = CRAWL_HIGH_WATER_SIZE):
+        self.path = Path(path or CRAWL_STATE_FILE)
+        self.high_water_size = high_water_size
+        self.logger = logging.getLogger(__name__)
+        self.sources: Dict[str, SourceState] = self._load()
+
+    def _load(self) -> Dict[str, SourceState]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {name: SourceState(**value) for name, value in data.get('sources', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable crawl state {self.path}: {e}")
+            return {}
+
+    def get(self, source: str) -> SourceState:
+        return self.sources.get(source) or SourceState()
+
+    def update(self, source: str, new_urls: List[str], etag: Optional[str] = None,
+               last_modified: Optional[str] = None):
+        """새로 수집한 기사 URL(최신순)을 앞에 추가하고 조건부 요청 헤더 갱신"""
+        previous = self.get(source)
+        recent = list(dict.fromkeys(new_urls + previous.recent_urls))[:self.high_water_size]
+        self.sources[source] = SourceState(
+            recent_urls=recent,
+            etag=etag or previous.etag,
+            last_modified=last_modified or previous.last_modified,
+            updated_at=datetime.now().isoformat(),
+        )
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        data = {'sources': {name: asdict(state) for name, state in self.sources.items()}}
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,7 +1,8 @@
 # crawlers/hankyung_crawler.py
 
+import os
 from .base_crawler import BaseCrawler
-from bs4 import BeautifulSoup
+from .html_parser import parse_html
 from urllib.parse import urljoin
 from datetime import datetime
 from typing import List, Dict
@@ -9,7 +10,7 @@ from typing import List, Dict
 class HankyungCrawler(BaseCrawler):
     """한국경제 뉴스 크롤러"""
     
-    BASE_URL = "https://www.hankyung.com"
+    BASE_URL = os.getenv("HANKYUNG_BASE_URL", "https://www.hankyung.com")
     
     def __init__(self):
         super().__init__("Hankyung")
@@ -20,7 +21,7 @@ class HankyungCrawler(BaseCrawler):
     
     def parse_news_list(self, html: str) -> List[Dict]:
         """한국경제 HTML 파싱"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_html(html)
         news_items = []
         
         # 한국경제 구조에 맞게 조정 (실제 구조 확인 필요)
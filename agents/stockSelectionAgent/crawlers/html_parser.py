@@ -0,0 +1,72 @@
+import os
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+CRAWL_HTML_PARSER = os.getenv("CRAWL_HTML_PARSER", "lxml")  # lxml | soup
+
+_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$")
+_TEXT = etree.XPath(".//text()[not(parent::script or parent::style)]")  # BeautifulSoup get_text 와 같이 스크립트 제외
+
+
+@lru_cache(maxsize=256)
+def _compile(selector: str) -> etree.XPath:
+    """
+    단순 CSS 선택자 → XPath (태그 / .클래스 / 자손 결합자만 지원, 크롤러가 쓰는 범위)
+    예: ".newsList dd" → .//*[contains(concat(' ', normalize-space(@class), ' '), ' newsList ')]//dd
+    """
+    steps = []
+    for compound in selector.split():
+        match = _COMPOUND.match(compound)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        tag, classes = match.group(1) or "*", match.group(2)
+        predicates = "".join(
+            f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+            for cls in classes.split(".") if cls
+        )
+        steps.append(f"{tag}{predicates}")
+    return etree.XPath(".//" + "//".join(steps))
+
+
+class LxmlNode:
+    """lxml 요소를 BeautifulSoup 와 같은 방식(select / select_one / get_text / get)으로 사용"""
+
+    __slots__ = ("_element",)
+
+    def __init__(self, element):
+        self._element = element
+
+    def select(self, selector: str) -> List["LxmlNode"]:
+        return [LxmlNode(e) for e in _compile(selector)(self._element)]
+
+    def select_one(self, selector: str) -> Optional["LxmlNode"]:
+        found = _compile(selector)(self._element)
+        return LxmlNode(found[0]) if found else None
+
+    def get_text(self, strip: bool = False) -> str:
+        texts = _TEXT(self._element)
+        if strip:
+            return "".join(t.strip() for t in texts)
+        return "".join(texts)
+
+    def get(self, attr: str, default=None):
+        return self._element.get(attr, default)
+
+
+def parse_html(html: str, backend: Optional[str] = None):
+    """
+    목록 페이지 HTML 파싱 (backend: lxml 기본, soup = 기존 BeautifulSoup html.parser)
+    두 백엔드 모두 select / select_one / get_text(strip=True) / get(attr) 로 사용
+    """
+    backend = backend or CRAWL_HTML_PARSER
+    if backend == "soup":
+        return BeautifulSoup(html, 'html.parser')
+    if backend != "lxml":
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    if not html or not html.strip():
+        return LxmlNode(lxml_html.fromstring("<html></html>"))
+    return LxmlNode(lxml_html.document_fromstring(html))
@@ -1,7 +1,8 @@
 # crawlers/mk_crawler.py
 
+import os
 from .base_crawler import BaseCrawler
-from bs4 import BeautifulSoup
+from .html_parser import parse_html
 from urllib.parse import urljoin
 from datetime import datetime
 from typing import List, Dict
@@ -9,7 +10,7 @@ from typing import List, Dict
 class MKCrawler(BaseCrawler):
     """매일경제 뉴스 크롤러"""
     
-    BASE_URL = "https://www.mk.co.kr"
+    BASE_URL = os.getenv("MK_BASE_URL", "https://www.mk.co.kr")
     
     def __init__(self):
         super().__init__("MK")
@@ -20,7 +21,7 @@ class MKCrawler(BaseCrawler):
     
     def parse_news_list(self, html: str) -> List[Dict]:
         """매일경제 HTML 파싱"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_html(html)
         news_items = []
         
         # 매일경제 구조 (실제 확인 필요)
@@ -1,5 +1,6 @@
+import os
 from .base_crawler import BaseCrawler
-from bs4 import BeautifulSoup
+from .html_parser import parse_html
 from urllib.parse import urljoin
 from datetime import datetime
 from typing import List, Dict
@@ -7,7 +8,7 @@ from typing import List, Dict
 class NaverFinanceCrawler(BaseCrawler):
     """네이버 금융 뉴스 크롤러"""
     
-    BASE_URL = "https://finance.naver.com"
+    BASE_URL = os.getenv("NAVER_FINANCE_BASE_URL", "https://finance.naver.com")
     NEWS_LIST_URL = f"{BASE_URL}/news/news_list.naver"
     
     def __init__(self):
@@ -19,7 +20,7 @@ class NaverFinanceCrawler(BaseCrawler):
     
     def parse_news_list(self, html: str) -> List[Dict]:
         """네이버 금융 HTML 파싱"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_html(html)
         news_items = []
         
         # dd 또는 li 구조
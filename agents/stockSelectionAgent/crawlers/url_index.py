@@ -0,0 +1,181 @@
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CRAWL_URL_INDEX_FILE = os.getenv("CRAWL_URL_INDEX_FILE", "./data/crawled_urls.db")
+CRAWL_URL_TTL_DAYS = float(os.getenv("CRAWL_URL_TTL_DAYS", "7"))
+CRAWL_URL_INDEX_CAPACITY = int(os.getenv("CRAWL_URL_INDEX_CAPACITY", "200000"))  # 세대별 Bloom filter 용량
+CRAWL_URL_IGNORED_PARAMS = frozenset(
+    p.strip() for p in os.getenv(
+        "CRAWL_URL_IGNORED_PARAMS",
+        "page,utm_source,utm_medium,utm_campaign,utm_term,utm_content,fbclid,gclid"
+    ).split(",") if p.strip()
+)
+
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+logger = logging.getLogger(__name__)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    같은 기사를 가리키는 URL 을 하나로
+    - scheme/host 소문자, 기본 포트·fragment 제거
+    - 목록 페이지 번호·추적용 파라미터 제거, 나머지 쿼리 파라미터는 이름순 정렬
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in CRAWL_URL_IGNORED_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def url_key(url: str) -> int:
+    """정규화 URL → 64비트 키 (SQLite INTEGER PRIMARY KEY 로 저장, URL 문자열은 보관하지 않음)"""
+    digest = hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class BloomFilter:
+    """고정 크기 Bloom filter (64비트 키 기반 double hashing)"""
+
+    def __init__(self, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE):
+        self.capacity = max(1, capacity)
+        self.num_bits = max(8, int(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.created_at = time.time()
+
+    def _positions(self, key: int):
+        key &= 0xFFFFFFFFFFFFFFFF
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: int):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class UrlIndex:
+    """
+    크롤링한 기사 URL 중복 제거 인덱스 (모든 크롤러가 공유, 재시작 후에도 유지)
+    - SQLite: 정규화 URL 의 64비트 키 + 본 시각 (TTL 이 지나면 정리)
+    - 메모리: 회전하는 Bloom filter 세대들 (TTL 의 절반 또는 용량이 차면 새 세대)
+      지난 세대는 마지막 키를 넣은 뒤 TTL 이 지나야 버림 → TTL 안에 본 키는 항상 어느 세대엔가 있음
+      → 처음 보는 URL 은 DB 조회 없이 바로 판정, Bloom 양성일 때만 DB 로 확인 (오탐 제거)
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_days: float = CRAWL_URL_TTL_DAYS,
+                 capacity: int = CRAWL_URL_INDEX_CAPACITY):
+        self.path = Path(path or CRAWL_URL_INDEX_FILE)
+        self.ttl = ttl_days * 86400
+        self.capacity = capacity
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_urls (key INTEGER PRIMARY KEY, seen_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+        self._current = BloomFilter(capacity)
+        self._sealed: Deque[Tuple[float, BloomFilter]] = deque()  # (교체된 시각, 지난 세대), 오래된 순
+        self._load()
+
+    def _load(self):
+        """유효한 키로 Bloom filter 채우고 만료된 행 정리"""
+        cutoff = time.time() - self.ttl
+        self._conn.execute("DELETE FROM seen_urls WHERE seen_at < ?", (cutoff,))
+        self._conn.commit()
+        for (key,) in self._conn.execute("SELECT key FROM seen_urls"):
+            self._current.add(key)
+        logger.info(f"URL index {self.path}: {self._current.count} urls (ttl {self.ttl / 86400:g} days)")
+
+    def _rotate_if_needed(self):
+        now = time.time()
+        # 교체된 뒤 TTL 이 지난 세대의 키는 모두 만료됨
+        while self._sealed and self._sealed[0][0] < now - self.ttl:
+            self._sealed.popleft()
+        if now - self._current.created_at < self.ttl / 2 and self._current.count < self.capacity:
+            return
+        self._sealed.append((now, self._current))
+        self._current = BloomFilter(self.capacity)
+        self._conn.execute("DELETE FROM seen_urls WHERE seen_at < ?", (now - self.ttl,))
+        self._conn.commit()
+
+    def _seen(self, key: int, cutoff: float) -> bool:
+        if key not in self._current and not any(key in bloom for _, bloom in self._sealed):
+            return False
+        row = self._conn.execute("SELECT seen_at FROM seen_urls WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] >= cutoff
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._seen(url_key(url), time.time() - self.ttl)
+
+    def add(self, url: str):
+        self.add_new([url])
+
+    def add_new(self, urls: Iterable[str]) -> List[bool]:
+        """URL 마다 처음 보는지 여부를 반환하고 모두 기록 (한 트랜잭션)"""
+        now = time.time()
+        cutoff = now - self.ttl
+        flags = []
+        with self._lock:
+            self._rotate_if_needed()
+            batch = set()
+            rows = []
+            for url in urls:
+                key = url_key(url)
+                is_new = key not in batch and not self._seen(key, cutoff)
+                flags.append(is_new)
+                if is_new:
+                    batch.add(key)
+                    rows.append((key, now))
+                    self._current.add(key)
+            if rows:
+                self._conn.executemany("INSERT OR REPLACE INTO seen_urls (key, seen_at) VALUES (?, ?)", rows)
+                self._conn.commit()
+        return flags
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[UrlIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_url_index() -> UrlIndex:
+    """프로세스 공용 URL 인덱스 (첫 호출 때 생성)"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = UrlIndex()
+    return _shared
@@ -4,12 +4,15 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
 import time
+import asyncio
 from typing import List, Dict, Optional
 
 # 크롤러 import
 from crawlers.naver_crawler import NaverFinanceCrawler
 from crawlers.hankyung_crawler import HankyungCrawler
 from crawlers.mk_crawler import MKCrawler
+from crawlers.async_engine import AsyncCrawlEngine, CRAWL_MODE
+from crawlers.crawl_state import CrawlState
 
 from stock_matcher import StockMatcher
 
@@ -19,6 +22,8 @@ class MultiNewsCrawler:
     def __init__(self):
         self.setup_logging()
         self.crawlers = self._initialize_crawlers()
+        self.engine = AsyncCrawlEngine()
+        self.state = CrawlState() if CRAWL_MODE == "incremental" else None
         self.stock_matcher = StockMatcher()
         
     def setup_logging(self):
@@ -46,50 +51,36 @@ class MultiNewsCrawler:
     
     def crawl_all_sources(self, pages_per_source: int = 3) -> List[Dict]:
         """모든 소스에서 뉴스 크롤링"""
-        all_news = []
-        
         self.logger.info("=" * 60)
         self.logger.info("Starting multi-source news crawling...")
         self.logger.info("=" * 60)
         
-        for source_name, crawler in self.crawlers.items():
-            self.logger.info(f"\n📰 Crawling from {source_name}...")
-            
-            try:
-                news_items = crawler.crawl_multiple_pages(max_pages=pages_per_source)
-                all_news.extend(news_items)
-                self.logger.info(f"✅ {source_name}: {len(news_items)} news collected")
-                
-                # 소스 간 딜레이
-                time.sleep(2)
-                
-            except Exception as e:
-                self.logger.error(f"❌ Error crawling {source_name}: {e}", exc_info=True)
-                continue
-        
-        return all_news
+        return self._crawl_sources(self.crawlers, pages_per_source)
     
     def crawl_specific_sources(self, sources: List[str], pages: int = 3) -> List[Dict]:
         """특정 소스만 크롤링"""
-        all_news = []
-        
+        crawlers = {}
         for source_name in sources:
             if source_name not in self.crawlers:
                 self.logger.warning(f"Unknown source: {source_name}")
                 continue
-            
-            crawler = self.crawlers[source_name]
-            self.logger.info(f"Crawling from {source_name}...")
-            
-            try:
-                news_items = crawler.crawl_multiple_pages(max_pages=pages)
-                all_news.extend(news_items)
-                self.logger.info(f"✅ {source_name}: {len(news_items)} news")
-                time.sleep(2)
-            except Exception as e:
-                self.logger.error(f"❌ Error: {e}")
-                continue
+            crawlers[source_name] = self.crawlers[source_name]
+        
+        return self._crawl_sources(crawlers, pages)
+    
+    def _crawl_sources(self, crawlers: Dict, pages: int) -> List[Dict]:
+        """소스별 동시 크롤링 (호스트별 간격 유지, 전체 마감 시간 적용, 증분 모드면 새 기사까지만)"""
+        if not crawlers:
+            return []
+        
+        results = asyncio.run(self.engine.crawl(crawlers, pages, self.state))
+        if self.state is not None:
+            self.state.save()
         
+        all_news = []
+        for source_name, news_items in results.items():
+            all_news.extend(news_items)
+            self.logger.info(f"✅ {source_name}: {len(news_items)} news")
         return all_news
     
     def save_to_file(self, news_items: List[Dict], filename: Optional[str] = None) -> str:
@@ -9,6 +9,7 @@ from datetime import datetime
 from stock_matcher import StockMatcher
 from sentiment.sentiment_analyzer import SentimentAnalyzer
 from stock_aggregator import StockAggregator
+from stock_match import registry
 
 class NewsPipeline:
     """뉴스 크롤링 → 종목 매칭 → 감성 분석 → 종목별 집계 통합 파이프라인"""
@@ -125,6 +126,13 @@ class NewsPipeline:
         
         start_time = datetime.now()
         
+        # 실행 도중 종목 사전이 교체돼도 매칭~집계는 같은 버전으로
+        with registry.pinned() as dictionary:
+            self.logger.info(f"📚 Stock dictionary v{registry.version()}: {len(dictionary.ticker_to_name)} stocks")
+            return self._run(input_file, output_file, start_time)
+    
+    def _run(self, input_file: str, output_file: Optional[str], start_time: datetime) -> str:
+        """run() 본문 (종목 사전 버전이 고정된 상태)"""
         try:
             # 1. 뉴스 로드
             news_items = self.load_news_file(input_file)
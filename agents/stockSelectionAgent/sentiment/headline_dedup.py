@@ -0,0 +1,126 @@
+# headline_dedup.py
+
+import os
+import re
+import zlib
+import unicodedata
+from typing import Dict, FrozenSet, List, Set
+
+import numpy as np
+
+SENTIMENT_DEDUP_THRESHOLD = float(os.getenv("SENTIMENT_DEDUP_THRESHOLD", "0.8"))  # 0 이면 정규화 결과가 같은 것만 묶음
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+LSH_BANDS = 16  # 밴드당 4행 → 유사도 약 0.5 이상이면 후보가 될 확률이 높음
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# [속보] (종합) 【단독】 <사진> 같은 말머리/꼬리표
+_BRACKETS = re.compile(r"[\[\(【〈<「『][^\]\)】〉>」』]{0,20}[\]\)】〉>」』]")
+# "... - 연합뉴스", "... | 한국경제" 같은 끝의 언론사 표기
+_PRESS_SUFFIX = re.compile(r"\s*[-|│]\s*[\w가-힣]{2,10}(뉴스|일보|경제|신문|방송|미디어|news)?\s*$", re.I)
+_NON_WORD = re.compile(r"[^\w가-힣]+")
+
+# 방향을 정하는 단어: 글자가 거의 같아도 이 단어들이 다르면 감성이 반대일 수 있어 묶지 않음
+# ("FDA 승인" / "FDA 승인 불발", "기대치 상회" / "기대치 하회")
+POLARITY_TERMS = (
+    "승인", "불발", "무산", "반려", "철회", "연기", "실패", "성공",
+    "상회", "하회", "상향", "하향", "상승", "하락", "급등", "급락", "반등", "강세", "약세",
+    "호조", "부진", "개선", "악화", "흑자", "적자", "증가", "감소", "확대", "축소",
+    "호재", "악재", "매수", "매도", "최고", "최저", "돌파", "붕괴",
+)
+
+_rng = np.random.default_rng(20251202)
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)  # a·x + b 가 uint64 를 넘지 않도록
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def normalize_headline(headline: str) -> str:
+    """말머리·언론사 표기·괄호·문장부호 제거, 공백 정리"""
+    text = unicodedata.normalize("NFKC", headline)
+    text = _BRACKETS.sub(" ", text)
+    text = _PRESS_SUFFIX.sub("", text)
+    text = _NON_WORD.sub(" ", text)
+    return " ".join(text.split()).lower()
+
+
+def polarity_terms(text: str) -> FrozenSet[str]:
+    """정규화된 헤드라인에 들어 있는 방향 단어 집합"""
+    compact = text.replace(" ", "")
+    return frozenset(term for term in POLARITY_TERMS if term in compact)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """공백을 뺀 글자 n-gram 해시 집합 (한글은 띄어쓰기가 달라도 같은 n-gram)"""
+    compact = text.replace(" ", "")
+    if len(compact) <= size:
+        return {zlib.crc32(compact.encode("utf-8"))} if compact else set()
+    return {zlib.crc32(compact[i:i + size].encode("utf-8")) for i in range(len(compact) - size + 1)}
+
+
+def minhash(shingle_set: Set[int]) -> np.ndarray:
+    """MinHash 시그니처 (NUM_PERM 개의 (a*x + b) mod p 최솟값)"""
+    if not shingle_set:
+        return np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    hashed = (np.outer(_PERM_A, values) + _PERM_B[:, None]) % np.uint64(_MERSENNE_PRIME)
+    return hashed.min(axis=1)
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 1.0 if a == b else 0.0
+    return len(a & b) / len(a | b)
+
+
+def cluster_headlines(headlines: List[str], threshold: float = SENTIMENT_DEDUP_THRESHOLD) -> List[int]:
+    """
+    거의 같은 헤드라인 묶기 → 헤드라인마다 대표(클러스터에서 가장 앞선 헤드라인)의 인덱스
+    - 정규화 결과가 같으면 바로 같은 클러스터
+    - 나머지는 MinHash + LSH 로 후보 쌍만 골라 실제 shingle Jaccard ≥ threshold 이고
+      방향 단어(POLARITY_TERMS) 집합이 같을 때만 묶음
+    """
+    parent = list(range(len(headlines)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)  # 대표는 먼저 나온 헤드라인
+
+    normalized = [normalize_headline(h) for h in headlines]
+    first_seen: Dict[str, int] = {}
+    for i, text in enumerate(normalized):
+        if text in first_seen:
+            union(first_seen[text], i)
+        else:
+            first_seen[text] = i
+
+    if threshold > 0 and len(first_seen) > 1:
+        unique = list(first_seen.values())
+        sets = {i: shingles(normalized[i]) for i in unique}
+        polarity = {i: polarity_terms(normalized[i]) for i in unique}
+        rows = NUM_PERM // LSH_BANDS
+        buckets: Dict[tuple, List[int]] = {}
+        for i in unique:
+            signature = minhash(sets[i])
+            for band in range(LSH_BANDS):
+                key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+                buckets.setdefault(key, []).append(i)
+
+        checked = set()
+        for members in buckets.values():
+            for a_idx, a in enumerate(members):
+                for b in members[a_idx + 1:]:
+                    if (a, b) in checked or find(a) == find(b):
+                        continue
+                    checked.add((a, b))
+                    if polarity[a] == polarity[b] and _jaccard(sets[a], sets[b]) >= threshold:
+                        union(a, b)
+
+    return [find(i) for i in range(len(headlines))]
@@ -0,0 +1,94 @@
+# rate_limiter.py
+
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class TokenBucket:
+    """분당 예산 토큰 버킷 (처음엔 가득 찬 상태, 1분에 capacity 만큼 다시 채워짐)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 쓰려면 기다려야 하는 시간 (0 이면 바로 가능)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # 한 번에 버킷보다 큰 요청은 가득 찼을 때 허용
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class ApiRateLimiter:
+    """
+    LLM API 호출 예산 + 적응형 동시 실행 제한
+    - 분당 요청 수(rpm) / 분당 토큰 수(tpm) 토큰 버킷: 부족하면 채워질 때까지 대기
+    - 동시 실행 상한: max_concurrency 와 1분 예산으로 가능한 요청 수 중 작은 값에서 시작
+      429 를 받으면 절반으로 줄이고, 성공할 때마다 1씩 복구 (AIMD)
+    - 429 의 Retry-After 동안은 새 요청을 모두 대기
+    """
+
+    def __init__(self, rpm: float, tpm: float, max_concurrency: int, tokens_per_request: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        budget = min(int(rpm), int(tpm // max(1, tokens_per_request)))  # 1분 예산으로 가능한 요청 수
+        self.max_concurrency = max(1, min(max_concurrency, budget))
+        self.concurrency = self.max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.rate_limited = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int):
+        """동시 실행 자리 + 예산을 확보한 뒤 실행"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+        try:
+            await self._reserve(tokens)
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    async def _reserve(self, tokens: int):
+        while True:
+            async with self._condition:
+                wait = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+            await asyncio.sleep(wait)
+
+    async def on_success(self):
+        async with self._condition:
+            if self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._condition.notify_all()
+
+    async def on_rate_limited(self, retry_after: Optional[float]):
+        """429: 동시 실행 상한 절반, Retry-After(없으면 호출 측 백오프) 동안 전체 대기"""
+        async with self._condition:
+            self.rate_limited += 1
+            self.concurrency = max(1, self.concurrency // 2)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
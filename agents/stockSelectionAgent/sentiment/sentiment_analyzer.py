@@ -2,49 +2,48 @@
 
 import os
 import json
+import random
+import asyncio
 import logging
 import hashlib
 from typing import List, Dict, Optional
-from pathlib import Path
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
-import time
+
+from sentiment.rate_limiter import ApiRateLimiter
+from sentiment.sentiment_cache import SentimentCache
+from sentiment.headline_dedup import cluster_headlines, normalize_headline
 
 # .env 파일 로드
 load_dotenv()
 
+SENTIMENT_MODEL = "gpt-4o-mini"  # 비용 효율적인 모델
+SENTIMENT_MAX_TOKENS = 2000
+SENTIMENT_RPM = float(os.getenv("SENTIMENT_RPM", "500"))  # 분당 요청 수 예산
+SENTIMENT_TPM = float(os.getenv("SENTIMENT_TPM", "200000"))  # 분당 토큰 수 예산
+SENTIMENT_MAX_CONCURRENCY = int(os.getenv("SENTIMENT_MAX_CONCURRENCY", "8"))
+SENTIMENT_MAX_RETRIES = int(os.getenv("SENTIMENT_MAX_RETRIES", "4"))  # 429 재시도 횟수
+SYSTEM_PROMPT = "당신은 금융 뉴스 감성 분석 전문가입니다. JSON 형식으로만 응답하세요."
+
 class SentimentAnalyzer:
     """GPT 기반 뉴스 감성 분석"""
     
     def __init__(self, batch_size: int = 20):
         # GPT_API_KEY 또는 GPT_API_KEY 둘 다 지원
-        api_key = os.getenv('GPT_API_KEY') or os.getenv('GPT_API_KEY')
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = os.getenv('GPT_API_KEY') or os.getenv('GPT_API_KEY')
         self.batch_size = batch_size
-        self.cache_file = Path("data/sentiment_cache.json")
-        self.cache = self._load_cache()
+        self.cache = SentimentCache()
         self.logger = logging.getLogger(__name__)
         
         # 통계
         self.stats = {
             'api_calls': 0,
             'cache_hits': 0,
-            'total_analyzed': 0
+            'total_analyzed': 0,
+            'rate_limited': 0,
+            'deduplicated': 0
         }
     
-    def _load_cache(self) -> Dict:
-        """캐시 로드"""
-        if self.cache_file.exists():
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-    
-    def _save_cache(self):
-        """캐시 저장"""
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
-    
     def _get_cache_key(self, headline: str) -> str:
         """헤드라인의 해시 키 생성"""
         return hashlib.md5(headline.encode()).hexdigest()
@@ -106,92 +105,150 @@ class SentimentAnalyzer:
             self.logger.debug(f"원본 응답: {response_text}")
             return []
     
-    def analyze_batch(self, headlines: List[str]) -> List[Dict]:
-        """헤드라인 배치 분석"""
+    def _request_params(self, prompt: str) -> Dict:
+        return {
+            'model': SENTIMENT_MODEL,
+            'messages': [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.3,  # 일관성을 위해 낮은 온도
+            'max_tokens': SENTIMENT_MAX_TOKENS
+        }
+    
+    @staticmethod
+    def _estimate_tokens(prompt: str) -> int:
+        """요청 토큰 추정 (한글 약 2자당 1토큰 + 최대 출력 토큰, API 의 TPM 계산 방식과 같이 max_tokens 포함)"""
+        return (len(SYSTEM_PROMPT) + len(prompt)) // 2 + SENTIMENT_MAX_TOKENS
+    
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> Optional[float]:
+        """429 응답의 Retry-After (초)"""
+        headers = error.response.headers if error.response is not None else {}
+        for name, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+            try:
+                return float(headers[name]) * scale
+            except (KeyError, TypeError, ValueError):
+                continue
+        return None
+    
+    async def analyze_batch_async(self, client: AsyncOpenAI, limiter: ApiRateLimiter,
+                                  headlines: List[str]) -> List[Dict]:
+        """헤드라인 배치 비동기 분석 (예산 안에서 실행, 429 면 백오프 후 재시도)"""
         if not headlines:
             return []
         
-        self.logger.info(f"📊 Analyzing batch of {len(headlines)} headlines...")
-        
-        # 프롬프트 생성
         prompt = self._create_prompt(headlines)
+        tokens = self._estimate_tokens(prompt)
         
-        # API 호출
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # 비용 효율적인 모델
-                messages=[
-                    {"role": "system", "content": "당신은 금융 뉴스 감성 분석 전문가입니다. JSON 형식으로만 응답하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # 일관성을 위해 낮은 온도
-                max_tokens=2000
-            )
-            
-            self.stats['api_calls'] += 1
-            
-            # 응답 파싱
-            response_text = response.choices[0].message.content or ""
-            
-            if not response_text:
-                self.logger.error("API 응답이 비어있습니다.")
-                return []
-            
-            results = self._parse_response(response_text)
+        for attempt in range(SENTIMENT_MAX_RETRIES + 1):
+            retry_after = None
+            async with limiter.slot(tokens):
+                try:
+                    response = await client.chat.completions.create(**self._request_params(prompt))
+                except RateLimitError as e:
+                    retry_after = self._retry_after(e)
+                    self.stats['rate_limited'] += 1
+                    await limiter.on_rate_limited(retry_after)
+                    self.logger.warning(f"⏳ Rate limited (attempt {attempt + 1}), retry after {retry_after or 'backoff'}")
+                except Exception as e:
+                    self.logger.error(f"API 호출 실패: {e}")
+                    return []
+                else:
+                    await limiter.on_success()
+                    self.stats['api_calls'] += 1
+                    response_text = response.choices[0].message.content or ""
+                    if not response_text:
+                        self.logger.error("API 응답이 비어있습니다.")
+                        return []
+                    results = self._parse_response(response_text)
+                    self.logger.info(f"✅ Analyzed {len(results)} headlines")
+                    return results
             
-            self.logger.info(f"✅ Analyzed {len(results)} headlines")
-            return results
-            
-        except Exception as e:
-            self.logger.error(f"API 호출 실패: {e}")
-            return []
+            # Retry-After 가 있으면 limiter 가 전체를 대기시키므로 별도 백오프 없음
+            if retry_after is None:
+                await asyncio.sleep(min(30, 2 ** attempt) * random.uniform(1.0, 1.5))
+        
+        self.logger.error(f"API 호출 실패: rate limited {SENTIMENT_MAX_RETRIES + 1} times")
+        return []
     
     def analyze_headlines(self, headlines: List[str]) -> List[Dict]:
-        """헤드라인 리스트 전체 분석 (캐싱 + 배치)"""
-        results = []
-        to_analyze = []
-        cached_results = {}
+        """헤드라인 리스트 전체 분석 (캐싱 + 배치 동시 실행), 결과는 입력 순서"""
+        return asyncio.run(self.analyze_headlines_async(headlines))
+    
+    async def analyze_headlines_async(self, headlines: List[str]) -> List[Dict]:
+        """analyze_headlines 의 비동기 버전 (이미 이벤트 루프 안에서 호출할 때)"""
+        # 1. 헤드라인 묶기
+        # - 정규화 결과가 같은 그룹: 캐시를 함께 씀 (구성원 하나가 캐시에 있으면 그룹 전체에 사용, 결과도 구성원마다 저장)
+        # - 거의 같은 클러스터(방향 단어가 같고 글자 유사도 ≥ 기준): 이번 실행에서 분석만 한 번으로 (캐시는 나누지 않음)
+        representatives = cluster_headlines(headlines)
+        normalized = [normalize_headline(headline) for headline in headlines]
+        groups: Dict[str, List[str]] = {}
+        group_cluster: Dict[str, int] = {}
+        for headline, norm, rep in zip(headlines, normalized, representatives):
+            members = groups.setdefault(norm, [])
+            if headline not in members:
+                members.append(headline)
+            group_cluster.setdefault(norm, rep)
         
-        # 1. 캐시 확인
-        for headline in headlines:
-            cache_key = self._get_cache_key(headline)
-            if cache_key in self.cache:
-                cached_results[headline] = self.cache[cache_key]
-                self.stats['cache_hits'] += 1
-            else:
-                to_analyze.append(headline)
+        # 2. 캐시 확인 (한 번에 조회)
+        cached = self.cache.get_many(self._get_cache_key(headline) for headline in headlines)
+        group_results: Dict[str, Dict] = {}
+        for norm, members in groups.items():
+            hit = next((cached[key] for key in map(self._get_cache_key, members) if key in cached), None)
+            if hit is not None:
+                group_results[norm] = hit
+        cache_groups = set(group_results)
         
-        self.logger.info(f"💾 Cache: {len(cached_results)} hits, {len(to_analyze)} to analyze")
+        # 캐시에 없는 그룹 → 클러스터마다 가장 앞선 그룹의 헤드라인 하나만 분석
+        pending: Dict[int, List[str]] = {}  # 클러스터 대표 → 캐시에 없는 그룹들
+        for norm, rep in group_cluster.items():
+            if norm not in cache_groups:
+                pending.setdefault(rep, []).append(norm)
+        to_analyze = [groups[norms[0]][0] for norms in pending.values()]
         
-        # 2. 배치 분석
-        batch_results = {}
-        for i in range(0, len(to_analyze), self.batch_size):
-            batch = to_analyze[i:i + self.batch_size]
-            
-            self.logger.info(f"🔄 Processing batch {i//self.batch_size + 1}/{(len(to_analyze)-1)//self.batch_size + 1}")
-            
-            batch_analysis = self.analyze_batch(batch)
-            
-            # 결과 매핑
-            for item in batch_analysis:
-                headline = item.get('headline', '')
-                if headline in batch:
-                    batch_results[headline] = item
-                    
-                    # 캐시에 저장
-                    cache_key = self._get_cache_key(headline)
-                    self.cache[cache_key] = item
+        self.logger.info(
+            f"💾 Cache: {len(cache_groups)} hits, {len(to_analyze)} to analyze "
+            f"({len(headlines)} headlines → {len(groups)} groups → {len(pending)} uncached clusters)"
+        )
+        
+        # 3. 배치 분석 (요청/토큰 예산 안에서 동시 실행)
+        batches = [to_analyze[i:i + self.batch_size] for i in range(0, len(to_analyze), self.batch_size)]
+        analyzed_groups = set()  # 직접 분석한 헤드라인의 그룹 (캐시에 저장)
+        if batches:
+            limiter = ApiRateLimiter(
+                SENTIMENT_RPM, SENTIMENT_TPM, SENTIMENT_MAX_CONCURRENCY,
+                self._estimate_tokens(self._create_prompt(batches[0]))
+            )
+            self.logger.info(f"🔄 Processing {len(batches)} batches (concurrency {limiter.max_concurrency})")
+            async with AsyncOpenAI(api_key=self.api_key, max_retries=0) as client:
+                analyses = await asyncio.gather(
+                    *(self.analyze_batch_async(client, limiter, batch) for batch in batches)
+                )
             
-            # API 호출 간 딜레이 (Rate limit 방지)
-            if i + self.batch_size < len(to_analyze):
-                time.sleep(1)
+            # 결과 매핑 (분석한 헤드라인 → 같은 클러스터의 캐시 없는 그룹들)
+            norms_by_headline = {groups[norms[0]][0]: norms for norms in pending.values()}
+            for batch, batch_analysis in zip(batches, analyses):
+                for item in batch_analysis:
+                    headline = item.get('headline', '')
+                    if headline in batch:
+                        norms = norms_by_headline[headline]
+                        analyzed_groups.add(norms[0])
+                        for norm in norms:
+                            group_results[norm] = item
         
-        # 3. 결과 병합 (원본 순서 유지)
-        for headline in headlines:
-            if headline in cached_results:
-                results.append(cached_results[headline])
-            elif headline in batch_results:
-                results.append(batch_results[headline])
+        # 4. 결과 병합 (원본 순서 유지)
+        results = []
+        analyzed_headlines = set(to_analyze)
+        for headline, norm in zip(headlines, normalized):
+            if norm in group_results:
+                results.append({**group_results[norm], 'headline': headline})
+                if norm in cache_groups:
+                    self.stats['cache_hits'] += 1
+                elif headline in analyzed_headlines:
+                    analyzed_headlines.discard(headline)  # 같은 헤드라인이 또 나오면 그때부터 중복
+                else:
+                    self.stats['deduplicated'] += 1
             else:
                 # 분석 실패한 경우 기본값
                 results.append({
@@ -202,10 +259,18 @@ class SentimentAnalyzer:
                     'reasoning': '분석 실패'
                 })
         
-        # 4. 캐시 저장
-        self._save_cache()
+        # 정규화 결과가 같은 헤드라인만 캐시 (거의 같은 헤드라인에 나눠 준 결과는 저장하지 않음)
+        new_entries = {
+            self._get_cache_key(member): {**group_results[norm], 'headline': member}
+            for norm in cache_groups | analyzed_groups
+            for member in groups[norm]
+            if self._get_cache_key(member) not in cached
+        }
+        
+        # 5. 캐시 저장 (새 결과만 추가)
+        self.cache.put_many(new_entries)
         
-        # 5. 통계 업데이트
+        # 6. 통계 업데이트
         self.stats['total_analyzed'] = len(results)
         
         return results
@@ -220,6 +285,7 @@ class SentimentAnalyzer:
             'api_calls': self.stats['api_calls'],
             'cache_hits': self.stats['cache_hits'],
             'cache_rate': f"{cache_rate:.1f}%",
+            'deduplicated': self.stats['deduplicated'],
             'estimated_cost': f"${self.stats['api_calls'] * 0.01:.2f}"  # 대략적 추정
         }
 
@@ -0,0 +1,121 @@
+# sentiment_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+SENTIMENT_CACHE_DB = os.getenv("SENTIMENT_CACHE_DB", "data/sentiment_cache.db")
+SENTIMENT_CACHE_TTL_DAYS = float(os.getenv("SENTIMENT_CACHE_TTL_DAYS", "30"))
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "200000"))
+LEGACY_CACHE_FILE = "data/sentiment_cache.json"
+
+SQL_CHUNK = 500  # IN (...) 한 번에 넣는 키 수 (SQLite 변수 개수 제한)
+
+
+class SentimentCache:
+    """
+    감성 분석 결과 캐시 (SQLite WAL, 헤드라인 해시 → 결과 JSON)
+    - 조회/저장은 배치 단위 (키 목록 한 번에)
+    - 항목은 추가만 하고 수정하지 않음, 조회되면 accessed_at 갱신
+    - 정리: 저장할 때 TTL 지난 항목 삭제 + 최대 개수 초과분은 오래 안 쓴 순(LRU)으로 삭제
+    - 스레드 간에는 락으로 연결 하나를 공유, 프로세스 간(API 서버 / 스케줄러)은 WAL + busy_timeout
+    - 처음 만들 때 기존 JSON 캐시(data/sentiment_cache.json)가 있으면 가져옴
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_days: float = SENTIMENT_CACHE_TTL_DAYS,
+                 max_entries: int = SENTIMENT_CACHE_MAX_ENTRIES, legacy_file: Optional[str] = LEGACY_CACHE_FILE):
+        self.path = Path(path or SENTIMENT_CACHE_DB)
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_accessed ON sentiment_cache (accessed_at)")
+        self._conn.commit()
+
+        if is_new and legacy_file and Path(legacy_file).exists():
+            self._import_legacy(Path(legacy_file))
+
+    def _import_legacy(self, legacy_path: Path):
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Skipping legacy sentiment cache {legacy_path}: {e}")
+            return
+        self.put_many(entries)
+        self.logger.info(f"Imported {len(entries)} entries from {legacy_path}")
+
+    @staticmethod
+    def _chunks(keys: list) -> Iterable[list]:
+        for i in range(0, len(keys), SQL_CHUNK):
+            yield keys[i:i + SQL_CHUNK]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """키 목록 → {키: 결과} (없거나 만료된 키는 제외)"""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            for chunk in self._chunks(keys):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM sentiment_cache WHERE key IN ({placeholders}) AND created_at >= ?",
+                    (*chunk, now - self.ttl)
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE sentiment_cache SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, entries: Dict[str, Dict]):
+        """결과 추가 (이미 있는 키는 그대로 둠) 후 정리"""
+        if not entries:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value, ensure_ascii=False), now, now) for key, value in entries.items()]
+        with self._lock:
+            # 만료된 행이 남아 있으면 새 결과가 무시되므로 먼저 정리
+            self._conn.execute("DELETE FROM sentiment_cache WHERE created_at < ?", (now - self.ttl,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO sentiment_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict_lru()
+            self._conn.commit()
+
+    def _evict_lru(self):
+        overflow = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM sentiment_cache WHERE key IN "
+                "(SELECT key FROM sentiment_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -10,6 +10,7 @@ import boto3
 from botocore.exceptions import ClientError
 
 from stock_match.stock_dictionary import StockDictionary
+from stock_match import registry
 
 # AWS S3 설정
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
@@ -21,9 +22,13 @@ class StockAggregator:
     """종목별 뉴스 집계 및 분석"""
     
     def __init__(self):
-        self.dictionary = StockDictionary()
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def dictionary(self) -> StockDictionary:
+        """프로세스 공용 종목 사전"""
+        return registry.get_dictionary()
+    
     def aggregate_by_stock(self, news_items: List[Dict]) -> Dict[str, Dict]:
         """종목별로 뉴스 집계"""
         self.logger.info("📊 Aggregating news by stock...")
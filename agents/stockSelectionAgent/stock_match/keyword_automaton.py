@@ -0,0 +1,88 @@
+# keyword_automaton.py
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick 다중 패턴 매처 (키워드 → 값)
+
+    - 생성 시 한 번 트라이 + 실패 링크를 만들고, 이후 텍스트를 한 번만 훑어서 모든 키워드를 찾음
+      (키워드 수와 무관하게 텍스트 길이에 비례)
+    - 겹치는 매칭은 가장 왼쪽에서 시작하는 가장 긴 키워드만 채택 (leftmost-longest)
+      → "삼성SDI" 안의 "삼성" 은 따로 매칭되지 않음
+    - 대소문자 구분 (기존 `keyword in text` 와 동일)
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        # 노드별 전이 / 실패 링크 / (키워드 길이, 값) / 출력 링크(실패 링크를 따라 만나는 첫 출력 노드)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Optional[Tuple[int, str]]] = [None]
+        self._dict_link: List[int] = [0]
+        self.size = 0
+
+        for keyword, value in patterns:
+            if keyword:
+                self._add(keyword, value)
+        self._build()
+
+    def _add(self, keyword: str, value: str):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+                self._dict_link.append(0)
+            node = nxt
+        if self._out[node] is None:  # 같은 키워드가 여러 종목에 있으면 먼저 등록된 종목
+            self._out[node] = (len(keyword), value)
+            self.size += 1
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                link = self._goto[fail].get(ch, 0)
+                self._fail[child] = link
+                self._dict_link[child] = link if self._out[link] is not None else self._dict_link[link]
+                queue.append(child)
+
+    def iter_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """겹침을 허용한 모든 매칭 (start, end, value)"""
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] is not None else dict_link[node]
+            while hit:
+                length, value = out[hit]
+                matches.append((i + 1 - length, i + 1, value))
+                hit = dict_link[hit]
+        return matches
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """겹치지 않는 leftmost-longest 매칭 (start, end, value), 등장 순서"""
+        selected = []
+        cursor = 0
+        for start, end, value in sorted(self.iter_matches(text), key=lambda m: (m[0], -m[1])):
+            if start >= cursor:
+                selected.append((start, end, value))
+                cursor = end
+        return selected
+
+    def find_values(self, text: str) -> List[str]:
+        """매칭된 값 (중복 제거, 등장 순서)"""
+        return list(dict.fromkeys(value for _, _, value in self.find(text)))
@@ -0,0 +1,229 @@
+# listing_index.py
+
+"""
+전체 상장 종목 목록 → 미리 만든 사전 인덱스 (pickle)
+
+- 목록 파일: CSV (UTF-8 또는 KRX 다운로드의 CP949)
+  영문 헤더 ticker,name,aliases,sector,market_cap 또는 KRX 헤더 종목코드,회사명(종목명),업종,시가총액
+  aliases 는 '|' 로 구분, market_cap 은 원 단위 (10조 이상 LARGE, 1조 이상 MID, 그 외 SMALL)
+- 인덱스: 종목 사전 + 키워드 매처(KeywordAutomaton)를 통째로 pickle (로드 몇 ms)
+- 인덱스 헤더의 버전 / 목록 파일 크기·수정 시각 / 기본 사전 해시가 다르면 다시 빌드
+- 기본 사전(StockDictionary 내장 종목)의 이름/키워드/섹터가 목록보다 우선
+"""
+import os
+import csv
+import time
+import pickle
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from stock_match.keyword_automaton import KeywordAutomaton
+
+INDEX_VERSION = 1
+MIN_KEYWORD_LENGTH = 2  # 한 글자 키워드는 오탐이 많아 제외
+
+LARGE_CAP_KRW = 10_000_000_000_000  # 10조
+MID_CAP_KRW = 1_000_000_000_000  # 1조
+
+COLUMN_ALIASES = {
+    "ticker": ("ticker", "종목코드", "단축코드"),
+    "name": ("name", "회사명", "종목명", "한글 종목약명"),
+    "aliases": ("aliases", "별칭"),
+    "sector": ("sector", "업종", "업종명"),
+    "market_cap": ("market_cap", "시가총액"),
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ListingIndex:
+    """미리 만든 종목 사전 (StockDictionary 가 그대로 사용)"""
+    version: int
+    source: str
+    source_stamp: Tuple[int, int]  # (크기, 수정 시각 ns)
+    base_digest: str
+    built_at: float
+    ticker_to_name: Dict[str, str] = field(default_factory=dict)
+    keywords: Dict[str, List[str]] = field(default_factory=dict)
+    sectors: Dict[str, str] = field(default_factory=dict)
+    market_cap_tiers: Dict[str, str] = field(default_factory=dict)
+    automaton: Optional[KeywordAutomaton] = None
+
+
+def file_stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def base_digest(base: Dict[str, Dict]) -> str:
+    """기본 사전 해시 (내장 종목이 바뀌면 인덱스 재빌드)"""
+    payload = repr(sorted((t, sorted(v.items())) for t, v in base.items()))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _market_cap_tier(value: str) -> str:
+    try:
+        cap = float(str(value).replace(",", "").strip() or 0)
+    except ValueError:
+        return "SMALL"
+    if cap >= LARGE_CAP_KRW:
+        return "LARGE"
+    if cap >= MID_CAP_KRW:
+        return "MID"
+    return "SMALL"
+
+
+def _read_rows(path: Path) -> List[Dict[str, str]]:
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            with open(path, "r", encoding=encoding, newline="") as f:
+                return list(csv.DictReader(f))
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Unsupported encoding: {path}")
+
+
+def read_listing(path: Path) -> Dict[str, Dict]:
+    """목록 CSV → {ticker: {name, keywords, sector, market_cap_tier}}"""
+    rows = _read_rows(path)
+    if not rows:
+        return {}
+
+    headers = {h.strip(): h for h in rows[0].keys() if h}
+    columns = {
+        key: next((headers[name] for name in names if name in headers), None)
+        for key, names in COLUMN_ALIASES.items()
+    }
+    if not columns["ticker"] or not columns["name"]:
+        raise ValueError(f"Listing needs ticker and name columns: {path}")
+
+    stocks = {}
+    for row in rows:
+        ticker = (row.get(columns["ticker"]) or "").strip().strip("'")
+        name = (row.get(columns["name"]) or "").strip()
+        if not ticker or not name:
+            continue
+        if ticker.isdigit():
+            ticker = ticker.zfill(6)
+
+        aliases = (row.get(columns["aliases"]) or "") if columns["aliases"] else ""
+        candidates = [name, name.replace(" ", "")] + [a.strip() for a in aliases.split("|")]
+        keywords = [k for k in dict.fromkeys(candidates) if len(k) >= MIN_KEYWORD_LENGTH]
+        if not keywords:
+            continue
+
+        sector = (row.get(columns["sector"]) or "").strip() if columns["sector"] else ""
+        market_cap = row.get(columns["market_cap"]) if columns["market_cap"] else None
+        stocks[ticker] = {
+            "name": name,
+            "keywords": keywords,
+            "sector": sector or "Unknown",
+            "market_cap_tier": _market_cap_tier(market_cap) if market_cap else "SMALL",
+        }
+    return stocks
+
+
+def build_index(listing_path: Path, base: Dict[str, Dict]) -> ListingIndex:
+    """목록 + 기본 사전 병합 후 매처까지 빌드"""
+    merged = read_listing(listing_path)
+    merged.update(base)  # 기본 사전 우선 (직접 다듬은 키워드/섹터)
+
+    index = ListingIndex(
+        version=INDEX_VERSION,
+        source=str(listing_path),
+        source_stamp=file_stamp(listing_path),
+        base_digest=base_digest(base),
+        built_at=time.time(),
+    )
+    for ticker, info in merged.items():
+        index.ticker_to_name[ticker] = info["name"]
+        index.keywords[ticker] = list(info["keywords"])
+        index.sectors[ticker] = info.get("sector", "Unknown")
+        index.market_cap_tiers[ticker] = info.get("market_cap_tier", "SMALL")
+    # 기본 사전 종목의 키워드를 먼저 등록 (같은 키워드가 겹치면 기본 사전 종목으로 매칭)
+    order = list(base) + [t for t in index.keywords if t not in base]
+    index.automaton = KeywordAutomaton(
+        (keyword, ticker) for ticker in order for keyword in index.keywords[ticker]
+    )
+    return index
+
+
+def _index_path_for(listing_path: Path) -> Path:
+    return listing_path.with_suffix(".index.pkl")
+
+
+def load_index(index_path: Path) -> Optional[ListingIndex]:
+    try:
+        with open(index_path, "rb") as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Failed to load stock index {index_path}: {e}")
+        return None
+    return index if isinstance(index, ListingIndex) else None
+
+
+def save_index(index: ListingIndex, index_path: Path):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+
+
+def is_current(index: Optional[ListingIndex], listing_path: Path, base: Dict[str, Dict]) -> bool:
+    return (
+        index is not None
+        and index.version == INDEX_VERSION
+        and tuple(index.source_stamp) == file_stamp(listing_path)
+        and index.base_digest == base_digest(base)
+    )
+
+
+def load_or_build(listing_path: Path, base: Dict[str, Dict], index_path: Optional[Path] = None) -> ListingIndex:
+    """최신 인덱스가 있으면 로드, 없거나 오래됐으면 빌드 후 저장"""
+    index_path = index_path or _index_path_for(listing_path)
+    index = load_index(index_path)
+    if is_current(index, listing_path, base):
+        return index
+
+    started = time.perf_counter()
+    index = build_index(listing_path, base)
+    try:
+        save_index(index, index_path)
+    except OSError as e:
+        logger.warning(f"Failed to save stock index {index_path}: {e}")
+    logger.info(
+        f"Built stock index from {listing_path}: {len(index.ticker_to_name)} stocks, "
+        f"{index.automaton.size} keywords in {time.perf_counter() - started:.2f}s"
+    )
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("usage: python -m stock_match.listing_index <listing.csv> [index.pkl]")
+        sys.exit(1)
+
+    # pickle 에 __main__.ListingIndex 가 기록되지 않도록 패키지 모듈로 빌드
+    from stock_match import listing_index as module
+    from stock_match.stock_dictionary import StockDictionary
+
+    listing = Path(sys.argv[1])
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else module._index_path_for(listing)
+    built = module.build_index(listing, StockDictionary(listing_path="").base_entries())
+    module.save_index(built, target)
+
+    started = time.perf_counter()
+    module.load_index(target)
+    print(
+        f"✅ {target}: {len(built.ticker_to_name)} stocks, {built.automaton.size} keywords, "
+        f"load {(time.perf_counter() - started) * 1000:.1f} ms"
+    )
@@ -0,0 +1,86 @@
+# registry.py
+
+"""
+프로세스 공용 종목 사전
+
+- 첫 요청 때 한 번만 StockDictionary 를 만들고 (스레드 안전) 모든 구성요소가 같은 인스턴스를 사용
+- 공유 인스턴스는 읽기 전용으로 취급 (변경하려면 따로 StockDictionary() 생성)
+- STOCK_DICTIONARY_RELOAD_SECONDS 마다 목록 파일 변경을 확인하고, 바뀌었으면 새 인스턴스를 만들어
+  참조만 교체 (기존 인스턴스는 수정하지 않으므로 이미 쓰고 있는 쪽은 그대로)
+- pinned(): 파이프라인 한 번 실행 동안 현재 스레드가 같은 버전을 계속 쓰도록 고정
+"""
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from stock_match.stock_dictionary import StockDictionary
+
+STOCK_DICTIONARY_RELOAD_SECONDS = float(os.getenv("STOCK_DICTIONARY_RELOAD_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_local = threading.local()
+_current: Optional[StockDictionary] = None
+_version = 0
+_checked_at = 0.0
+
+
+def _build() -> StockDictionary:
+    dictionary = StockDictionary()
+    dictionary.automaton  # 공유 전에 매처까지 만들어 둠 (스레드마다 따로 만들지 않도록)
+    return dictionary
+
+
+def get_dictionary() -> StockDictionary:
+    """현재 공용 사전 (pinned() 블록 안이면 고정된 버전)"""
+    global _current, _version, _checked_at
+    pinned_dictionary = getattr(_local, "dictionary", None)
+    if pinned_dictionary is not None:
+        return pinned_dictionary
+
+    current = _current
+    if current is not None and time.monotonic() - _checked_at < STOCK_DICTIONARY_RELOAD_SECONDS:
+        return current
+
+    with _lock:
+        if _current is None:
+            _current = _build()
+            _version += 1
+        elif time.monotonic() - _checked_at >= STOCK_DICTIONARY_RELOAD_SECONDS and _current.listing_changed():
+            _current = _build()
+            _version += 1
+            logger.info(f"Stock dictionary v{_version} loaded: {len(_current.ticker_to_name)} stocks")
+        _checked_at = time.monotonic()
+        return _current
+
+
+def reload() -> StockDictionary:
+    """목록 변경 여부와 관계없이 새로 만들어 교체"""
+    global _current, _version, _checked_at
+    dictionary = _build()
+    with _lock:
+        _current = dictionary
+        _version += 1
+        _checked_at = time.monotonic()
+    logger.info(f"Stock dictionary v{_version} loaded: {len(dictionary.ticker_to_name)} stocks")
+    return dictionary
+
+
+def version() -> int:
+    """교체될 때마다 1씩 증가 (아직 만들지 않았으면 0)"""
+    return _version
+
+
+@contextmanager
+def pinned() -> Iterator[StockDictionary]:
+    """블록 안에서 현재 스레드는 같은 버전의 사전을 사용 (도중에 교체돼도 영향 없음)"""
+    previous = getattr(_local, "dictionary", None)
+    _local.dictionary = previous or get_dictionary()
+    try:
+        yield _local.dictionary
+    finally:
+        _local.dictionary = previous
@@ -1,19 +1,41 @@
 # stock_dictionary.py
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+import os
 import json
 from pathlib import Path
 
+from stock_match.keyword_automaton import KeywordAutomaton
+from stock_match import listing_index
+
+# 전체 상장 종목 목록 (없으면 내장 종목만 사용, 형식은 listing_index.py 참고)
+STOCK_LISTING_FILE = os.getenv("STOCK_LISTING_FILE", "data/krx_listing.csv")
+# 미리 만든 인덱스 경로 (비우면 목록 파일 옆 <이름>.index.pkl)
+STOCK_INDEX_FILE = os.getenv("STOCK_INDEX_FILE", "")
+
 class StockDictionary:
     """한국 주식 종목 사전 (확장 버전)"""
     
-    def __init__(self):
+    def __init__(self, listing_path: Optional[str] = None, index_path: Optional[str] = None):
+        """
+        listing_path: 전체 상장 종목 목록 (None: STOCK_LISTING_FILE, "": 내장 종목만)
+        index_path: 미리 만든 인덱스 경로 (None: STOCK_INDEX_FILE)
+        """
         self.ticker_to_name: Dict[str, str] = {}
         self.name_to_ticker: Dict[str, str] = {}
         self.keywords: Dict[str, List[str]] = {}
         self.sectors: Dict[str, str] = {}  # 종목별 섹터
         self.market_cap_tiers: Dict[str, str] = {}  # 시총 등급 (LARGE/MID/SMALL)
+        self._automaton: Optional[KeywordAutomaton] = None  # keywords 로 만든 매처 (첫 검색 시 생성)
+        self._base: Dict[str, Dict] = {}  # 내장 종목 (목록보다 우선)
+        self._index: Optional[listing_index.ListingIndex] = None
+        listing_path = STOCK_LISTING_FILE if listing_path is None else listing_path
+        index_path = STOCK_INDEX_FILE if index_path is None else index_path
+        self._listing_path = Path(listing_path) if listing_path else None
+        self._index_path = Path(index_path) if index_path else None
         self._load_stock_data()
+        if self._listing_path and self._listing_path.exists():
+            self._apply_index(listing_index.load_or_build(self._listing_path, self._base, self._index_path))
     
     def _load_stock_data(self):
         """종목 데이터 로드 (100개 이상)"""
@@ -563,6 +585,7 @@ class StockDictionary:
         }
         
         # 데이터 로드
+        self._base = stocks
         for ticker, info in stocks.items():
             self.ticker_to_name[ticker] = info['name']
             self.name_to_ticker[info['name']] = ticker
@@ -570,18 +593,57 @@ class StockDictionary:
             self.sectors[ticker] = info.get('sector', 'Unknown')
             self.market_cap_tiers[ticker] = info.get('market_cap_tier', 'SMALL')
     
+    def _apply_index(self, index: listing_index.ListingIndex):
+        """인덱스의 사전/매처 사용 (생성 시에만 호출, 목록이 바뀌면 registry 가 새 인스턴스를 만듦)"""
+        self.ticker_to_name = index.ticker_to_name
+        self.name_to_ticker = {name: ticker for ticker, name in index.ticker_to_name.items()}
+        self.keywords = index.keywords
+        self.sectors = index.sectors
+        self.market_cap_tiers = index.market_cap_tiers
+        self._automaton = index.automaton
+        self._index = index
+    
+    def base_entries(self) -> Dict[str, Dict]:
+        """내장 종목 데이터 {ticker: {name, keywords, sector, market_cap_tier}}"""
+        return self._base
+    
+    @property
+    def index_info(self) -> Dict:
+        """사용 중인 목록 인덱스 정보 (내장 종목만 쓰면 빈 dict)"""
+        if self._index is None:
+            return {}
+        return {
+            "version": self._index.version,
+            "source": self._index.source,
+            "built_at": self._index.built_at,
+            "stocks": len(self._index.ticker_to_name),
+        }
+    
+    def listing_changed(self) -> bool:
+        """목록 파일이 새로 생겼거나 바뀌었는지"""
+        if not self._listing_path or not self._listing_path.exists():
+            return False
+        if self._index is None:
+            return True
+        return tuple(self._index.source_stamp) != listing_index.file_stamp(self._listing_path)
+    
+    @property
+    def automaton(self) -> KeywordAutomaton:
+        """키워드 매처 (keywords 가 바뀌면 다시 생성)"""
+        if self._automaton is None:
+            self._automaton = KeywordAutomaton(
+                (keyword, ticker)
+                for ticker, keywords in self.keywords.items()
+                for keyword in keywords
+            )
+        return self._automaton
+    
     def find_tickers(self, text: str) -> List[str]:
-        """텍스트에서 종목 티커 찾기"""
-        found_tickers = set()
-        
-        # 키워드 매칭
-        for ticker, keywords in self.keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    found_tickers.add(ticker)
-                    break
-        
-        return list(found_tickers)
+        """
+        텍스트에서 종목 티커 찾기 (등장 순서, 중복 제거)
+        겹치는 키워드는 가장 긴 것만 인정 ("삼성SDI" 는 삼성SDI 만, 삼성전자로 잡히지 않음)
+        """
+        return self.automaton.find_values(text)
     
     def get_name(self, ticker: str) -> str:
         """티커로 종목명 조회"""
@@ -655,6 +717,7 @@ class StockDictionary:
         
         self.ticker_to_name = data['ticker_to_name']
         self.keywords = data['keywords']
+        self._automaton = None
         self.sectors = data.get('sectors', {})
         self.market_cap_tiers = data.get('market_cap_tiers', {})
         
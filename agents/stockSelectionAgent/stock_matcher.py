@@ -1,19 +1,24 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from stock_match.stock_dictionary import StockDictionary
+from stock_match import registry
 import logging
 
 class StockMatcher:
     """뉴스 헤드라인에서 관련 종목 추출"""
     
     def __init__(self):
-        self.dictionary = StockDictionary()
         self.logger = logging.getLogger(__name__)
     
-    def match_stocks(self, headline: str) -> List[str]:
+    @property
+    def dictionary(self) -> StockDictionary:
+        """프로세스 공용 종목 사전"""
+        return registry.get_dictionary()
+    
+    def match_stocks(self, headline: str, dictionary: Optional[StockDictionary] = None) -> List[str]:
         """헤드라인에서 종목 티커 추출"""
         # 기본 매칭
-        tickers = self.dictionary.find_tickers(headline)
+        tickers = (dictionary or self.dictionary).find_tickers(headline)
         
         # 추가 패턴 매칭 (필요시)
         # 예: "005930(삼성전자)" 같은 패턴
@@ -25,18 +30,19 @@ class StockMatcher:
         return list(set(tickers))
     
     def add_tickers_to_news(self, news_items: List[Dict]) -> List[Dict]:
-        """뉴스 아이템에 종목 정보 추가"""
+        """뉴스 아이템에 종목 정보 추가 (한 번 호출하는 동안 같은 버전의 사전 사용)"""
+        dictionary = self.dictionary
         for item in news_items:
             headline = item.get('headline', '')
             summary = item.get('summary', '')
             
             # 헤드라인과 요약에서 종목 찾기
             text = f"{headline} {summary}"
-            tickers = self.match_stocks(text)
+            tickers = self.match_stocks(text, dictionary)
             
             item['tickers'] = tickers
             item['ticker_names'] = [
-                self.dictionary.get_name(ticker) for ticker in tickers
+                dictionary.get_name(ticker) for ticker in tickers
             ]
         
         return news_items
@@ -5,11 +5,13 @@
 - 포트: 8003
 """
 import os
+import sys
 import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 import httpx
 import numpy as np
@@ -18,6 +20,11 @@ from botocore.exceptions import ClientError
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import setup_metrics, http_client, instrument_s3, record_cache  # noqa: E402
+from common.tracing import setup_tracing  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +35,7 @@ logger = logging.getLogger(__name__)
 # 환경변수
 HANSEC_APP_KEY = os.getenv("HANSEC_INVESTMENT_APP_KEY", "")
 HANSEC_APP_SECRET = os.getenv("HANSEC_INVESTMENT_APP_SECRET_KEY", "")
-HANSEC_BASE_URL = "https://openapi.koreainvestment.com:9443"
+HANSEC_BASE_URL = os.getenv("HANSEC_BASE_URL", "https://openapi.koreainvestment.com:9443")
 AUTH_AGENT_URL = os.getenv("AUTH_AGENT_URL", "http://auth-agent:8006")
 
 # AWS S3 설정
@@ -110,12 +117,12 @@ class TechnicalAnalyzer:
         # S3 클라이언트 초기화
         if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
             try:
-                self._s3_client = boto3.client(
+                self._s3_client = instrument_s3(boto3.client(
                     's3',
                     region_name=AWS_REGION,
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-                )
+                ))
                 logger.info("S3 client initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize S3 client: {e}")
@@ -149,10 +156,12 @@ class TechnicalAnalyzer:
         # 캐시된 토큰이 유효한지 확인
         if self._auth_token and self._token_expires:
             if datetime.now() < self._token_expires - timedelta(minutes=5):
+                record_cache("auth_token", True)
                 return self._auth_token
+        record_cache("auth_token", False)
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client(timeout=10.0) as client:
                 response = await client.get(f"{AUTH_AGENT_URL}/result/auth-token")
                 if response.status_code == 200:
                     data = response.json()
@@ -198,7 +207,7 @@ class TechnicalAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client(timeout=30.0) as client:
                 response = await client.get(url, headers=headers, params=params)
                 
                 if response.status_code == 200:
@@ -415,7 +424,9 @@ class TechnicalAnalyzer:
             cached_data, cached_time = self._cache[cache_key]
             if (datetime.now() - cached_time).total_seconds() < CACHE_TTL_SECONDS:
                 logger.info(f"Returning cached analysis for {ticker}")
+                record_cache("technical_analysis", True)
                 return cached_data
+        record_cache("technical_analysis", False)
         
         logger.info(f"Starting technical analysis for {ticker}")
         
@@ -479,6 +490,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+setup_metrics(app)
+setup_tracing(app, "technical-agent")
 
 
 @app.post("/result/analysis")
@@ -510,7 +523,7 @@ async def readiness_probe():
     """Readiness probe"""
     # 인증 에이전트 연결 확인
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        async with http_client(timeout=5.0) as client:
             response = await client.get(f"{AUTH_AGENT_URL}/health/live")
             if response.status_code != 200:
                 raise HTTPException(status_code=503, detail="Auth agent not ready")
@@ -0,0 +1,151 @@
+"""
+주문 중복 방지 저장소 (Order Dedup Store)
+- request_id 기준으로 주문 처리 상태/결과를 SQLite(WAL)에 보관
+- 같은 request_id가 다시 들어오면 재실행하지 않고 이전 결과 반환
+- 전송은 됐지만 결과를 모르는 주문은 pending 상태로 따로 보관 (완료로 취급하지 않음)
+- SQLite 작업은 전용 스레드 1개에서 실행 (이벤트 루프를 막지 않음)
+- TTL 만료 및 최대 보관 건수 기준으로 오래된 항목 정리
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_IN_PROGRESS = "in_progress"
+STATE_PENDING = "pending"  # 증권사로 전송됐지만 접수 여부를 모름
+STATE_DONE = "done"
+
+# 몇 건의 claim마다 만료 항목을 정리할지
+EVICT_EVERY = 100
+
+
+class OrderDedupStore:
+    """request_id 기반 주문 멱등성 저장소"""
+
+    def __init__(self, path: str, ttl_seconds: int = 86400, max_entries: int = 10000):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._claims = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-dedup")
+
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                request_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                response TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at)")
+        self.evict()
+
+    async def _run(self, func, *args):
+        """DB 작업을 전용 스레드에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def claim(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        request_id 선점 시도
+
+        Returns:
+            None: 처음 보는 요청 (선점 완료, 실행해도 됨)
+            dict: 이미 존재하는 요청 {"state": ..., "response": ...}
+        """
+        return await self._run(self._claim, request_id)
+
+    def _claim(self, request_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO orders (request_id, state, response, created_at, updated_at) "
+                "VALUES (?, ?, NULL, ?, ?)",
+                (request_id, STATE_IN_PROGRESS, now, now)
+            )
+            if cursor.rowcount == 1:
+                self._claims += 1
+                if self._claims % EVICT_EVERY == 0:
+                    self._evict_locked()
+                return None
+
+            row = self._conn.execute(
+                "SELECT state, response, created_at FROM orders WHERE request_id = ?",
+                (request_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        state, response, created_at = row
+        return {
+            "state": state,
+            "response": json.loads(response) if response else None,
+            "created_at": created_at
+        }
+
+    async def complete(self, request_id: str, response: Dict[str, Any]):
+        """
+        주문 결과 기록 (이후 재전송 시 이 결과를 반환)
+        - 결과 status 가 pending 이면 STATE_PENDING 으로 기록 (완료된 결과로 재생하지 않음)
+        """
+        state = STATE_PENDING if response.get("status") == "pending" else STATE_DONE
+        await self._run(self._complete, request_id, state, response)
+
+    def _complete(self, request_id: str, state: str, response: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE orders SET state = ?, response = ?, updated_at = ? WHERE request_id = ?",
+                (state, json.dumps(response, ensure_ascii=False), time.time(), request_id)
+            )
+
+    async def release(self, request_id: str):
+        """선점 해제 (증권사로 주문이 전송되지 않은 경우 재시도 허용)"""
+        await self._run(self._release, request_id)
+
+    def _release(self, request_id: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM orders WHERE request_id = ? AND state = ?",
+                (request_id, STATE_IN_PROGRESS)
+            )
+
+    def evict(self):
+        """만료/초과 항목 정리"""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        cutoff = time.time() - self._ttl
+        expired = self._conn.execute("DELETE FROM orders WHERE created_at < ?", (cutoff,)).rowcount
+        overflow = self._conn.execute(
+            "DELETE FROM orders WHERE request_id IN ("
+            "SELECT request_id FROM orders ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,)
+        ).rowcount
+        if expired or overflow:
+            logger.info(f"Dedup store evicted {expired} expired, {overflow} overflow entries")
+
+    def size(self) -> int:
+        """보관 중인 항목 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self):
+        """연결 종료 (진행 중인 DB 작업을 마친 뒤)"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
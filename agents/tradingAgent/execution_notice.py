@@ -0,0 +1,256 @@
+"""
+실시간 체결통보 수신 (Execution Notice Consumer)
+- 한국투자증권 실시간 체결통보(H0STCNI0) WebSocket 구독
+- 체결/취소/거부 통보를 파싱해 처리기로 전달
+- 로컬 테스트용 대체 피드(LocalExecutionFeed) 제공
+"""
+import asyncio
+import base64
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import websockets
+
+try:
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+except ImportError:  # pragma: no cover - 실계좌 연결 시에만 필요
+    AES = None
+
+from common.metrics import http_client
+
+logger = logging.getLogger(__name__)
+
+# 실전 H0STCNI0 / 모의 H0STCNI9
+EXECUTION_NOTICE_TR_ID = "H0STCNI0"
+
+# 체결통보 필드 순서 ('^' 구분)
+NOTICE_FIELDS = [
+    "CUST_ID", "ACNT_NO", "ODER_NO", "OODER_NO", "SELN_BYOV_CLS", "RCTF_CLS",
+    "ODER_KIND", "ODER_COND", "STCK_SHRN_ISCD", "CNTG_QTY", "CNTG_UNPR",
+    "STCK_CNTG_HOUR", "RFUS_YN", "CNTG_YN", "ACPT_YN", "BRNC_NO", "ODER_QTY",
+    "ACNT_NAME", "CNTG_ISNM", "CRDT_CLS", "CRDT_LOAN_DATE", "CNTG_ISNM40", "ODER_PRC",
+]
+
+# 재연결 대기 (초)
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+
+NoticeHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value or 0)
+    except ValueError:
+        return 0
+
+
+def parse_notice_fields(values: List[str]) -> Dict[str, Any]:
+    """체결통보 필드 목록을 주문 이벤트로 변환"""
+    raw = dict(zip(NOTICE_FIELDS, values))
+    is_fill = raw.get("CNTG_YN") == "2"
+    if raw.get("RFUS_YN") == "1":
+        kind = "reject"
+    elif is_fill:
+        kind = "fill"
+    elif raw.get("RCTF_CLS") == "2":
+        kind = "cancel"
+    else:
+        kind = "accept"  # 접수/정정 확인
+
+    return {
+        "kind": kind,
+        "order_no": raw.get("ODER_NO", ""),
+        "orig_order_no": raw.get("OODER_NO", ""),
+        "ticker": raw.get("STCK_SHRN_ISCD", ""),
+        "action": "sell" if raw.get("SELN_BYOV_CLS") == "01" else "buy",
+        "fill_qty": _to_int(raw.get("CNTG_QTY", "")) if is_fill else 0,
+        "fill_price": _to_int(raw.get("CNTG_UNPR", "")) if is_fill else 0,
+        "fill_time": raw.get("STCK_CNTG_HOUR", ""),
+        "order_qty": _to_int(raw.get("ODER_QTY", "")),
+        "order_price": _to_int(raw.get("ODER_PRC", "")),
+    }
+
+
+def parse_notice_payload(payload: str) -> List[Dict[str, Any]]:
+    """복호화된 데이터 부분 파싱 (여러 건이 이어져 올 수 있음)"""
+    values = payload.split("^")
+    width = len(NOTICE_FIELDS)
+    return [
+        parse_notice_fields(values[i:i + width])
+        for i in range(0, len(values) - width + 1, width)
+    ]
+
+
+def decrypt_payload(cipher_text: str, key: str, iv: str) -> str:
+    """AES-256-CBC 암호화된 체결통보 복호화"""
+    if AES is None:
+        raise RuntimeError("pycryptodome is required to decrypt execution notices")
+    cipher = AES.new(key.encode("utf-8"), AES.MODE_CBC, iv.encode("utf-8"))
+    return unpad(cipher.decrypt(base64.b64decode(cipher_text)), AES.block_size).decode("utf-8")
+
+
+class KisExecutionFeed:
+    """한국투자증권 실시간 체결통보 WebSocket 구독"""
+
+    def __init__(
+        self,
+        ws_url: str,
+        base_url: str,
+        app_key: str,
+        app_secret: str,
+        hts_id: str,
+        tr_id: str = EXECUTION_NOTICE_TR_ID
+    ):
+        self._ws_url = ws_url
+        self._base_url = base_url
+        self._app_key = app_key
+        self._app_secret = app_secret
+        self._hts_id = hts_id
+        self._tr_id = tr_id
+        self._aes_key: Optional[str] = None
+        self._aes_iv: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    async def start(self, handler: NoticeHandler):
+        """구독 태스크 시작"""
+        self._task = asyncio.create_task(self._run(handler))
+
+    async def stop(self):
+        """구독 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _get_approval_key(self) -> str:
+        """실시간 접속키 발급"""
+        async with http_client(timeout=10.0) as client:
+            response = await client.post(
+                f"{self._base_url}/oauth2/Approval",
+                json={
+                    "grant_type": "client_credentials",
+                    "appkey": self._app_key,
+                    "secretkey": self._app_secret
+                }
+            )
+            response.raise_for_status()
+            return response.json()["approval_key"]
+
+    async def _run(self, handler: NoticeHandler):
+        """연결 유지 루프 (끊기면 지수 백오프로 재연결)"""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                approval_key = await self._get_approval_key()
+                async with websockets.connect(self._ws_url, ping_interval=None) as ws:
+                    await ws.send(json.dumps({
+                        "header": {
+                            "approval_key": approval_key,
+                            "custtype": "P",
+                            "tr_type": "1",
+                            "content-type": "utf-8"
+                        },
+                        "body": {"input": {"tr_id": self._tr_id, "tr_key": self._hts_id}}
+                    }))
+                    self.connected = True
+                    delay = RECONNECT_MIN_DELAY
+                    logger.info(f"Subscribed to execution notices ({self._tr_id})")
+
+                    async for message in ws:
+                        await self._handle_message(ws, message, handler)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Execution notice feed error: {e}")
+            finally:
+                self.connected = False
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _handle_message(self, ws, message: str, handler: NoticeHandler):
+        """수신 메시지 처리 (데이터 / 제어 메시지 구분)"""
+        if message[:1] in ("0", "1"):
+            # 데이터: 암호화여부|TR_ID|건수|데이터
+            parts = message.split("|", 3)
+            if len(parts) < 4 or parts[1] != self._tr_id:
+                return
+            payload = parts[3]
+            if parts[0] == "1":
+                if not self._aes_key:
+                    logger.warning("Encrypted execution notice received before key exchange")
+                    return
+                payload = decrypt_payload(payload, self._aes_key, self._aes_iv)
+            for notice in parse_notice_payload(payload):
+                try:
+                    await handler(notice)
+                except Exception as e:
+                    logger.error(f"Execution notice handler error: {e}")
+            return
+
+        data = json.loads(message)
+        header = data.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            await ws.send(message)
+            return
+
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            logger.error(f"Execution notice subscribe failed: {body.get('msg1')}")
+            return
+        output = body.get("output") or {}
+        if output.get("key"):
+            self._aes_key = output["key"]
+            self._aes_iv = output.get("iv")
+
+
+class LocalExecutionFeed:
+    """로컬/테스트용 체결통보 피드 (publish 로 통보 주입)"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    async def start(self, handler: NoticeHandler):
+        """배달 태스크 시작"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(handler))
+        self.connected = True
+
+    async def stop(self):
+        """배달 종료"""
+        self.connected = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, notice: Dict[str, Any]):
+        """파싱된 형태의 통보 주입"""
+        if self._queue is None:
+            raise RuntimeError("Local execution feed is not started")
+        await self._queue.put(notice)
+
+    async def publish_raw(self, payload: str):
+        """증권사와 같은 '^' 구분 데이터 주입"""
+        for notice in parse_notice_payload(payload):
+            await self.publish(notice)
+
+    async def _run(self, handler: NoticeHandler):
+        while True:
+            notice = await self._queue.get()
+            try:
+                await handler(notice)
+            except Exception as e:
+                logger.error(f"Execution notice handler error: {e}")
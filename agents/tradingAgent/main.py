@@ -5,18 +5,33 @@
 - 포트: 8005
 """
 import os
+import sys
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any, Set
+from typing import Optional, Dict, Any, Set, Tuple
 from contextlib import asynccontextmanager
+from pathlib import Path
 from uuid import uuid4
 
 import httpx
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from pydantic import BaseModel
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.metrics import setup_metrics, http_client, record_cache, track_queue_depth  # noqa: E402
+from common.tracing import setup_tracing, Span, activate, start_span, traced  # noqa: E402
+
+from order_queue import OrderQueue, OrderQueueFull, classify_priority
+from dedup_store import OrderDedupStore, STATE_DONE, STATE_PENDING
+from order_journal import (
+    OrderJournal, EVENT_SUBMIT, EVENT_ACK, EVENT_FILL, EVENT_CANCEL, EVENT_REJECT, ADOPTED_KEY_PREFIX
+)
+from execution_notice import KisExecutionFeed, LocalExecutionFeed
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -29,7 +44,7 @@ HANSEC_APP_KEY = os.getenv("HANSEC_INVESTMENT_APP_KEY", "")
 HANSEC_APP_SECRET = os.getenv("HANSEC_INVESTMENT_APP_SECRET_KEY", "")
 HANSEC_CANO = os.getenv("HANSEC_INVESTMENT_CANO", "")
 HANSEC_ACNT_PRDT_CD = os.getenv("HANSEC_INVESTMENT_ACNT_PRDT_CD", "01")
-HANSEC_BASE_URL = "https://openapi.koreainvestment.com:9443"
+HANSEC_BASE_URL = os.getenv("HANSEC_BASE_URL", "https://openapi.koreainvestment.com:9443")
 AUTH_AGENT_URL = os.getenv("AUTH_AGENT_URL", "http://auth-agent:8006")
 
 # TR_ID (실전투자)
@@ -38,6 +53,33 @@ TR_ID_SELL = "TTTC0011U"
 TR_ID_MODIFY = "TTTC0013U"
 TR_ID_PSBL_RVSECNCL = "TTTC0084R"
 
+# 주문 큐 설정 (한국투자증권 초당 거래건수 제한 고려)
+ORDER_WORKERS = int(os.getenv("ORDER_WORKERS", "3"))
+KIS_ORDER_MAX_RPS = float(os.getenv("KIS_ORDER_MAX_RPS", "8"))
+ORDER_QUEUE_MAX_DEPTH = int(os.getenv("ORDER_QUEUE_MAX_DEPTH", "100"))
+WS_MAX_INFLIGHT = int(os.getenv("WS_MAX_INFLIGHT", "32"))  # 연결당 처리 중 주문 상한
+BACKPRESSURE_RETRY_AFTER = 1.0  # 초
+
+# 주문 재시도 (증권사에 전달되지 않은 것이 확실한 오류만 짧은 간격으로 재시도)
+ORDER_MAX_RETRIES = 3
+ORDER_RETRY_BACKOFF = 0.2  # 초 (지수 증가)
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# 주문 중복 방지 저장소
+ORDER_STATE_DIR = os.getenv("ORDER_STATE_DIR", "data")
+ORDER_DEDUP_TTL_SECONDS = int(os.getenv("ORDER_DEDUP_TTL_SECONDS", "86400"))
+ORDER_DEDUP_MAX_ENTRIES = int(os.getenv("ORDER_DEDUP_MAX_ENTRIES", "10000"))
+
+# 주문 저널 (일자별 세그먼트, fsync 묶음 간격)
+ORDER_JOURNAL_DIR = os.getenv("ORDER_JOURNAL_DIR", os.path.join(ORDER_STATE_DIR, "journal"))
+ORDER_JOURNAL_FSYNC_MS = int(os.getenv("ORDER_JOURNAL_FSYNC_MS", "20"))
+
+# 실시간 체결통보 (kis: 증권사 WebSocket, local: 테스트용 주입 피드, off: 사용 안 함)
+HANSEC_HTS_ID = os.getenv("HANSEC_INVESTMENT_HTS_ID", "")
+HANSEC_WS_URL = os.getenv("HANSEC_WS_URL", "ws://ops.koreainvestment.com:21000")
+EXECUTION_NOTICE_MODE = os.getenv("EXECUTION_NOTICE_MODE", "kis" if HANSEC_HTS_ID else "off")
+EXECUTION_NOTICE_TR_ID = os.getenv("EXECUTION_NOTICE_TR_ID", "H0STCNI0")
+
 
 class OrderRequest(BaseModel):
     """주문 요청 모델"""
@@ -48,6 +90,8 @@ class OrderRequest(BaseModel):
     order_type: str  # market, limit
     price: int = 0
     timestamp: str
+    reason: Optional[str] = None  # stop_loss, take_profit, rebalance
+    traceparent: Optional[str] = None  # 분산 추적 (W3C traceparent)
 
 
 class OrderResponse(BaseModel):
@@ -67,15 +111,41 @@ class HealthResponse(BaseModel):
 class TradingExecutor:
     """거래 실행 클래스"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        dedup_store: Optional[OrderDedupStore] = None,
+        journal: Optional[OrderJournal] = None
+    ):
         self._auth_token: Optional[str] = None
         self._token_expires: Optional[datetime] = None
-        self._pending_orders: Dict[str, Dict] = {}  # 미체결 주문 관리
+        self._dedup_store = dedup_store
+        self._journal = journal  # 미체결 주문 관리 (재시작 시 복원)
+    
+    def close(self):
+        """종료 처리 (저장소 연결 해제)"""
+        if self._dedup_store:
+            self._dedup_store.close()
+    
+    async def _journal_event(self, event: str, key: str, **fields: Any):
+        """저널에 주문 상태 전이 기록"""
+        if self._journal:
+            await self._journal.append(event, key, **fields)
+    
+    async def recover_open_orders(self) -> Dict[str, int]:
+        """재시작 후 저널의 미체결 주문을 증권사 미체결 목록과 대조 (1회 조회)"""
+        if not self._journal:
+            return {}
+        try:
+            open_orders = await self._fetch_cancelable_orders()
+        except Exception as e:
+            logger.error(f"Open order reconciliation skipped: {e}")
+            return {}
+        return await self._journal.reconcile(open_orders)
     
     async def _get_auth_token(self) -> str:
         """인증 토큰 조회"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client(timeout=10.0) as client:
                 response = await client.get(f"{AUTH_AGENT_URL}/result/auth-token")
                 if response.status_code == 200:
                     data = response.json()
@@ -98,10 +168,123 @@ class TradingExecutor:
             "custtype": "P"
         }
     
+    @traced("execute_order")
     async def execute_order(self, order: OrderRequest) -> OrderResponse:
-        """주문 실행"""
+        """주문 실행 (request_id 기준 멱등)"""
         logger.info(f"Executing order: {order.action} {order.ticker} x {order.qty}")
         
+        # 중복 요청 확인 (재연결 후 재전송 등)
+        if self._dedup_store:
+            prior = await self._dedup_store.claim(order.request_id)
+            record_cache("order_dedup", prior is not None)
+            if prior is not None:
+                return self._replay_response(order, prior)
+        
+        result, transmitted = await self._execute_with_retry(order)
+        
+        if not transmitted:
+            await self._journal_event(EVENT_REJECT, order.request_id, reason=result.message)
+        
+        if self._dedup_store:
+            if transmitted:
+                await self._dedup_store.complete(order.request_id, result.model_dump())
+            else:
+                # 증권사로 전달되지 않았으므로 같은 request_id 재시도 허용
+                await self._dedup_store.release(order.request_id)
+        
+        return result
+    
+    async def handle_execution_notice(self, notice: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """실시간 체결통보를 주문 상태에 반영하고 클라이언트 전달용 이벤트 반환"""
+        kind = notice.get("kind")
+        order_no = notice.get("order_no", "")
+        if kind not in ("fill", "cancel", "reject") or not order_no:
+            return None
+        
+        # 취소 통보는 원주문 번호 기준으로 찾음
+        lookup_no = notice.get("orig_order_no") if kind == "cancel" else order_no
+        key = None
+        if self._journal:
+            key = self._journal.key_for_order_no(lookup_no or order_no)
+        state = self._journal.get(key) if (self._journal and key) else None
+        key = key or f"{ADOPTED_KEY_PREFIX}{lookup_no or order_no}"
+        
+        order_qty = int((state or {}).get("qty") or notice.get("order_qty", 0))
+        filled_qty = int((state or {}).get("filled_qty", 0))
+        
+        if kind == "fill":
+            filled_qty += notice.get("fill_qty", 0)
+            if state is None:
+                # 저널에 없는 주문 (다른 경로 주문 등)
+                await self._journal_event(
+                    EVENT_ACK, key,
+                    order_no=order_no,
+                    ticker=notice.get("ticker"),
+                    action=notice.get("action"),
+                    qty=order_qty
+                )
+            await self._journal_event(
+                EVENT_FILL, key,
+                filled_qty=filled_qty,
+                last_fill_price=notice.get("fill_price")
+            )
+            status = "filled" if order_qty and filled_qty >= order_qty else "partially_filled"
+        elif kind == "cancel":
+            await self._journal_event(EVENT_CANCEL, key, order_no=lookup_no, source="notice")
+            status = "cancelled"
+        else:
+            await self._journal_event(EVENT_REJECT, key, order_no=order_no, source="notice")
+            status = "rejected"
+        
+        logger.info(f"Execution notice: {kind} {notice.get('ticker')} order {order_no} ({status})")
+        return {
+            "type": "execution",
+            "event": kind,
+            "status": status,
+            "request_id": (state or {}).get("request_id"),
+            "order_no": order_no,
+            "ticker": notice.get("ticker") or (state or {}).get("ticker"),
+            "action": notice.get("action"),
+            "fill_qty": notice.get("fill_qty", 0),
+            "fill_price": notice.get("fill_price", 0),
+            "filled_qty": filled_qty,
+            "order_qty": order_qty,
+            "remaining_qty": max(0, order_qty - filled_qty),
+            "timestamp": datetime.utcnow().isoformat() + "Z"
+        }
+    
+    def _replay_response(self, order: OrderRequest, prior: Dict[str, Any]) -> OrderResponse:
+        """중복 요청에 대한 이전 결과 반환"""
+        if prior["state"] == STATE_DONE and prior["response"]:
+            logger.info(f"Duplicate request {order.request_id}, replaying stored result")
+            return OrderResponse(**prior["response"])
+        
+        if prior["state"] == STATE_PENDING:
+            logger.warning(f"Duplicate request {order.request_id}, original outcome still unknown")
+            return OrderResponse(
+                request_id=order.request_id,
+                status="pending",
+                order_no=(prior["response"] or {}).get("order_no"),
+                message="Duplicate request: original order was transmitted but its outcome is unknown, "
+                        "check open orders before resubmitting",
+                timestamp=datetime.utcnow().isoformat() + "Z"
+            )
+        
+        logger.warning(f"Duplicate request {order.request_id} while original is in progress")
+        return OrderResponse(
+            request_id=order.request_id,
+            status="pending",
+            message="Duplicate request: original order is in progress or its outcome is unknown",
+            timestamp=datetime.utcnow().isoformat() + "Z"
+        )
+    
+    async def _execute_with_retry(self, order: OrderRequest) -> Tuple[OrderResponse, bool]:
+        """
+        주문 전송 (재시도 포함)
+        
+        Returns:
+            (결과, 증권사 전달 여부) - 전달 여부가 False면 주문이 접수되지 않았음이 확실함
+        """
         # 토큰 갱신
         try:
             await self._get_auth_token()
@@ -111,39 +294,57 @@ class TradingExecutor:
                 status="failed",
                 message=f"Auth token error: {str(e)}",
                 timestamp=datetime.utcnow().isoformat() + "Z"
-            )
+            ), False
+        
+        action = order.action.lower()
+        if action not in ("buy", "sell"):
+            return OrderResponse(
+                request_id=order.request_id,
+                status="failed",
+                message=f"Invalid action: {order.action}",
+                timestamp=datetime.utcnow().isoformat() + "Z"
+            ), False
         
-        # 재시도 로직
-        max_retries = 3
-        retry_delay = 1
+        # 전송 전 기록 (비정상 종료 후 재시작 시 대조 대상)
+        await self._journal_event(
+            EVENT_SUBMIT, order.request_id,
+            request_id=order.request_id,
+            ticker=order.ticker,
+            action=action,
+            qty=order.qty,
+            price=order.price
+        )
         
-        for attempt in range(max_retries):
+        for attempt in range(ORDER_MAX_RETRIES):
             try:
-                if order.action.lower() == "buy":
+                if action == "buy":
                     result = await self._execute_buy(order)
-                elif order.action.lower() == "sell":
+                else:
                     result = await self._execute_sell(order)
+                return result, True
+                
+            except RETRYABLE_ERRORS as e:
+                # 연결 단계 오류: 주문이 전송되지 않았으므로 바로 재시도해도 안전
+                logger.warning(f"Order connect error (attempt {attempt + 1}): {e}")
+                if attempt < ORDER_MAX_RETRIES - 1:
+                    await asyncio.sleep(ORDER_RETRY_BACKOFF * (2 ** attempt))
                 else:
                     return OrderResponse(
                         request_id=order.request_id,
                         status="failed",
-                        message=f"Invalid action: {order.action}",
+                        message=f"Order failed after {ORDER_MAX_RETRIES} attempts: {str(e)}",
                         timestamp=datetime.utcnow().isoformat() + "Z"
-                    )
-                
-                return result
+                    ), False
                 
             except Exception as e:
-                logger.error(f"Order execution error (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                else:
-                    return OrderResponse(
-                        request_id=order.request_id,
-                        status="failed",
-                        message=f"Order failed after {max_retries} attempts: {str(e)}",
-                        timestamp=datetime.utcnow().isoformat() + "Z"
-                    )
+                # 응답 타임아웃 등: 증권사가 이미 접수했을 수 있으므로 재전송하지 않음
+                logger.error(f"Order outcome unknown for {order.request_id}: {e}")
+                return OrderResponse(
+                    request_id=order.request_id,
+                    status="pending",
+                    message=f"Order outcome unknown, check open orders before resubmitting: {str(e)}",
+                    timestamp=datetime.utcnow().isoformat() + "Z"
+                ), True
     
     async def _execute_buy(self, order: OrderRequest) -> OrderResponse:
         """매수 주문 실행"""
@@ -164,7 +365,7 @@ class TradingExecutor:
         
         headers = self._get_headers(TR_ID_BUY)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.post(url, headers=headers, json=body)
             data = response.json()
             
@@ -172,14 +373,12 @@ class TradingExecutor:
                 output = data.get("output", {})
                 order_no = output.get("ODNO", "")
                 
-                # 미체결 주문 저장
-                self._pending_orders[order_no] = {
-                    "request_id": order.request_id,
-                    "ticker": order.ticker,
-                    "action": "buy",
-                    "qty": order.qty,
-                    "krx_fwdg_ord_orgno": output.get("KRX_FWDG_ORD_ORGNO", "")
-                }
+                # 미체결 주문 기록
+                await self._journal_event(
+                    EVENT_ACK, order.request_id,
+                    order_no=order_no,
+                    krx_fwdg_ord_orgno=output.get("KRX_FWDG_ORD_ORGNO", "")
+                )
                 
                 logger.info(f"Buy order success: {order_no}")
                 return OrderResponse(
@@ -192,6 +391,7 @@ class TradingExecutor:
             else:
                 error_msg = data.get("msg1", "Unknown error")
                 logger.error(f"Buy order failed: {error_msg}")
+                await self._journal_event(EVENT_REJECT, order.request_id, reason=error_msg)
                 return OrderResponse(
                     request_id=order.request_id,
                     status="failed",
@@ -217,7 +417,7 @@ class TradingExecutor:
         
         headers = self._get_headers(TR_ID_SELL)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.post(url, headers=headers, json=body)
             data = response.json()
             
@@ -225,13 +425,12 @@ class TradingExecutor:
                 output = data.get("output", {})
                 order_no = output.get("ODNO", "")
                 
-                self._pending_orders[order_no] = {
-                    "request_id": order.request_id,
-                    "ticker": order.ticker,
-                    "action": "sell",
-                    "qty": order.qty,
-                    "krx_fwdg_ord_orgno": output.get("KRX_FWDG_ORD_ORGNO", "")
-                }
+                # 미체결 주문 기록
+                await self._journal_event(
+                    EVENT_ACK, order.request_id,
+                    order_no=order_no,
+                    krx_fwdg_ord_orgno=output.get("KRX_FWDG_ORD_ORGNO", "")
+                )
                 
                 logger.info(f"Sell order success: {order_no}")
                 return OrderResponse(
@@ -244,6 +443,7 @@ class TradingExecutor:
             else:
                 error_msg = data.get("msg1", "Unknown error")
                 logger.error(f"Sell order failed: {error_msg}")
+                await self._journal_event(EVENT_REJECT, order.request_id, reason=error_msg)
                 return OrderResponse(
                     request_id=order.request_id,
                     status="failed",
@@ -277,12 +477,14 @@ class TradingExecutor:
         
         headers = self._get_headers(TR_ID_MODIFY)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.post(url, headers=headers, json=body)
             data = response.json()
             
             if response.status_code == 200 and data.get("rt_cd") == "0":
                 logger.info(f"Order cancelled: {order_no}")
+                key = (self._journal.key_for_order_no(order_no) if self._journal else None) or f"{ADOPTED_KEY_PREFIX}{order_no}"
+                await self._journal_event(EVENT_CANCEL, key, order_no=order_no)
                 return {"status": "success", "message": "주문 취소 완료"}
             else:
                 error_msg = data.get("msg1", "Unknown error")
@@ -291,6 +493,14 @@ class TradingExecutor:
     
     async def get_cancelable_orders(self) -> list:
         """정정취소 가능 주문 조회"""
+        try:
+            return await self._fetch_cancelable_orders()
+        except Exception as e:
+            logger.error(f"Failed to get cancelable orders: {e}")
+            return []
+    
+    async def _fetch_cancelable_orders(self) -> list:
+        """정정취소 가능 주문 조회 (실패 시 예외)"""
         await self._get_auth_token()
         
         url = f"{HANSEC_BASE_URL}/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl"
@@ -306,30 +516,89 @@ class TradingExecutor:
         
         headers = self._get_headers(TR_ID_PSBL_RVSECNCL)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(url, headers=headers, params=params)
             data = response.json()
             
             if response.status_code == 200 and data.get("rt_cd") == "0":
                 return data.get("output", [])
             else:
-                logger.error(f"Failed to get cancelable orders: {data.get('msg1')}")
-                return []
+                raise Exception(f"Cancelable order query failed: {data.get('msg1')}")
 
 
-# 전역 거래 실행기
-executor = TradingExecutor()
+# 전역 주문 저널
+order_journal = OrderJournal(ORDER_JOURNAL_DIR, fsync_interval=ORDER_JOURNAL_FSYNC_MS / 1000)
+
+# 전역 거래 실행기 (request_id 중복 방지 저장소, 주문 저널 포함)
+executor = TradingExecutor(
+    OrderDedupStore(
+        os.path.join(ORDER_STATE_DIR, "order_dedup.db"),
+        ttl_seconds=ORDER_DEDUP_TTL_SECONDS,
+        max_entries=ORDER_DEDUP_MAX_ENTRIES
+    ),
+    order_journal
+)
+
+# 전역 주문 큐 (리스크 청산 > 리밸런싱 매도 > 매수)
+order_queue = OrderQueue(
+    executor.execute_order,
+    workers=ORDER_WORKERS,
+    max_per_second=KIS_ORDER_MAX_RPS,
+    max_depth=ORDER_QUEUE_MAX_DEPTH
+)
+
+# 실시간 체결통보 피드
+if EXECUTION_NOTICE_MODE == "kis":
+    execution_feed = KisExecutionFeed(
+        HANSEC_WS_URL, HANSEC_BASE_URL, HANSEC_APP_KEY, HANSEC_APP_SECRET,
+        HANSEC_HTS_ID, tr_id=EXECUTION_NOTICE_TR_ID
+    )
+elif EXECUTION_NOTICE_MODE == "local":
+    execution_feed = LocalExecutionFeed()
+else:
+    execution_feed = None
 
 # WebSocket 연결 관리
 connected_clients: Set[WebSocket] = set()
+execution_clients: Set[WebSocket] = set()  # 체결 이벤트 구독자
+
+
+async def broadcast_execution(event: Dict[str, Any]):
+    """체결 이벤트를 구독 중인 클라이언트에게 전달"""
+    payload = json.dumps(event, ensure_ascii=False)
+    for websocket in list(execution_clients):
+        try:
+            await websocket.send_text(payload)
+        except Exception:
+            execution_clients.discard(websocket)
+
+
+async def on_execution_notice(notice: Dict[str, Any]):
+    """체결통보 처리기 (저널 반영 후 전파)"""
+    event = await executor.handle_execution_notice(notice)
+    if event:
+        await broadcast_execution(event)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 생명주기 관리"""
     logger.info("Trading Agent starting...")
+    await order_journal.start()
+    # 미체결 주문 대조는 주문 큐 시작 전에 끝냄
+    # (대조 중 새로 들어온 주문이 증권사 조회 결과에 없다는 이유로 close 되지 않도록)
+    await executor.recover_open_orders()
+    await order_queue.start()
+    if execution_feed:
+        await execution_feed.start(on_execution_notice)
+        logger.info(f"Execution notice feed started ({EXECUTION_NOTICE_MODE})")
     yield
     logger.info("Trading Agent shutting down...")
+    if execution_feed:
+        await execution_feed.stop()
+    await order_queue.stop()
+    await order_journal.stop()
+    executor.close()
 
 
 app = FastAPI(
@@ -338,6 +607,11 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+setup_metrics(app)
+setup_tracing(app, "trading-agent")
+track_queue_depth("order_queue", order_queue.depth)
+for _priority in order_queue.depth_by_priority():
+    track_queue_depth(f"order_queue:{_priority}", lambda p=_priority: order_queue.depth_by_priority()[p])
 
 
 async def send_ping(websocket: WebSocket):
@@ -353,13 +627,77 @@ async def send_ping(websocket: WebSocket):
         pass
 
 
+async def _send_text_locked(websocket: WebSocket, lock: asyncio.Lock, payload: str):
+    """여러 태스크가 같은 연결로 전송할 때 직렬화"""
+    async with lock:
+        await websocket.send_text(payload)
+
+
+async def _deliver_result(
+    websocket: WebSocket,
+    send_lock: asyncio.Lock,
+    order: OrderRequest,
+    future: asyncio.Future,
+    received_at: float,
+    order_span: Span
+):
+    """주문 완료 시 결과를 클라이언트로 전송"""
+    try:
+        # 연결이 끊겨도 주문 실행은 계속되도록 shield
+        result = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        order_span.end("cancelled")
+        raise
+    except Exception as e:
+        result = OrderResponse(
+            request_id=order.request_id,
+            status="failed",
+            message=str(e),
+            timestamp=datetime.utcnow().isoformat() + "Z"
+        )
+
+    executed_at = time.monotonic()
+    try:
+        await _send_text_locked(websocket, send_lock, result.model_dump_json())
+    except Exception as e:
+        logger.warning(f"Failed to deliver result for {order.request_id}: {e}")
+        order_span.end("error", str(e))
+        return
+    order_span.set_attribute("order.status", result.status)
+    order_span.end("ok" if result.status == "success" else "error")
+
+    sent_at = time.monotonic()
+    order_queue.latency.record("send", sent_at - executed_at)
+    order_queue.latency.record("total", sent_at - received_at)
+
+
+async def _send_backpressure(
+    websocket: WebSocket,
+    send_lock: asyncio.Lock,
+    request_id: str,
+    message: str
+):
+    """큐가 가득 찼음을 클라이언트에 알림 (일정 시간 후 재전송 요청)"""
+    await _send_text_locked(websocket, send_lock, json.dumps({
+        "type": "backpressure",
+        "request_id": request_id,
+        "queue_depth": order_queue.depth(),
+        "retry_after": BACKPRESSURE_RETRY_AFTER,
+        "message": message,
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }))
+
+
 @app.websocket("/ws/orders")
 async def websocket_orders(websocket: WebSocket):
-    """WebSocket 주문 엔드포인트"""
+    """WebSocket 주문 엔드포인트 (수신과 실행 분리, 결과는 완료 순서대로 전송)"""
     await websocket.accept()
     connected_clients.add(websocket)
     logger.info("Portfolio manager connected via WebSocket")
     
+    send_lock = asyncio.Lock()
+    inflight: Set[asyncio.Task] = set()
+    
     # Ping 태스크 시작
     ping_task = asyncio.create_task(send_ping(websocket))
     
@@ -367,26 +705,51 @@ async def websocket_orders(websocket: WebSocket):
         while True:
             # 주문 메시지 수신
             data = await websocket.receive_text()
+            received_at = time.monotonic()
             
-            # Pong 응답 처리
-            try:
-                msg = json.loads(data)
-                if msg.get("type") == "pong":
-                    continue
-            except:
-                pass
-            
+            order_data: Dict[str, Any] = {}
             try:
                 order_data = json.loads(data)
-                order = OrderRequest(**order_data)
                 
+                # Pong 응답 처리
+                if isinstance(order_data, dict) and order_data.get("type") == "pong":
+                    continue
+                
+                order = OrderRequest(**order_data)
                 logger.info(f"Received order: {order.request_id}")
+                order_queue.latency.record("parse", time.monotonic() - received_at)
+                
+                if len(inflight) >= WS_MAX_INFLIGHT:
+                    await _send_backpressure(
+                        websocket, send_lock, order.request_id,
+                        f"Too many in-flight orders on this connection ({len(inflight)})"
+                    )
+                    continue
                 
-                # 주문 실행
-                result = await executor.execute_order(order)
+                # 주문 수신 → 결과 전송까지를 하나의 span 으로 기록 (큐 워커가 부모로 사용)
+                order_span = start_span(
+                    "WS /ws/orders",
+                    parent=order.traceparent,
+                    kind="server",
+                    attributes={"order.request_id": order.request_id, "order.ticker": order.ticker}
+                )
+                try:
+                    with activate(order_span):
+                        future = await order_queue.submit(
+                            order, classify_priority(order.action, order.reason)
+                        )
+                except OrderQueueFull as e:
+                    logger.warning(f"Backpressure for {order.request_id}: {e}")
+                    order_span.end("backpressure")
+                    await _send_backpressure(websocket, send_lock, order.request_id, str(e))
+                    continue
                 
-                # 결과 전송
-                await websocket.send_text(result.model_dump_json())
+                # 결과 전송은 별도 태스크에서 (다음 주문 수신을 막지 않음)
+                task = asyncio.create_task(
+                    _deliver_result(websocket, send_lock, order, future, received_at, order_span)
+                )
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
                 
             except json.JSONDecodeError:
                 error_response = OrderResponse(
@@ -395,31 +758,77 @@ async def websocket_orders(websocket: WebSocket):
                     message="Invalid JSON format",
                     timestamp=datetime.utcnow().isoformat() + "Z"
                 )
-                await websocket.send_text(error_response.model_dump_json())
+                await _send_text_locked(websocket, send_lock, error_response.model_dump_json())
+            except WebSocketDisconnect:
+                raise
             except Exception as e:
                 logger.error(f"Order processing error: {e}")
+                request_id = order_data.get("request_id", "unknown") if isinstance(order_data, dict) else "unknown"
                 error_response = OrderResponse(
-                    request_id=order_data.get("request_id", "unknown"),
+                    request_id=request_id,
                     status="failed",
                     message=str(e),
                     timestamp=datetime.utcnow().isoformat() + "Z"
                 )
-                await websocket.send_text(error_response.model_dump_json())
+                await _send_text_locked(websocket, send_lock, error_response.model_dump_json())
                 
     except WebSocketDisconnect:
         logger.info("Portfolio manager disconnected")
     finally:
         ping_task.cancel()
+        # 주문 자체는 큐에서 계속 실행되고 결과 전송만 중단
+        for task in inflight:
+            task.cancel()
         connected_clients.discard(websocket)
 
 
+@app.websocket("/ws/executions")
+async def websocket_executions(websocket: WebSocket):
+    """체결 이벤트 구독 엔드포인트 (체결/취소/거부 발생 시 push)"""
+    await websocket.accept()
+    execution_clients.add(websocket)
+    ping_task = asyncio.create_task(send_ping(websocket))
+    try:
+        while True:
+            await websocket.receive_text()  # 클라이언트 메시지는 사용하지 않음
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ping_task.cancel()
+        execution_clients.discard(websocket)
+
+
 @app.post("/api/order", response_model=OrderResponse)
 async def execute_order_http(order: OrderRequest):
     """HTTP 주문 API (테스트/백업용)"""
-    result = await executor.execute_order(order)
+    result = await order_queue.execute(order, classify_priority(order.action, order.reason))
     return result
 
 
+@app.get("/api/open-orders")
+async def get_open_orders():
+    """저널 기준 미체결 주문 조회"""
+    return {"orders": order_journal.live_orders(), "stats": order_journal.stats()}
+
+
+@app.post("/api/execution-notices")
+async def inject_execution_notice(notice: Dict[str, Any]):
+    """테스트용 체결통보 주입 (EXECUTION_NOTICE_MODE=local 에서만)"""
+    if not isinstance(execution_feed, LocalExecutionFeed):
+        raise HTTPException(status_code=404, detail="Local execution feed is not enabled")
+    if "raw" in notice:
+        await execution_feed.publish_raw(notice["raw"])
+    else:
+        await execution_feed.publish(notice)
+    return {"status": "queued"}
+
+
+@app.get("/api/order-queue/stats")
+async def get_order_queue_stats():
+    """주문 큐 상태 조회 (대기 건수, 대기시간)"""
+    return order_queue.stats()
+
+
 @app.get("/api/cancelable-orders")
 async def get_cancelable_orders():
     """정정취소 가능 주문 조회 API"""
@@ -444,7 +853,7 @@ async def liveness_probe():
 async def readiness_probe():
     """Readiness probe"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        async with http_client(timeout=5.0) as client:
             response = await client.get(f"{AUTH_AGENT_URL}/health/live")
             if response.status_code != 200:
                 raise HTTPException(status_code=503, detail="Auth agent not ready")
@@ -0,0 +1,424 @@
+"""
+주문 저널 (Order Journal)
+- 주문 상태 전이(submit/ack/fill/cancel/reject/close)를 일자별 로그 세그먼트에 append
+- 여러 기록을 모아서 한 번에 fsync (group commit)
+- 시작 시 세그먼트를 재생해 미체결 주문 복원 후 정정취소가능주문조회 결과와 대조
+- 체결/취소 등 종료된 주문은 메모리와 세그먼트에서 정리
+- 일자가 바뀌면 이전 세션 주문은 close (KRX 주문은 당일 유효, 미체결로 만료되면 체결통보가 오지 않음)
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 종류
+EVENT_SUBMIT = "submit"  # 증권사로 전송 직전
+EVENT_ACK = "ack"  # 주문번호 수신
+EVENT_FILL = "fill"  # 체결 (부분 체결 포함)
+EVENT_CANCEL = "cancel"  # 취소 완료
+EVENT_REJECT = "reject"  # 주문 거부/전송 실패
+EVENT_CLOSE = "close"  # 대조 결과 더 이상 미체결이 아님
+EVENT_CHECKPOINT = "checkpoint"  # 세그먼트 정리 시 미체결 주문 스냅샷
+
+TERMINAL_EVENTS = {EVENT_CANCEL, EVENT_REJECT, EVENT_CLOSE}
+
+# 저널에 request_id 없이 들어온 주문(체결통보/대조로 처음 알게 된 주문)의 키 접두어
+ADOPTED_KEY_PREFIX = "kis:"
+# 주문번호 응답보다 먼저 전량 체결된 주문을 기억하는 개수 (응답이 오면 원래 주문에 합침)
+ADOPTED_FILLS_SIZE = 1000
+
+FLUSH_RETRY_SECONDS = 1.0  # 기록 실패 후 재시도 간격
+
+SEGMENT_PREFIX = "orders_"
+SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(day: str) -> str:
+    return f"{SEGMENT_PREFIX}{day}{SEGMENT_SUFFIX}"
+
+
+class OrderJournal:
+    """append-only 주문 저널"""
+
+    def __init__(self, directory: str, fsync_interval: float = 0.02):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._fsync_interval = fsync_interval
+
+        self._live: Dict[str, Dict[str, Any]] = {}  # 주문 키(request_id) -> 상태
+        self._by_order_no: Dict[str, str] = {}  # 주문번호 -> 주문 키
+        self._adopted_fills: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # 주문번호 -> 종료된 kis: 주문 상태
+        self._merged: "OrderedDict[str, str]" = OrderedDict()  # 원래 주문에 합친 주문번호 -> 주문 키
+
+        self._file = None
+        self._file_day: Optional[str] = None
+        self._session_day: Optional[str] = None  # 미체결 주문이 속한 거래일 (바뀌면 이전 주문 만료)
+        self._buffer: List[str] = []
+        self._flush_future: Optional[asyncio.Future] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._stats = {"appended": 0, "flushes": 0, "replayed": 0, "compacted": 0, "merged": 0}
+
+    # ==================== 생명주기 ====================
+
+    def replay(self) -> int:
+        """모든 세그먼트를 재생해 미체결 주문 복원 후 이전 세그먼트 정리"""
+        segments = sorted(self._dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+        count = 0
+        for segment in segments:
+            with open(segment, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._apply(json.loads(line))
+                        count += 1
+                    except json.JSONDecodeError:
+                        # 비정상 종료로 마지막 줄이 잘린 경우
+                        logger.warning(f"Skipping corrupt journal line {segment.name}:{line_no}")
+
+        self._stats["replayed"] = count
+        self._session_day = datetime.now().strftime("%Y%m%d")
+        logger.info(f"Journal replayed {count} entries, {len(self._live)} live orders")
+        self._compact(segments)
+        return count
+
+    async def start(self):
+        """재생 후 flush 태스크 시작"""
+        self.replay()
+        self._wake = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """남은 기록을 flush 후 종료"""
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        try:
+            self._flush_now()
+        except Exception as e:
+            logger.error(f"Journal final flush failed, {len(self._buffer)} entries not written: {e}")
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # ==================== 기록 ====================
+
+    async def append(self, event: str, key: str, **fields: Any):
+        """이벤트 기록 (fsync 완료까지 대기)"""
+        entry = {"ts": datetime.now().isoformat(), "event": event, "key": key, **fields}
+        self._apply(entry)
+        self._buffer.append(json.dumps(entry, ensure_ascii=False))
+        self._stats["appended"] += 1
+
+        if self._wake is None:
+            # flush 태스크 없이 사용하는 경우 즉시 기록
+            self._flush_now()
+            return
+
+        if self._flush_future is None:
+            self._flush_future = asyncio.get_running_loop().create_future()
+        future = self._flush_future
+        self._wake.set()
+        await asyncio.shield(future)
+
+    async def _flush_loop(self):
+        """버퍼를 모아서 주기적으로 fsync"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await asyncio.sleep(self._fsync_interval)  # 동시 기록을 모으는 시간
+
+            lines, day, checkpoint, future = self._take_batch()
+            try:
+                await loop.run_in_executor(None, self._write_lines, lines, day, checkpoint)
+                if future and not future.done():
+                    future.set_result(None)
+            except Exception as e:
+                # 이미 메모리 상태에 반영된 기록이므로 버리지 않고 다음 기록 앞에 다시 붙여 재시도
+                logger.error(f"Journal flush failed, retrying in {FLUSH_RETRY_SECONDS}s: {e}")
+                self._buffer[:0] = lines
+                if future and not future.done():
+                    future.set_exception(e)
+                await asyncio.sleep(FLUSH_RETRY_SECONDS)
+                self._wake.set()
+
+    def _flush_now(self):
+        """버퍼 즉시 기록 (실패하면 버퍼에 되돌리고 예외 전달)"""
+        lines, day, checkpoint, future = self._take_batch()
+        try:
+            self._write_lines(lines, day, checkpoint)
+        except Exception:
+            self._buffer[:0] = lines
+            raise
+        if future and not future.done():
+            future.set_result(None)
+
+    def _take_batch(self) -> Tuple[List[str], str, Optional[List[str]], Optional[asyncio.Future]]:
+        """
+        버퍼를 꺼내고, 일자가 바뀌었으면 새 세그먼트에 쓸 미체결 스냅샷 준비
+        (이벤트 루프 스레드에서 호출 → _live 를 바꾸는 _apply 와 겹치지 않음, 기록 스레드에는 문자열만 전달)
+        """
+        lines, future = self._buffer, self._flush_future
+        self._buffer, self._flush_future = [], None
+        now = datetime.now()
+        day = now.strftime("%Y%m%d")
+        if self._session_day != day:
+            lines += self._expire_previous_session(now)
+            self._session_day = day
+        checkpoint = None
+        if self._file_day is not None and self._file_day != day:
+            checkpoint = self._checkpoint_lines()
+        return lines, day, checkpoint, future
+
+    def _write_lines(self, lines: List[str], day: str, checkpoint: Optional[List[str]] = None):
+        """
+        기록 후 fsync (기록 스레드)
+        - 일자가 바뀌었으면 모아 둔 기록은 이전 세그먼트에 쓰고, 새 세그먼트는 미체결 스냅샷으로 시작
+        """
+        if not lines and not checkpoint:
+            return
+        if self._file is None:
+            self._open_segment(day)
+        self._write(lines)
+        if self._file_day != day:
+            self._open_segment(day)
+            self._write(checkpoint or [])
+        self._stats["flushes"] += 1
+
+    def _write(self, lines: List[str]):
+        if not lines:
+            return
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _open_segment(self, day: str):
+        """일자 세그먼트 열기 (이전 세그먼트는 닫음)"""
+        if self._file:
+            self._file.close()
+        self._file = open(self._dir / _segment_name(day), "a", encoding="utf-8")
+        self._file_day = day
+
+    # ==================== 상태 반영 ====================
+
+    def _apply(self, entry: Dict[str, Any]):
+        """이벤트를 메모리 상태에 반영"""
+        event = entry.get("event")
+        key = entry.get("key")
+        if not key:
+            return
+
+        # 이미 원래 주문에 합친 kis: 주문의 뒤늦은 기록 (체결통보 처리 중에 주문 응답이 먼저 반영된 경우)
+        if key.startswith(ADOPTED_KEY_PREFIX) and key not in self._live:
+            target = self._merged.get(key[len(ADOPTED_KEY_PREFIX):])
+            if target:
+                if target not in self._live:
+                    return  # 원래 주문은 이미 종료
+                key = target
+
+        if event in TERMINAL_EVENTS:
+            state = self._live.pop(key, None)
+            if state:
+                self._by_order_no.pop(state.get("order_no", ""), None)
+                self._stats["compacted"] += 1
+            return
+
+        state = self._live.setdefault(key, {"key": key, "filled_qty": 0, "status": "submitted"})
+        if event == EVENT_CHECKPOINT:
+            state.update(entry.get("state", {}))
+        else:
+            for field in (
+                "request_id", "ticker", "action", "qty", "price",
+                "order_no", "krx_fwdg_ord_orgno", "last_fill_price"
+            ):
+                if entry.get(field) not in (None, ""):
+                    state[field] = entry[field]
+            if event == EVENT_ACK:
+                state["status"] = "acknowledged"
+                if not key.startswith(ADOPTED_KEY_PREFIX):
+                    self._merge_adopted(state, entry.get("order_no"))
+            elif event == EVENT_FILL:
+                state["filled_qty"] = max(state.get("filled_qty", 0), int(entry.get("filled_qty", 0)))
+                state["status"] = "partially_filled"
+        state["updated_at"] = entry.get("ts")
+
+        if state.get("order_no"):
+            self._by_order_no[state["order_no"]] = key
+
+        # 전량 체결되면 종료
+        qty = int(state.get("qty") or 0)
+        if event in (EVENT_FILL, EVENT_ACK) and qty and state["filled_qty"] >= qty:
+            self._live.pop(key, None)
+            self._by_order_no.pop(state.get("order_no", ""), None)
+            self._stats["compacted"] += 1
+            if key.startswith(ADOPTED_KEY_PREFIX) and state.get("order_no"):
+                self._adopted_fills[state["order_no"]] = state
+                if len(self._adopted_fills) > ADOPTED_FILLS_SIZE:
+                    self._adopted_fills.popitem(last=False)
+
+    def _merge_adopted(self, state: Dict[str, Any], order_no: Optional[str]):
+        """
+        주문번호 응답보다 체결통보가 먼저 와서 kis:<주문번호> 로 기록된 체결을 원래 주문(request_id)에 합침
+        (시장가 주문은 응답 전에 체결통보가 오는 경우가 흔함)
+        """
+        if not order_no:
+            return
+        other = self._by_order_no.get(order_no)
+        adopted = None
+        if other and other != state["key"] and other.startswith(ADOPTED_KEY_PREFIX):
+            adopted = self._live.pop(other, None)
+        if adopted is None:
+            adopted = self._adopted_fills.pop(order_no, None)
+        self._merged[order_no] = state["key"]
+        if len(self._merged) > ADOPTED_FILLS_SIZE:
+            self._merged.popitem(last=False)
+        if not adopted:
+            return
+        filled = int(adopted.get("filled_qty", 0))
+        if filled > state.get("filled_qty", 0):
+            state["filled_qty"] = filled
+            state["status"] = "partially_filled"
+        if adopted.get("last_fill_price") not in (None, ""):
+            state["last_fill_price"] = adopted["last_fill_price"]
+        self._stats["merged"] += 1
+
+    def _expire_previous_session(self, now: datetime) -> List[str]:
+        """오늘 이전에 마지막으로 갱신된 미체결 주문 close (만료된 당일 주문), 기록할 줄 반환"""
+        today = now.date().isoformat()
+        expired = [key for key, state in self._live.items() if (state.get("updated_at") or "")[:10] < today]
+        lines = []
+        for key in expired:
+            entry = {"ts": now.isoformat(), "event": EVENT_CLOSE, "key": key, "reason": "session_expired"}
+            self._apply(entry)
+            lines.append(json.dumps(entry, ensure_ascii=False))
+        if expired:
+            self._stats["appended"] += len(lines)
+            logger.info(f"Closed {len(expired)} orders from the previous session")
+        return lines
+
+    def _checkpoint_lines(self) -> List[str]:
+        """미체결 주문 스냅샷 (세그먼트 정리용)"""
+        now = datetime.now().isoformat()
+        return [
+            json.dumps({"ts": now, "event": EVENT_CHECKPOINT, "key": key, "state": state}, ensure_ascii=False)
+            for key, state in self._live.items()
+        ]
+
+    def _compact(self, segments: List[Path]):
+        """오늘 세그먼트를 미체결 스냅샷으로 새로 쓰고 이전 세그먼트 삭제"""
+        today = datetime.now().strftime("%Y%m%d")
+        target = self._dir / _segment_name(today)
+        tmp = target.with_suffix(".tmp")
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            for line in self._checkpoint_lines():
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+
+        for segment in segments:
+            if segment != target:
+                segment.unlink(missing_ok=True)
+
+    # ==================== 조회/대조 ====================
+
+    def key_for_order_no(self, order_no: str) -> Optional[str]:
+        """주문번호로 주문 키 조회"""
+        return self._by_order_no.get(order_no)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """미체결 주문 상태 조회"""
+        state = self._live.get(key)
+        return dict(state) if state else None
+
+    def live_orders(self) -> List[Dict[str, Any]]:
+        """미체결 주문 목록"""
+        return [dict(state) for state in self._live.values()]
+
+    async def reconcile(self, open_orders: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        정정취소가능주문조회(inquire-psbl-rvsecncl) 결과와 대조
+
+        - 저널에만 있는 주문: 더 이상 미체결이 아니므로 close
+        - 조회 결과에만 있는 주문: 저널에 추가
+        - 양쪽에 있는 주문: 체결 수량 갱신
+        """
+        remote = {row.get("odno", ""): row for row in open_orders if row.get("odno")}
+        summary = {"updated": 0, "adopted": 0, "closed": 0}
+
+        for key, state in list(self._live.items()):
+            order_no = state.get("order_no")
+            row = remote.pop(order_no, None) if order_no else None
+
+            # 주문번호를 받기 전에 중단된 주문은 종목/수량/구분이 같은 주문에 연결
+            if row is None and not order_no:
+                row = self._match_unacknowledged(state, remote)
+                if row is not None:
+                    remote.pop(row["odno"], None)
+                    await self.append(
+                        EVENT_ACK, key,
+                        order_no=row["odno"],
+                        krx_fwdg_ord_orgno=row.get("ord_gno_brno", "")
+                    )
+
+            if row is None:
+                await self.append(EVENT_CLOSE, key, reason="not_open_at_broker")
+                summary["closed"] += 1
+                continue
+
+            filled = int(row.get("tot_ccld_qty", 0) or 0)
+            if filled > state.get("filled_qty", 0):
+                await self.append(EVENT_FILL, key, filled_qty=filled)
+            summary["updated"] += 1
+
+        for order_no, row in remote.items():
+            await self.append(
+                EVENT_ACK, f"{ADOPTED_KEY_PREFIX}{order_no}",
+                order_no=order_no,
+                ticker=row.get("pdno", ""),
+                action="sell" if row.get("sll_buy_dvsn_cd") == "01" else "buy",
+                qty=int(row.get("ord_qty", 0) or 0),
+                krx_fwdg_ord_orgno=row.get("ord_gno_brno", "")
+            )
+            filled = int(row.get("tot_ccld_qty", 0) or 0)
+            if filled:
+                await self.append(EVENT_FILL, f"{ADOPTED_KEY_PREFIX}{order_no}", filled_qty=filled)
+            summary["adopted"] += 1
+
+        logger.info(f"Journal reconciled: {summary}")
+        return summary
+
+    def _match_unacknowledged(
+        self,
+        state: Dict[str, Any],
+        remote: Dict[str, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """주문번호 없는 주문과 같은 조건의 미체결 주문 찾기"""
+        side = "01" if state.get("action") == "sell" else "02"
+        for row in remote.values():
+            if (
+                row.get("pdno") == state.get("ticker")
+                and row.get("sll_buy_dvsn_cd") == side
+                and int(row.get("ord_qty", 0) or 0) == int(state.get("qty") or 0)
+                and not self.key_for_order_no(row.get("odno", ""))
+            ):
+                return row
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """저널 통계"""
+        return {"live_orders": len(self._live), **self._stats}
@@ -0,0 +1,317 @@
+"""
+주문 우선순위 큐 (Order Priority Queue)
+- 리스크 청산(손절/익절) 매도 > 리밸런싱 매도 > 매수 순서로 실행
+- 같은 종목의 주문은 들어온 순서대로 하나씩 실행
+- 워커 수와 초당 주문 건수로 한국투자증권 API 호출량 제한
+- 대기 건수 상한 초과 시 OrderQueueFull 로 역압(backpressure) 전달
+- 주문 단계별(수신/대기/실행/전송) 지연시간 기록
+- 제출 시점의 컨텍스트(추적 span 등)에서 주문 실행
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (값이 작을수록 먼저 실행)
+PRIORITY_RISK_EXIT = 0
+PRIORITY_REBALANCE_SELL = 1
+PRIORITY_BUY = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_RISK_EXIT: "risk_exit",
+    PRIORITY_REBALANCE_SELL: "rebalance_sell",
+    PRIORITY_BUY: "buy",
+}
+
+# 리스크 청산으로 분류되는 주문 사유
+RISK_EXIT_REASONS = {"stop_loss", "take_profit"}
+
+# 대기시간 통계에 사용할 최근 표본 수
+WAIT_SAMPLE_SIZE = 500
+
+
+class OrderQueueFull(Exception):
+    """대기 주문 수가 상한에 도달함"""
+
+    def __init__(self, depth: int):
+        super().__init__(f"Order queue is full ({depth} orders waiting)")
+        self.depth = depth
+
+
+def classify_priority(action: str, reason: Optional[str] = None) -> int:
+    """주문 종류/사유로 우선순위 결정"""
+    if action.lower() == "sell":
+        if reason and reason.lower() in RISK_EXIT_REASONS:
+            return PRIORITY_RISK_EXIT
+        return PRIORITY_REBALANCE_SELL
+    return PRIORITY_BUY
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값에서 백분위수 계산 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class StageLatency:
+    """주문 처리 단계별 지연시간 기록기"""
+
+    def __init__(self, sample_size: int = WAIT_SAMPLE_SIZE):
+        self._sample_size = sample_size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        """단계 지연시간 기록 (초)"""
+        if stage not in self._samples:
+            self._samples[stage] = deque(maxlen=self._sample_size)
+        self._samples[stage].append(max(0.0, seconds))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """단계별 지연시간 요약 (밀리초)"""
+        result = {}
+        for stage, samples in self._samples.items():
+            values = sorted(samples)
+            result[stage] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 95) * 1000, 1),
+                "p99_ms": round(_percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+            }
+        return result
+
+
+@dataclass
+class QueuedOrder:
+    """큐에 들어간 주문"""
+    order: Any
+    ticker: str
+    priority: int
+    seq: int
+    future: asyncio.Future
+    enqueued_at: float
+    context: contextvars.Context
+
+
+class RateLimiter:
+    """초당 호출 수 제한 (호출 간 최소 간격 보장)"""
+
+    def __init__(self, max_per_second: float):
+        self._interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """다음 호출 슬롯까지 대기"""
+        if self._interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class OrderQueue:
+    """우선순위 기반 주문 실행 큐"""
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 3,
+        max_per_second: float = 8.0,
+        max_depth: int = 100
+    ):
+        self._handler = handler
+        self._worker_count = max(1, workers)
+        self._max_depth = max_depth
+        self._limiter = RateLimiter(max_per_second)
+        self._seq = itertools.count()
+        self._lanes: Dict[str, Deque[QueuedOrder]] = {}  # ticker -> 대기 주문 (FIFO)
+        self._busy: Set[str] = set()  # 실행 중인 종목
+        self._ready: List[Tuple[int, int, str]] = []  # (priority, seq, ticker) heap
+        self._scheduled: Dict[str, Tuple[int, int]] = {}  # ticker -> 유효한 heap 항목
+        self._cond: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self._depth = 0
+
+        # 통계
+        self._waits: Dict[int, Deque[float]] = {
+            p: deque(maxlen=WAIT_SAMPLE_SIZE) for p in PRIORITY_NAMES
+        }
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self.latency = StageLatency()
+
+    async def start(self):
+        """워커 시작"""
+        if self._workers:
+            return
+        self._cond = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self._worker_count)
+        ]
+        logger.info(f"Order queue started with {self._worker_count} workers")
+
+    async def stop(self):
+        """워커 종료"""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+    async def submit(self, order: Any, priority: int) -> asyncio.Future:
+        """주문을 큐에 넣고 결과 Future 반환 (가득 차면 OrderQueueFull)"""
+        if self._cond is None:
+            raise RuntimeError("Order queue is not started")
+        if self._max_depth and self._depth >= self._max_depth:
+            self._stats["rejected"] += 1
+            raise OrderQueueFull(self._depth)
+
+        future = asyncio.get_running_loop().create_future()
+        item = QueuedOrder(
+            order=order,
+            ticker=order.ticker,
+            priority=priority,
+            seq=next(self._seq),
+            future=future,
+            enqueued_at=time.monotonic(),
+            context=contextvars.copy_context()
+        )
+
+        async with self._cond:
+            self._lanes.setdefault(item.ticker, deque()).append(item)
+            self._depth += 1
+            self._stats["submitted"] += 1
+            self._schedule(item.ticker)
+            self._cond.notify()
+
+        return future
+
+    async def execute(self, order: Any, priority: int) -> Any:
+        """주문을 큐에 넣고 실행 결과까지 대기"""
+        future = await self.submit(order, priority)
+        return await future
+
+    def _schedule(self, ticker: str):
+        """종목 대기열을 실행 후보로 등록 (락 보유 상태에서 호출)"""
+        lane = self._lanes.get(ticker)
+        if not lane or ticker in self._busy:
+            return
+
+        # 대기열 중 가장 높은 우선순위를 대기열 전체의 우선순위로 사용
+        # (앞선 매수 뒤에 손절 매도가 있으면 매수도 함께 앞당겨 실행)
+        head = min(lane, key=lambda q: (q.priority, q.seq))
+        key = (head.priority, head.seq)
+        if self._scheduled.get(ticker) == key:
+            return
+        self._scheduled[ticker] = key
+        heapq.heappush(self._ready, (head.priority, head.seq, ticker))
+
+    def _pop_ready(self) -> Optional[QueuedOrder]:
+        """실행 가능한 다음 주문 꺼내기 (락 보유 상태에서 호출)"""
+        while self._ready:
+            priority, seq, ticker = heapq.heappop(self._ready)
+            if self._scheduled.get(ticker) != (priority, seq):
+                continue  # 갱신되어 무효화된 항목
+            del self._scheduled[ticker]
+
+            lane = self._lanes[ticker]
+            item = lane.popleft()
+            if not lane:
+                del self._lanes[ticker]
+            self._busy.add(ticker)
+            self._depth -= 1
+            return item
+        return None
+
+    async def _worker(self, worker_id: int):
+        """주문 실행 워커"""
+        while True:
+            async with self._cond:
+                item = self._pop_ready()
+                while item is None:
+                    await self._cond.wait()
+                    item = self._pop_ready()
+
+            try:
+                await self._limiter.acquire()
+                dispatched_at = time.monotonic()
+                wait = dispatched_at - item.enqueued_at
+                self._waits[item.priority].append(wait)
+                self.latency.record("queue_wait", wait)
+
+                result = await asyncio.create_task(self._handler(item.order), context=item.context)
+                self.latency.record("execution", time.monotonic() - dispatched_at)
+                self._stats["completed"] += 1
+                if not item.future.done():
+                    item.future.set_result(result)
+            except asyncio.CancelledError:
+                if not item.future.done():
+                    item.future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Order worker {worker_id} error: {e}")
+                self._stats["failed"] += 1
+                if not item.future.done():
+                    item.future.set_exception(e)
+            finally:
+                async with self._cond:
+                    self._busy.discard(item.ticker)
+                    self._schedule(item.ticker)
+                    self._cond.notify()
+
+    def depth(self) -> int:
+        """대기 중인 주문 수"""
+        return self._depth
+
+    def is_full(self) -> bool:
+        """대기 건수 상한 도달 여부"""
+        return bool(self._max_depth) and self._depth >= self._max_depth
+
+    def depth_by_priority(self) -> Dict[str, int]:
+        """우선순위별 대기 주문 수"""
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for lane in self._lanes.values():
+            for item in lane:
+                depth[PRIORITY_NAMES[item.priority]] += 1
+        return depth
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 상태 및 대기시간 통계"""
+        depth_by_priority = self.depth_by_priority()
+
+        wait_stats = {}
+        for priority, samples in self._waits.items():
+            values = sorted(samples)
+            wait_stats[PRIORITY_NAMES[priority]] = {
+                "count": len(values),
+                "avg_ms": round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+                "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 95) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+            }
+
+        return {
+            "depth": self._depth,
+            "max_depth": self._max_depth,
+            "depth_by_priority": depth_by_priority,
+            "in_flight": len(self._busy),
+            "workers": self._worker_count,
+            **self._stats,
+            "wait_time": wait_stats,
+            "latency": self.latency.summary(),
+        }
@@ -0,0 +1 @@
+"""Quartz 부하 테스트 / 지연시간 벤치마크"""
@@ -0,0 +1,65 @@
+"""
+벤치마크 결과 비교
+
+사용 예:
+    python benchmarks/compare.py results/before.json results/after.json
+    python benchmarks/compare.py before.json after.json --metric p95_ms --fail-over 10
+      → 어느 작업이든 p95 가 10% 넘게 늘면 종료 코드 1
+"""
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Tuple
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], metric: str) -> List[Tuple[str, str, float, float, float]]:
+    """(워크로드, 작업, 이전값, 이후값, 변화율%) 목록"""
+    rows = []
+    for workload, head_data in head.get("workloads", {}).items():
+        base_latency = base.get("workloads", {}).get(workload, {}).get("latency", {})
+        for op, head_stats in head_data.get("latency", {}).items():
+            if op not in base_latency:
+                continue
+            before = base_latency[op].get(metric, 0.0)
+            after = head_stats.get(metric, 0.0)
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append((workload, op, before, after, change))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--fail-over", type=float, default=None,
+                        help="지연 증가율(%%)이 이 값을 넘으면 실패 (throughput 지표는 감소율)")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    print(f"base: {base['meta'].get('git_sha', '')[:10]} ({base['meta'].get('label')})")
+    print(f"head: {head['meta'].get('git_sha', '')[:10]} ({head['meta'].get('label')})")
+    print(f"{'workload':12s} {'operation':42s} {'base':>10s} {'head':>10s} {'change':>8s}")
+
+    higher_is_better = args.metric.startswith("throughput")
+    regressions = []
+    for workload, op, before, after, change in compare(base, head, args.metric):
+        print(f"{workload:12s} {op:42s} {before:10.2f} {after:10.2f} {change:+7.1f}%")
+        worse = -change if higher_is_better else change
+        if args.fail_over is not None and worse > args.fail_over:
+            regressions.append((workload, op, change))
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.fail_over}%:")
+        for workload, op, change in regressions:
+            print(f"  {workload} / {op}: {change:+.1f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+배치 작업 실행기 (하위 프로세스로 실행)
+- crawl: 뉴스 크롤링 → 종목 매칭/감성 분석/집계 파이프라인 → 재크롤링 (새 기사 없는 정상 상태, 증분 모드 확인)
+- macro: 거시경제 분석 (데이터 수집 → 보고서 생성 → S3 업로드)
+- 마지막 줄에 단계별 소요 시간을 JSON 으로 출력
+
+사용: python drivers.py crawl|macro  (PYTHONPATH 에 해당 에이전트 디렉터리, 작업 디렉터리는 임시 폴더)
+"""
+import sys
+import json
+import time
+import asyncio
+
+
+def run_crawl(pages: int) -> dict:
+    from news_crawler import MultiNewsCrawler
+    from news_pipeline import NewsPipeline
+
+    crawler = MultiNewsCrawler()
+    pipeline = NewsPipeline()
+
+    started = time.perf_counter()
+    news_file = crawler.run(sources=["naver", "hankyung", "mk"], pages=pages)
+    crawl_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pipeline.run(news_file)
+    pipeline_seconds = time.perf_counter() - started
+
+    with open(news_file, "r", encoding="utf-8") as f:
+        news_count = json.load(f)["total_count"]
+
+    started = time.perf_counter()
+    recrawl_file = crawler.run(sources=["naver", "hankyung", "mk"], pages=pages)
+    recrawl_seconds = time.perf_counter() - started
+    with open(recrawl_file, "r", encoding="utf-8") as f:
+        recrawl_count = json.load(f)["total_count"]
+
+    return {
+        "crawl_seconds": crawl_seconds,
+        "pipeline_seconds": pipeline_seconds,
+        "recrawl_seconds": recrawl_seconds,
+        "news_count": news_count,
+        "recrawl_news_count": recrawl_count,
+        "sentiment": pipeline.sentiment_analyzer.stats,
+    }
+
+
+def run_macro() -> dict:
+    from main import run_analysis
+
+    started = time.perf_counter()
+    result = asyncio.run(run_analysis())
+    return {
+        "analysis_seconds": time.perf_counter() - started,
+        "success": result["success"],
+        "uploaded_files": len(result["uploaded_files"]),
+    }
+
+
+if __name__ == "__main__":
+    job = sys.argv[1]
+    if job == "crawl":
+        timings = run_crawl(int(sys.argv[2]) if len(sys.argv) > 2 else 3)
+    elif job == "macro":
+        timings = run_macro()
+    else:
+        raise SystemExit(f"unknown job: {job}")
+    print(json.dumps(timings))
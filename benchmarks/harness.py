@@ -0,0 +1,283 @@
+"""
+벤치마크 실행 환경
+- 외부 서비스 대체 서버, 한국투자증권 시뮬레이터, 6개 에이전트, API 프록시를 로컬 프로세스로 실행
+- 모든 외부 호출을 로컬로 돌리는 환경변수 구성
+- 프로세스별 CPU / 메모리 샘플링
+"""
+import os
+import sys
+import time
+import shutil
+import signal
+import logging
+import tempfile
+import threading
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # /proc 직접 조회로 대체
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+AGENTS_DIR = REPO_ROOT / "agents"
+
+STUB_URL = "http://127.0.0.1:9100"
+STUB_S3_URL = "http://127.0.0.1:9101"
+STUB_NEWS_URLS = ["http://127.0.0.1:9102", "http://127.0.0.1:9103"]  # 뉴스 사이트별 호스트 (대체 서버 미러)
+SIMULATOR_URL = "http://127.0.0.1:9443"
+PROXY_URL = "http://127.0.0.1:8080"
+
+AGENT_URLS = {
+    "macro-agent": "http://127.0.0.1:8001",
+    "ticker-selector": "http://127.0.0.1:8002",
+    "technical-agent": "http://127.0.0.1:8003",
+    "portfolio-manager": "http://127.0.0.1:8004",
+    "trading-agent": "http://127.0.0.1:8005",
+    "auth-agent": "http://127.0.0.1:8006",
+}
+
+STARTUP_TIMEOUT = 60.0
+
+
+@dataclass
+class Service:
+    """실행할 프로세스 정의"""
+    name: str
+    cwd: Path
+    argv: List[str]
+    health_url: str
+    process: Optional[subprocess.Popen] = None
+    log_path: Optional[Path] = None
+
+
+@dataclass
+class ProcessSample:
+    cpu_seconds: float
+    rss_bytes: int
+
+
+def _read_proc(pid: int) -> Optional[ProcessSample]:
+    """/proc 에서 CPU 누적시간과 RSS 조회"""
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            times = proc.cpu_times()
+            return ProcessSample(times.user + times.system, proc.memory_info().rss)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        page = os.sysconf("SC_PAGE_SIZE")
+        # utime, stime 은 14, 15번째 / rss 는 24번째 (comm 이후 기준 -3)
+        return ProcessSample((int(fields[11]) + int(fields[12])) / ticks, int(fields[21]) * page)
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@dataclass
+class ResourceSampler:
+    """주기적으로 프로세스 자원 사용량 기록"""
+    services: List[Service]
+    interval: float = 0.5
+    peaks: Dict[str, int] = field(default_factory=dict)
+    cpu_start: Dict[str, float] = field(default_factory=dict)
+    cpu_end: Dict[str, float] = field(default_factory=dict)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: Optional[threading.Thread] = None
+    _started_at: float = 0.0
+    _stopped_at: float = 0.0
+
+    def start(self):
+        self._stop.clear()
+        self.peaks.clear()
+        self.cpu_start = self._cpu_now()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, Dict[str, float]]:
+        """구간 동안의 CPU 사용률 / 최대 RSS"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._stopped_at = time.perf_counter()
+        self.cpu_end = self._cpu_now()
+        elapsed = max(self._stopped_at - self._started_at, 1e-9)
+        return {
+            name: {
+                "cpu_seconds": round(self.cpu_end.get(name, 0) - self.cpu_start.get(name, 0), 3),
+                "cpu_percent": round((self.cpu_end.get(name, 0) - self.cpu_start.get(name, 0)) / elapsed * 100, 1),
+                "peak_rss_mb": round(self.peaks.get(name, 0) / 1024 / 1024, 1),
+            }
+            for name in self.cpu_start
+        }
+
+    def _cpu_now(self) -> Dict[str, float]:
+        result = {}
+        for service in self.services:
+            if service.process and service.process.poll() is None:
+                sample = _read_proc(service.process.pid)
+                if sample:
+                    result[service.name] = sample.cpu_seconds
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for service in self.services:
+                if service.process and service.process.poll() is None:
+                    sample = _read_proc(service.process.pid)
+                    if sample:
+                        self.peaks[service.name] = max(self.peaks.get(service.name, 0), sample.rss_bytes)
+
+
+class Harness:
+    """전체 에이전트 구성을 로컬에서 실행"""
+
+    def __init__(self, extra_env: Optional[Dict[str, str]] = None, keep_logs: bool = False):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="quartz-bench-"))
+        self.keep_logs = keep_logs
+        self.env = self._build_env(extra_env or {})
+        self.services = self._build_services()
+        self.sampler = ResourceSampler(self.services)
+
+    def _build_env(self, extra_env: Dict[str, str]) -> Dict[str, str]:
+        """모든 외부 호출을 로컬 대체 서버로 향하게 하는 환경변수"""
+        env = dict(os.environ)
+        env.update({
+            "PYTHONUNBUFFERED": "1",
+            # 한국투자증권 → 시뮬레이터
+            "HANSEC_BASE_URL": SIMULATOR_URL,
+            "HANSEC_WS_URL": "ws://127.0.0.1:9443/ws",
+            "HANSEC_INVESTMENT_APP_KEY": "bench-app-key",
+            "HANSEC_INVESTMENT_APP_SECRET_KEY": "bench-app-secret",
+            "HANSEC_INVESTMENT_CANO": "50000000",
+            "HANSEC_INVESTMENT_ACNT_PRDT_CD": "01",
+            "HANSEC_INVESTMENT_HTS_ID": "benchuser",
+            "SIM_TOKEN_MIN_INTERVAL": "0",
+            # OpenAI / Gemini / 거시 데이터 / 뉴스 → 대체 서버
+            "OPENAI_BASE_URL": f"{STUB_URL}/v1",
+            "GPT_API_KEY": "bench-openai-key",
+            "OPENAI_API_KEY": "bench-openai-key",
+            "GEMINI_API_KEY": "bench-gemini-key",
+            "GEMINI_BASE_URL": STUB_URL,
+            "ECOS_API_KEY": "bench-ecos-key",
+            "ECOS_BASE_URL": STUB_URL,
+            "FRED_API_KEY": "bench-fred-key",
+            "FRED_BASE_URL": STUB_URL,
+            "WORLD_BANK_BASE_URL": STUB_URL,
+            "NAVER_FINANCE_BASE_URL": f"{STUB_URL}/naver",
+            "HANKYUNG_BASE_URL": f"{STUB_NEWS_URLS[0]}/hankyung",
+            "MK_BASE_URL": f"{STUB_NEWS_URLS[1]}/mk",
+            # S3 → 대체 서버 (path-style)
+            "AWS_ENDPOINT_URL_S3": STUB_S3_URL,
+            "AWS_ACCESS_KEY_ID": "bench",
+            "AWS_SECRET_ACCESS_KEY": "bench",
+            "AWS_REGION": "ap-northeast-2",
+            "AWS_DEFAULT_REGION": "ap-northeast-2",
+            "AWS_REQUEST_CHECKSUM_CALCULATION": "when_required",
+            "AWS_RESPONSE_CHECKSUM_VALIDATION": "when_required",
+            # 에이전트 간 호출
+            "AUTH_AGENT_URL": AGENT_URLS["auth-agent"],
+            "MACRO_AGENT_URL": AGENT_URLS["macro-agent"],
+            "TICKER_SELECTOR_URL": AGENT_URLS["ticker-selector"],
+            "TECHNICAL_AGENT_URL": AGENT_URLS["technical-agent"],
+            "PORTFOLIO_MANAGER_URL": AGENT_URLS["portfolio-manager"],
+            "TRADING_AGENT_URL": AGENT_URLS["trading-agent"],
+            "TRADING_AGENT_WS_URL": "ws://127.0.0.1:8005/ws/orders",
+            # 자동매매 루프는 끄고 워크로드에서 직접 호출
+            "AUTO_TRADING_ENABLED": "false",
+            "ORDER_STATE_DIR": str(self.work_dir / "trading-state"),
+        })
+        env.update(extra_env)
+        return env
+
+    def _build_services(self) -> List[Service]:
+        python = sys.executable
+        return [
+            Service("stubs", REPO_ROOT / "benchmarks", [python, "stub_server.py"], f"{STUB_URL}/health/live"),
+            Service("kis-simulator", AGENTS_DIR / "kisSimulator", [python, "run.py"], f"{SIMULATOR_URL}/health/live"),
+            Service("auth-agent", AGENTS_DIR / "authAgent", [python, "main.py"],
+                    f"{AGENT_URLS['auth-agent']}/health/live"),
+            Service("macro-agent", AGENTS_DIR / "macroAnalysisAgent", [python, "api_server.py"],
+                    f"{AGENT_URLS['macro-agent']}/health/live"),
+            Service("ticker-selector", AGENTS_DIR / "stockSelectionAgent", [python, "api_server.py"],
+                    f"{AGENT_URLS['ticker-selector']}/health/live"),
+            Service("technical-agent", AGENTS_DIR / "technicalAgent", [python, "main.py"],
+                    f"{AGENT_URLS['technical-agent']}/health/live"),
+            Service("trading-agent", AGENTS_DIR / "tradingAgent", [python, "main.py"],
+                    f"{AGENT_URLS['trading-agent']}/health/live"),
+            Service("portfolio-manager", AGENTS_DIR / "portfolioManager", [python, "main.py"],
+                    f"{AGENT_URLS['portfolio-manager']}/health/live"),
+            Service("api-proxy", REPO_ROOT / "frontend" / "api-proxy", [python, "main.py"],
+                    f"{PROXY_URL}/health/live"),
+        ]
+
+    # ==================== 생명주기 ====================
+
+    def start(self):
+        """순서대로 실행 후 각각 헬스체크 통과까지 대기"""
+        log_dir = self.work_dir / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        for service in self.services:
+            service.log_path = log_dir / f"{service.name}.log"
+            log_file = open(service.log_path, "wb")
+            service.process = subprocess.Popen(
+                service.argv,
+                cwd=service.cwd,
+                env=self.env,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            log_file.close()
+            self._wait_healthy(service)
+            logger.info(f"{service.name} ready (pid {service.process.pid})")
+
+    def _wait_healthy(self, service: Service):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if service.process.poll() is not None:
+                raise RuntimeError(f"{service.name} exited during startup, see {service.log_path}")
+            try:
+                if httpx.get(service.health_url, timeout=1.0).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"{service.name} did not become healthy, see {service.log_path}")
+
+    def stop(self):
+        """역순으로 종료"""
+        for service in reversed(self.services):
+            if service.process and service.process.poll() is None:
+                os.killpg(service.process.pid, signal.SIGTERM)
+                try:
+                    service.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    os.killpg(service.process.pid, signal.SIGKILL)
+        if self.keep_logs:
+            logger.info(f"Logs kept in {self.work_dir / 'logs'}")
+        else:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def __enter__(self) -> "Harness":
+        try:
+            self.start()
+        except Exception:
+            self.keep_logs = True
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
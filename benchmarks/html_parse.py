@@ -0,0 +1,99 @@
+"""
+뉴스 목록 HTML 파싱 마이크로벤치마크 (에이전트 실행 없이 단일 프로세스)
+- 저장된 목록 페이지(benchmarks/fixtures/news/{naver,hankyung,mk}.html)를 각 크롤러의 parse_news_list 로
+  파싱하고 백엔드(soup: BeautifulSoup html.parser / lxml)별 처리량 비교
+- 패리티 확인: 두 백엔드의 파싱 결과(crawled_at 제외)가 다르면 차이를 출력하고 종료 코드 1
+
+사용:
+    python benchmarks/html_parse.py
+    python benchmarks/html_parse.py --repeat 200 --output /tmp/html_parse.json
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+AGENT_DIR = REPO_ROOT / "agents" / "stockSelectionAgent"
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "news"
+sys.path.insert(0, str(AGENT_DIR))
+
+from crawlers import html_parser  # noqa: E402
+from crawlers import NaverFinanceCrawler, HankyungCrawler, MKCrawler  # noqa: E402
+
+CRAWLERS = {
+    "naver": NaverFinanceCrawler,
+    "hankyung": HankyungCrawler,
+    "mk": MKCrawler,
+}
+BACKENDS = ["soup", "lxml"]
+
+
+def parse(crawler, html: str, backend: str) -> List[Dict]:
+    with mock.patch.object(html_parser, "CRAWL_HTML_PARSER", backend):
+        return crawler.parse_news_list(html)
+
+
+def comparable(items: List[Dict]) -> List[Dict]:
+    return [{k: v for k, v in item.items() if k != "crawled_at"} for item in items]
+
+
+def measure(crawler, html: str, backend: str, repeat: int) -> Dict[str, float]:
+    with mock.patch.object(html_parser, "CRAWL_HTML_PARSER", backend):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            crawler.parse_news_list(html)
+        seconds = time.perf_counter() - started
+    return {
+        "seconds": round(seconds, 4),
+        "pages_per_sec": round(repeat / seconds, 1),
+        "ms_per_page": round(seconds / repeat * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="News list HTML parse throughput / parity")
+    parser.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    result = {}
+    mismatches = []
+    for source, crawler_cls in CRAWLERS.items():
+        path = Path(args.fixtures) / f"{source}.html"
+        if not path.exists():
+            print(f"skip {source}: {path} not found")
+            continue
+        html = path.read_text(encoding="utf-8")
+        crawler = crawler_cls()
+
+        parsed = {backend: comparable(parse(crawler, html, backend)) for backend in BACKENDS}
+        parity = parsed["soup"] == parsed["lxml"]
+        if not parity:
+            mismatches.append((source, parsed["soup"], parsed["lxml"]))
+
+        entry = {"items": len(parsed["soup"]), "parity": parity}
+        for backend in BACKENDS:
+            entry[backend] = measure(crawler, html, backend, args.repeat)
+        entry["speedup"] = round(entry["lxml"]["pages_per_sec"] / entry["soup"]["pages_per_sec"], 2)
+        result[source] = entry
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    for source, expected, actual in mismatches:
+        print(f"❌ {source}: soup {len(expected)} items, lxml {len(actual)} items")
+        for before, after in zip(expected, actual):
+            if before != after:
+                print(f"  soup: {before}\n  lxml: {after}")
+                break
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
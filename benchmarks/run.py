@@ -0,0 +1,159 @@
+"""
+벤치마크 실행 스크립트
+
+사용 예:
+    python benchmarks/run.py                                   # 기본 워크로드 전체
+    python benchmarks/run.py --workloads decision,stop_loss --decision-cycles 20
+    python benchmarks/run.py --env SIM_LATENCY_MS=80 --label slow-broker
+
+결과는 benchmarks/results/<시각>_<라벨>.json 에 저장 (compare.py 로 비교)
+"""
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import Harness, STUB_URL, SIMULATOR_URL, AGENT_URLS, REPO_ROOT  # noqa: E402
+from stats import LatencyRecorder  # noqa: E402
+import workloads  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger("benchmarks")
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+ALL_WORKLOADS = ["decision", "stop_loss", "dashboard", "crawl", "macro"]
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _meta(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "label": args.label,
+        "git_sha": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+    }
+
+
+def _snapshot() -> Dict[str, Any]:
+    """실행 후 내부 통계 (주문 큐 / 시뮬레이터 / 외부 호출)"""
+    snapshot = {}
+    for name, url in (
+        ("order_queue", f"{AGENT_URLS['trading-agent']}/api/order-queue/stats"),
+        ("simulator", f"{SIMULATOR_URL}/sim/state"),
+        ("outbound_calls", f"{STUB_URL}/_stats"),
+    ):
+        try:
+            snapshot[name] = httpx.get(url, timeout=10.0).json()
+        except httpx.HTTPError as e:
+            snapshot[name] = {"error": str(e)}
+    return snapshot
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    selected = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    unknown = set(selected) - set(ALL_WORKLOADS)
+    if unknown:
+        raise SystemExit(f"unknown workloads: {', '.join(sorted(unknown))}")
+
+    result: Dict[str, Any] = {"meta": _meta(args), "workloads": {}}
+
+    with Harness(extra_env=extra_env, keep_logs=args.keep_logs) as harness:
+        # 시작 시 분석 작업 등이 정리될 때까지 대기
+        time.sleep(args.warmup)
+        httpx.post(f"{STUB_URL}/_stats/reset")
+
+        for name in selected:
+            logger.info(f"Running workload: {name}")
+            recorder = LatencyRecorder()
+            details: Dict[str, Any] = {}
+            harness.sampler.start()
+            started = time.perf_counter()
+
+            if name == "decision":
+                asyncio.run(workloads.run_decision(recorder, args.decision_cycles, args.decision_concurrency))
+            elif name == "stop_loss":
+                details = asyncio.run(
+                    workloads.run_stop_loss(recorder, harness.env, args.storm_positions, args.storm_orders)
+                )
+            elif name == "dashboard":
+                asyncio.run(workloads.run_dashboard(
+                    recorder, args.dashboard_seconds, args.dashboards, args.dashboard_speedup
+                ))
+            elif name == "crawl":
+                details = workloads.run_crawl(recorder, harness, args.crawl_pages)
+            elif name == "macro":
+                details = workloads.run_macro(recorder, harness)
+
+            result["workloads"][name] = {
+                "wall_seconds": round(time.perf_counter() - started, 3),
+                "latency": recorder.summary(),
+                "resources": harness.sampler.stop(),
+                "details": details,
+            }
+
+        result["snapshot"] = _snapshot()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quartz end-to-end benchmark")
+    parser.add_argument("--workloads", default=",".join(ALL_WORKLOADS))
+    parser.add_argument("--label", default="local")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="에이전트/대체 서버 환경변수 덮어쓰기 (반복 가능)")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--decision-cycles", type=int, default=10)
+    parser.add_argument("--decision-concurrency", type=int, default=1)
+    parser.add_argument("--storm-positions", type=int, default=5)
+    parser.add_argument("--storm-orders", type=int, default=50)
+    parser.add_argument("--dashboard-seconds", type=float, default=60.0)
+    parser.add_argument("--dashboards", type=int, default=5)
+    parser.add_argument("--dashboard-speedup", type=float, default=10.0)
+    parser.add_argument("--crawl-pages", type=int, default=3)
+    parser.add_argument("--output", help="결과 파일 경로 (기본: benchmarks/results/)")
+    parser.add_argument("--keep-logs", action="store_true")
+    args = parser.parse_args()
+
+    result = run(args)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{args.label}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    for name, workload in result["workloads"].items():
+        for op, s in workload["latency"].items():
+            logger.info(
+                f"{name:10s} {op:40s} n={s['count']:<5d} err={s['errors']:<4d} "
+                f"p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms p99={s['p99_ms']:.1f}ms"
+            )
+    logger.info(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
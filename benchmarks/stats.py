@@ -0,0 +1,54 @@
+"""
+지연시간 기록 및 요약 (p50 / p95 / p99 / max / 처리량)
+"""
+import math
+import time
+from typing import Dict, List, Optional
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyRecorder:
+    """작업 이름별 지연시간 / 오류 기록"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._windows: Dict[str, List[float]] = {}  # 이름 -> [처음 시작, 마지막 종료]
+
+    def record(self, name: str, started: float, ok: bool = True, ended: Optional[float] = None):
+        """perf_counter 기준 시작 시각으로 한 건 기록"""
+        ended = ended if ended is not None else time.perf_counter()
+        if ok:
+            self._samples.setdefault(name, []).append(ended - started)
+        else:
+            self._errors[name] = self._errors.get(name, 0) + 1
+        window = self._windows.setdefault(name, [started, ended])
+        window[0] = min(window[0], started)
+        window[1] = max(window[1], ended)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """이름별 요약 (밀리초)"""
+        result = {}
+        for name in sorted(set(self._samples) | set(self._errors)):
+            ordered = sorted(self._samples.get(name, []))
+            errors = self._errors.get(name, 0)
+            start, end = self._windows[name]
+            elapsed = max(end - start, 1e-9)
+            result[name] = {
+                "count": len(ordered),
+                "errors": errors,
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+                "throughput_per_s": round((len(ordered) + errors) / elapsed, 3),
+            }
+        return result
@@ -0,0 +1,642 @@
+"""
+외부 서비스 대체 서버 (벤치마크용)
+- OpenAI Chat Completions (포트폴리오 결정 / 뉴스 감성 분석)
+- Gemini generateContent, ECOS / FRED / World Bank (거시경제 분석)
+- 뉴스 사이트 목록 페이지 (네이버 금융 / 한국경제 / 매일경제, 보관된 헤드라인 사용, ETag 조건부 요청 지원)
+- S3 (path-style PutObject / GetObject / HeadObject / ListObjectsV2)
+- 응답 지연은 환경변수로 조절, 호출 통계는 GET /_stats
+- 포트: 9100 (외부 API), 9101 (S3), 9102·9103 (뉴스 목록 미러)
+"""
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "agent": "bench-stubs", "message": "%(message)s"}'
+)
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+NEWS_ARCHIVE_DIR = REPO_ROOT / "agents" / "stockSelectionAgent" / "data" / "news_raw"
+CANDIDATES_FILE = REPO_ROOT / "agents" / "stockSelectionAgent" / "data" / "stock_candidates.json"
+
+STUB_PORT = int(os.getenv("STUB_PORT", "9100"))
+STUB_S3_PORT = int(os.getenv("STUB_S3_PORT", "9101"))
+# 뉴스 사이트마다 호스트가 달라야 크롤러의 호스트별 제한이 실제와 같아짐 → 같은 앱을 추가 포트에서도 서비스
+STUB_NEWS_PORTS = [int(p) for p in os.getenv("STUB_NEWS_PORTS", "9102,9103").split(",") if p.strip()]
+STUB_BUCKET = os.getenv("S3_BUCKET_NAME", "quartz-bucket")
+
+# 응답 지연 (밀리초)
+OPENAI_LATENCY_MS = float(os.getenv("STUB_OPENAI_LATENCY_MS", "800"))
+OPENAI_MS_PER_TOKEN = float(os.getenv("STUB_OPENAI_MS_PER_TOKEN", "2"))  # 출력 토큰당 생성 시간
+OPENAI_RPS = float(os.getenv("STUB_OPENAI_RPS", "0"))  # 초당 요청 한도 (0 = 제한 없음, 넘으면 429 + retry-after-ms)
+GEMINI_LATENCY_MS = float(os.getenv("STUB_GEMINI_LATENCY_MS", "1500"))
+DATA_API_LATENCY_MS = float(os.getenv("STUB_DATA_API_LATENCY_MS", "50"))
+NEWS_LATENCY_MS = float(os.getenv("STUB_NEWS_LATENCY_MS", "80"))
+S3_LATENCY_MS = float(os.getenv("STUB_S3_LATENCY_MS", "20"))
+
+NEWS_PAGE_SIZE = 20
+
+POSITIVE_WORDS = ("급등", "상승", "호조", "강세", "최대", "흑자", "수주", "돌파", "증가", "개선")
+NEGATIVE_WORDS = ("급락", "하락", "부진", "약세", "적자", "손실", "감소", "우려", "악화", "쇼크")
+
+_rng = random.Random(int(os.getenv("STUB_SEED", "42")))
+
+
+# ==================== 통계 ====================
+
+class CallStats:
+    """서버 측 호출 통계 (이름별 건수/지연)"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+
+    def record(self, name: str, started: float):
+        self._samples.setdefault(name, []).append(time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, values in self._samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                "count": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return result
+
+    def reset(self):
+        self._samples.clear()
+
+
+stats = CallStats()
+
+
+async def _delay(base_ms: float):
+    """기본 지연 ± 20% 흔들림"""
+    if base_ms > 0:
+        await asyncio.sleep(base_ms / 1000 * _rng.uniform(0.8, 1.2))
+
+
+_openai_window: List[float] = []
+
+
+def _openai_rate_limited() -> Optional[Response]:
+    """최근 1초 요청 수가 STUB_OPENAI_RPS 를 넘으면 429 응답"""
+    if OPENAI_RPS <= 0:
+        return None
+    now = time.monotonic()
+    while _openai_window and now - _openai_window[0] >= 1.0:
+        _openai_window.pop(0)
+    if len(_openai_window) >= OPENAI_RPS:
+        retry_ms = int((1.0 - (now - _openai_window[0])) * 1000) + 1
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={"retry-after-ms": str(retry_ms)},
+        )
+    _openai_window.append(now)
+    return None
+
+
+def _approx_tokens(text: str) -> int:
+    """대략적인 토큰 수 (영문 4자, 한글 1.5자 기준)"""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return max(1, int(hangul / 1.5 + (len(text) - hangul) / 4))
+
+
+# ==================== 외부 API (OpenAI / Gemini / 거시 데이터 / 뉴스) ====================
+
+api = FastAPI(title="Quartz benchmark stubs")
+
+
+def _parse_compact_payload(user_content: str) -> Dict[str, Any]:
+    """압축 형식(payload_encoder) 입력 → JSON 입력과 같은 구조 (결정 규칙에 필요한 필드만)"""
+    payload: Dict[str, Any] = {"constraints": {}, "universe": []}
+    lines = user_content.splitlines()
+    header: List[str] = []
+    for line in lines:
+        if line.startswith("macro bias="):
+            payload["macro"] = {"market_bias_hint": line.split("=", 1)[1]}
+        elif line.startswith("limits "):
+            limits = dict(item.split("=", 1) for item in line.split()[1:] if "=" in item)
+            for key, name, cast in (
+                ("max_buy", "max_buy_candidates", int),
+                ("max_sell", "max_sell_candidates", int),
+                ("max_weight", "target_max_single_ticker_weight", float),
+            ):
+                try:
+                    payload["constraints"][name] = cast(limits[key])
+                except (KeyError, ValueError):
+                    pass
+        elif line.startswith("t,"):
+            header = line.split(",")
+        elif line == "events":
+            break
+        elif header and "," in line:
+            row = dict(zip(header, line.split(",")))
+            payload["universe"].append({
+                "ticker": row.get("t", ""),
+                "is_in_portfolio": row.get("h") == "1",
+                "technical": {"day": {"rsi": int(row["rsi"]) if row.get("rsi", "").isdigit() else 50}},
+            })
+    return payload
+
+
+def _decision_content(user_content: str) -> str:
+    """포트폴리오 결정 JSON 생성 (RSI 기반 결정적 규칙)"""
+    try:
+        payload = json.loads(user_content)
+    except json.JSONDecodeError:
+        payload = _parse_compact_payload(user_content)
+
+    constraints = payload.get("constraints", {})
+    max_buy = constraints.get("max_buy_candidates", 3)
+    max_sell = constraints.get("max_sell_candidates", 3)
+    max_weight = constraints.get("target_max_single_ticker_weight", 0.2)
+
+    decisions = []
+    buys = sells = 0
+    for priority, item in enumerate(payload.get("universe", []), 1):
+        rsi = item.get("technical", {}).get("day", {}).get("rsi", 50)
+        action, weight = "HOLD", None
+        if not item.get("is_in_portfolio") and rsi < 60 and buys < max_buy:
+            action, weight = "BUY", round(min(0.1, max_weight), 2)
+            buys += 1
+        elif item.get("is_in_portfolio") and rsi > 70 and sells < max_sell:
+            action, weight = "SELL", 0.0
+            sells += 1
+        decisions.append({
+            "ticker": item.get("ticker", ""),
+            "action": action,
+            "target_weight": weight if weight is not None else 0.0,
+            "priority": priority,
+            "strength": round(abs(rsi - 50) / 50, 2),
+            "reason": f"day RSI {rsi}",
+        })
+
+    return json.dumps({
+        "meta": {
+            "decision_time_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "overall_comment": "Benchmark stub decision."
+        },
+        "global_view": {
+            "macro_bias": payload.get("macro", {}).get("market_bias_hint", "neutral"),
+            "risk_action": "keep_exposure",
+            "target_cash_ratio": 0.3
+        },
+        "ticker_decisions": decisions
+    }, ensure_ascii=False)
+
+
+def _score_content(user_content: str) -> str:
+    """map-reduce 종목 점수 JSON 생성 (RSI 기반 결정적 규칙)"""
+    payload = _parse_compact_payload(user_content)
+    scores = []
+    for item in payload.get("universe", []):
+        rsi = item.get("technical", {}).get("day", {}).get("rsi", 50)
+        scores.append({
+            "ticker": item.get("ticker", ""),
+            "score": round(max(-1.0, min(1.0, (55 - rsi) / 20)), 2),
+            "confidence": 0.8,
+            "reason": f"day RSI {rsi}",
+        })
+    return json.dumps({"scores": scores}, ensure_ascii=False)
+
+
+def _sentiment_content(user_content: str) -> str:
+    """헤드라인 감성 분석 결과 생성 (키워드 기반)"""
+    match = re.search(r"헤드라인 목록:\s*(\[.*?\])\s*\n", user_content, re.S)
+    headlines = json.loads(match.group(1)) if match else []
+    results = []
+    for headline in headlines:
+        pos = sum(word in headline for word in POSITIVE_WORDS)
+        neg = sum(word in headline for word in NEGATIVE_WORDS)
+        score = 0.5 + 0.15 * (pos - neg)
+        score = max(0.05, min(0.95, score))
+        sentiment = "positive" if score > 0.6 else "negative" if score < 0.4 else "neutral"
+        results.append({
+            "headline": headline,
+            "sentiment": sentiment,
+            "score": round(score, 2),
+            "confidence": 0.8,
+            "reasoning": "키워드 기반",
+        })
+    return json.dumps(results, ensure_ascii=False)
+
+
+@api.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    """OpenAI Chat Completions"""
+    started = time.perf_counter()
+    limited = _openai_rate_limited()
+    if limited is not None:
+        stats.record("openai:429", started)
+        return limited
+    messages = body.get("messages", [])
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+    if "Portfolio Management Agent" in system:
+        kind, content = "decision", _decision_content(user)
+    elif "Ticker Scoring Agent" in system:
+        kind, content = "score", _score_content(user)
+    elif "감성 분석" in system:
+        kind, content = "sentiment", _sentiment_content(user)
+    else:
+        kind, content = "other", "{}"
+
+    prompt_tokens = sum(_approx_tokens(m.get("content", "")) for m in messages)
+    completion_tokens = _approx_tokens(content)
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+    completion_id = f"chatcmpl-{hashlib.md5(content.encode()).hexdigest()[:12]}"
+
+    if body.get("stream"):
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(
+            _stream_completion(completion_id, body.get("model", ""), kind, content, usage, include_usage, started),
+            media_type="text/event-stream"
+        )
+
+    await _delay(OPENAI_LATENCY_MS + OPENAI_MS_PER_TOKEN * completion_tokens)
+    stats.record(f"openai:{body.get('model', '')}:{kind}", started)
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", ""),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": usage
+    }
+
+
+async def _stream_completion(
+    completion_id: str, model: str, kind: str, content: str,
+    usage: Dict[str, int], include_usage: bool, started: float
+):
+    """SSE 스트리밍 응답: 첫 토큰 지연 후 약 16자 단위 조각을 토큰 생성 속도에 맞춰 전송"""
+    def event(choices: List[Dict[str, Any]], usage_part: Optional[Dict[str, int]] = None) -> str:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": choices,
+        }
+        if usage_part is not None:
+            chunk["usage"] = usage_part
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+    await _delay(OPENAI_LATENCY_MS)
+    yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+    for i in range(0, len(content), 16):
+        piece = content[i:i + 16]
+        await _delay(OPENAI_MS_PER_TOKEN * _approx_tokens(piece))
+        yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+    yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+    if include_usage:
+        yield event([], usage)
+    yield "data: [DONE]\n\n"
+    stats.record(f"openai:{model}:{kind}", started)
+
+
+@api.post("/v1beta/models/{model_action}")
+async def gemini_generate(model_action: str, body: Dict[str, Any]):
+    """Gemini generateContent"""
+    started = time.perf_counter()
+    prompt = body.get("contents", [{}])[0].get("parts", [{}])[0].get("text", "")
+    if "요약" in prompt:
+        text = "\n".join(f"{i}. 벤치마크용 요약 문장입니다. 성장과 위험 요인이 혼재합니다." for i in range(1, 9))
+    else:
+        sections = ["개요", "한국 평가", "미국 및 주요국 평가", "시나리오별 영향", "포트폴리오 시사점"]
+        text = "\n\n".join(f"## {s}\n" + "벤치마크용 보고서 본문입니다. " * 40 for s in sections)
+    await _delay(GEMINI_LATENCY_MS)
+    stats.record(f"gemini:{model_action.split(':')[0]}", started)
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+def _monthly_series(seed_key: str, start: str, end: str, base: float) -> List[tuple]:
+    """결정적 월별 시계열"""
+    rng = random.Random(seed_key)
+    year, month = int(start[:4]), int(start[4:6])
+    end_year, end_month = int(end[:4]), int(end[4:6])
+    value = base
+    series = []
+    while (year, month) <= (end_year, end_month):
+        value *= 1 + rng.gauss(0, 0.01)
+        series.append((f"{year:04d}{month:02d}", round(value, 3)))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return series
+
+
+@api.get("/api/StatisticSearch/{key}/json/kr/{first}/{last}/{table}/{period}/{start}/{end}/{item:path}")
+async def ecos_search(key: str, first: str, last: str, table: str, period: str, start: str, end: str, item: str):
+    """ECOS 통계조회"""
+    started = time.perf_counter()
+    await _delay(DATA_API_LATENCY_MS)
+    rows = [
+        {"TIME": date, "DATA_VALUE": str(value), "STAT_CODE": table, "ITEM_CODE1": item}
+        for date, value in _monthly_series(f"ecos:{table}:{item}", start, end, 100.0)
+    ]
+    stats.record("ecos", started)
+    return {"StatisticSearch": {"list_total_count": len(rows), "row": rows}}
+
+
+@api.get("/fred/series/observations")
+async def fred_observations(series_id: str, observation_start: str, observation_end: str):
+    """FRED 시계열"""
+    started = time.perf_counter()
+    await _delay(DATA_API_LATENCY_MS)
+    series = _monthly_series(
+        f"fred:{series_id}",
+        observation_start.replace("-", "")[:6],
+        observation_end.replace("-", "")[:6],
+        5.0
+    )
+    stats.record("fred", started)
+    return {"observations": [
+        {"date": f"{d[:4]}-{d[4:6]}-01", "value": str(v)} for d, v in series
+    ]}
+
+
+@api.get("/v2/country/{country}/indicator/{indicator}")
+async def world_bank_series(country: str, indicator: str, date: str = "2015:2024"):
+    """World Bank 지표"""
+    started = time.perf_counter()
+    await _delay(DATA_API_LATENCY_MS)
+    start_year, end_year = (int(x) for x in date.split(":"))
+    rng = random.Random(f"wb:{country}:{indicator}")
+    rows = [
+        {"date": str(year), "value": round(rng.uniform(-1, 5), 2), "countryiso3code": country}
+        for year in range(end_year, start_year - 1, -1)
+    ]
+    stats.record("worldbank", started)
+    return [{"page": 1, "pages": 1, "per_page": 2000, "total": len(rows)}, rows]
+
+
+def _load_archived_headlines() -> Dict[str, List[str]]:
+    """보관된 크롤링 결과에서 소스별 헤드라인 로드"""
+    by_source: Dict[str, List[str]] = {}
+    for path in sorted(NEWS_ARCHIVE_DIR.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            for item in json.load(f).get("news", []):
+                by_source.setdefault(item.get("source", ""), []).append(item["headline"])
+    every = [h for items in by_source.values() for h in items] or ["벤치마크 기본 헤드라인 입니다"]
+    return {
+        "naver": by_source.get("NaverFinance") or every,
+        "hankyung": by_source.get("Hankyung") or every,
+        "mk": by_source.get("MK") or every,
+    }
+
+
+ARCHIVED_HEADLINES = _load_archived_headlines()
+
+
+def _page_headlines(site: str, page: int) -> List[tuple]:
+    """페이지별 (기사번호, 헤드라인) 목록 (보관 헤드라인 순환)"""
+    headlines = ARCHIVED_HEADLINES[site]
+    start = (page - 1) * NEWS_PAGE_SIZE
+    return [
+        (start + i, headlines[(start + i) % len(headlines)])
+        for i in range(NEWS_PAGE_SIZE)
+    ]
+
+
+NEWS_LAST_MODIFIED = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")  # 목록 내용은 고정
+
+
+def _news_page(request: Request, html: str) -> Response:
+    """ETag / Last-Modified 를 붙이고, 조건부 요청이 일치하면 304"""
+    etag = _etag(html.encode("utf-8"))
+    headers = {"ETag": etag, "Last-Modified": NEWS_LAST_MODIFIED}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
+
+
+@api.get("/naver/news/news_list.naver", response_class=HTMLResponse)
+async def naver_news_list(request: Request, page: int = 1):
+    """네이버 금융 뉴스 목록"""
+    started = time.perf_counter()
+    await _delay(NEWS_LATENCY_MS)
+    items = "".join(
+        f'<dd class="articleSubject"><a href="/news/news_read.naver?article_id={n:010d}&page={page}">{escape(h)}</a>'
+        f'<span class="press">벤치마크</span><span class="wdate">2025-12-02 09:00</span></dd>'
+        for n, h in _page_headlines("naver", page)
+    )
+    stats.record("news:naver", started)
+    return _news_page(request, f'<html><body><div class="newsList"><dl>{items}</dl></div></body></html>')
+
+
+@api.get("/hankyung/economy/macro", response_class=HTMLResponse)
+async def hankyung_news_list(request: Request, page: int = 1):
+    """한국경제 뉴스 목록"""
+    started = time.perf_counter()
+    await _delay(NEWS_LATENCY_MS)
+    items = "".join(
+        f'<li><h2 class="news-tit"><a href="https://www.hankyung.com/article/{n:012d}">{escape(h)}</a></h2>'
+        f'<p class="summary">{escape(h)}</p><span class="date">2025.12.02 09:00</span></li>'
+        for n, h in _page_headlines("hankyung", page)
+    )
+    stats.record("news:hankyung", started)
+    return _news_page(request, f'<html><body><ul class="news-list">{items}</ul></body></html>')
+
+
+@api.get("/mk/news/economy/", response_class=HTMLResponse)
+async def mk_news_list(request: Request, page: int = 1):
+    """매일경제 뉴스 목록"""
+    started = time.perf_counter()
+    await _delay(NEWS_LATENCY_MS)
+    items = "".join(
+        f'<li class="news_node"><a href="/news/economy/{n:08d}"><h3 class="news_ttl">{escape(h)}</h3>'
+        f'<p class="news_desc">{escape(h)}</p></a><span class="time">09:00</span></li>'
+        for n, h in _page_headlines("mk", page)
+    )
+    stats.record("news:mk", started)
+    return _news_page(request, f'<html><body><ul class="news_list">{items}</ul></body></html>')
+
+
+@api.get("/_stats")
+async def get_stats():
+    """호출 통계"""
+    return stats.summary()
+
+
+@api.post("/_stats/reset")
+async def reset_stats():
+    stats.reset()
+    return {"status": "reset"}
+
+
+@api.get("/health/live")
+async def api_health():
+    return {"status": "ok"}
+
+
+# ==================== S3 ====================
+
+s3 = FastAPI(title="Quartz benchmark S3 stub")
+
+# bucket -> key -> (body, last_modified)
+_objects: Dict[str, Dict[str, tuple]] = {}
+
+
+def _put(bucket: str, key: str, body: bytes, last_modified: Optional[datetime] = None):
+    _objects.setdefault(bucket, {})[key] = (body, last_modified or datetime.now(timezone.utc))
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _s3_error(code: str, message: str, status: int, key: str = "") -> Response:
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<Error><Code>{code}</Code><Message>{escape(message)}</Message><Key>{escape(key)}</Key></Error>"
+    )
+    return Response(content=xml, status_code=status, media_type="application/xml")
+
+
+def _decode_aws_chunked(data: bytes) -> bytes:
+    """aws-chunked 전송 본문 복원 (체크섬 trailer 무시)"""
+    out = bytearray()
+    pos = 0
+    while pos < len(data):
+        line_end = data.index(b"\r\n", pos)
+        size = int(data[pos:line_end].split(b";")[0], 16)
+        if size == 0:
+            break
+        start = line_end + 2
+        out += data[start:start + size]
+        pos = start + size + 2
+    return bytes(out)
+
+
+def seed_objects():
+    """벤치마크 시작 데이터 (종목 후보 / 거시경제 보고서)"""
+    if CANDIDATES_FILE.exists():
+        _put(STUB_BUCKET, "select-ticker/stock_candidates.json", CANDIDATES_FILE.read_bytes())
+
+    stamp = (datetime.now() - timedelta(hours=1)).strftime("%Y%m%d_%H%M%S")
+    paragraph = "경기 둔화 우려에도 수출 회복과 금리 인하 기대가 이어지고 있습니다. "
+    for kind in ("Positive", "Negative"):
+        full = f"# Macro Report ({kind})\n\n" + paragraph * 60
+        short = paragraph * 8
+        _put(STUB_BUCKET, f"macro-analysis/Report_{kind}_{stamp}.md", full.encode("utf-8"))
+        _put(STUB_BUCKET, f"macro-analysis/Report_{kind}_{stamp}_short.md", short.encode("utf-8"))
+
+
+@s3.get("/{bucket}")
+async def list_objects(bucket: str, request: Request):
+    """ListObjectsV2"""
+    started = time.perf_counter()
+    await _delay(S3_LATENCY_MS)
+    prefix = request.query_params.get("prefix", "")
+    max_keys = int(request.query_params.get("max-keys", "1000"))
+    keys = sorted(k for k in _objects.get(bucket, {}) if k.startswith(prefix))[:max_keys]
+    contents = "".join(
+        f"<Contents><Key>{escape(k)}</Key>"
+        f"<LastModified>{_objects[bucket][k][1].strftime('%Y-%m-%dT%H:%M:%S.000Z')}</LastModified>"
+        f"<ETag>{escape(_etag(_objects[bucket][k][0]))}</ETag><Size>{len(_objects[bucket][k][0])}</Size>"
+        f"<StorageClass>STANDARD</StorageClass></Contents>"
+        for k in keys
+    )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+        f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix><KeyCount>{len(keys)}</KeyCount>"
+        f"<MaxKeys>{max_keys}</MaxKeys><IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+    )
+    stats.record("s3:ListObjectsV2", started)
+    return Response(content=xml, media_type="application/xml")
+
+
+@s3.get("/{bucket}/{key:path}")
+async def get_object(bucket: str, key: str):
+    """GetObject"""
+    started = time.perf_counter()
+    await _delay(S3_LATENCY_MS)
+    stats.record("s3:GetObject", started)
+    obj = _objects.get(bucket, {}).get(key)
+    if obj is None:
+        return _s3_error("NoSuchKey", "The specified key does not exist.", 404, key)
+    body, modified = obj
+    return Response(content=body, media_type="application/octet-stream", headers={
+        "ETag": _etag(body),
+        "Last-Modified": modified.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+    })
+
+
+@s3.head("/{bucket}/{key:path}")
+async def head_object(bucket: str, key: str):
+    """HeadObject"""
+    started = time.perf_counter()
+    await _delay(S3_LATENCY_MS)
+    stats.record("s3:HeadObject", started)
+    obj = _objects.get(bucket, {}).get(key)
+    if obj is None:
+        return Response(status_code=404)
+    return Response(headers={"ETag": _etag(obj[0]), "Content-Length": str(len(obj[0]))})
+
+
+@s3.put("/{bucket}/{key:path}")
+async def put_object(bucket: str, key: str, request: Request):
+    """PutObject"""
+    started = time.perf_counter()
+    body = await request.body()
+    if "aws-chunked" in request.headers.get("content-encoding", ""):
+        body = _decode_aws_chunked(body)
+    await _delay(S3_LATENCY_MS)
+    _put(bucket, key, body)
+    stats.record("s3:PutObject", started)
+    return Response(headers={"ETag": _etag(body)})
+
+
+@s3.get("/")
+async def s3_health():
+    return {"status": "ok"}
+
+
+async def main():
+    seed_objects()
+    servers = [
+        uvicorn.Server(uvicorn.Config(api, host="127.0.0.1", port=STUB_PORT, log_level="warning")),
+        uvicorn.Server(uvicorn.Config(s3, host="127.0.0.1", port=STUB_S3_PORT, log_level="warning")),
+    ] + [
+        uvicorn.Server(uvicorn.Config(api, host="127.0.0.1", port=port, log_level="warning"))
+        for port in STUB_NEWS_PORTS
+    ]
+    logger.info(
+        f"Stubs listening on {STUB_PORT} (external APIs), {STUB_S3_PORT} (S3) "
+        f"and {STUB_NEWS_PORTS} (news mirrors)"
+    )
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+종목 매칭 마이크로벤치마크 (에이전트 실행 없이 단일 프로세스)
+- 보관된 뉴스 파일(agents/stockSelectionAgent/data/news_raw/*.json)의 헤드라인+요약으로
+  기존 키워드 순회 방식과 StockDictionary.find_tickers(Aho-Corasick) 처리량 비교
+- --synthetic N: 가상 종목 N개(종목당 키워드 3개)를 사전에 추가해서 전체 상장사 규모를 흉내냄
+
+사용:
+    python benchmarks/ticker_match.py
+    python benchmarks/ticker_match.py --synthetic 2500 --repeat 20
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+AGENT_DIR = REPO_ROOT / "agents" / "stockSelectionAgent"
+sys.path.insert(0, str(AGENT_DIR))
+
+from stock_match.stock_dictionary import StockDictionary  # noqa: E402
+
+
+def load_texts(paths: List[Path]) -> List[str]:
+    texts = []
+    for path in paths:
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, encoding="utf-8") as f:
+                for item in json.load(f).get("news", []):
+                    texts.append(f"{item.get('headline', '')} {item.get('summary', '')}")
+    return texts
+
+
+def add_synthetic(dictionary: StockDictionary, count: int, seed: int = 7):
+    """가상 종목 추가 (실제 헤드라인에는 거의 등장하지 않는 한글 조합)"""
+    rng = random.Random(seed)
+    syllables = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초"
+    for i in range(count):
+        ticker = f"9{i:05d}"
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(3, 5)))
+        dictionary.ticker_to_name[ticker] = name
+        dictionary.keywords[ticker] = [name, f"{name}홀딩스", f"{name} 우"]
+    dictionary._automaton = None
+
+
+def legacy_find_tickers(dictionary: StockDictionary) -> Callable[[str], List[str]]:
+    """기존 구현 (종목 × 키워드마다 `keyword in text`)"""
+    keywords = dictionary.keywords
+
+    def find(text: str) -> List[str]:
+        found = set()
+        for ticker, words in keywords.items():
+            for keyword in words:
+                if keyword in text:
+                    found.add(ticker)
+                    break
+        return list(found)
+    return find
+
+
+def measure(find: Callable[[str], List[str]], texts: List[str], repeat: int) -> Dict[str, float]:
+    matches = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            matches += len(find(text))
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": round(seconds, 4),
+        "texts_per_sec": round(len(texts) * repeat / seconds, 1),
+        "matches_per_sec": round(matches / seconds, 1),
+        "matches": matches // repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ticker matcher throughput")
+    parser.add_argument("paths", nargs="*", default=[str(AGENT_DIR / "data" / "news_raw")])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--synthetic", type=int, default=0, help="가상 종목 수")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    texts = load_texts([Path(p) for p in args.paths])
+    if not texts:
+        raise SystemExit("no news texts found")
+
+    dictionary = StockDictionary()
+    if args.synthetic:
+        add_synthetic(dictionary, args.synthetic)
+
+    started = time.perf_counter()
+    automaton = dictionary.automaton
+    build_ms = (time.perf_counter() - started) * 1000
+
+    legacy = legacy_find_tickers(dictionary)
+    result = {
+        "texts": len(texts),
+        "tickers": len(dictionary.keywords),
+        "keywords": automaton.size,
+        "automaton_build_ms": round(build_ms, 2),
+        "legacy": measure(legacy, texts, args.repeat),
+        "automaton": measure(dictionary.find_tickers, texts, args.repeat),
+    }
+    result["speedup"] = round(result["automaton"]["texts_per_sec"] / result["legacy"]["texts_per_sec"], 2)
+
+    # 결과 차이: 긴 키워드 우선 규칙으로 빠지는 짧은 키워드 매칭 (예: "삼성SDI" 의 "삼성")
+    changed = [
+        (text, sorted(legacy(text)), sorted(dictionary.find_tickers(text)))
+        for text in texts
+        if set(legacy(text)) != set(dictionary.find_tickers(text))
+    ]
+    result["differing_texts"] = len(changed)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    for text, before, after in changed[:5]:
+        print(f"  {text[:50]!r}: {before} -> {after}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+벤치마크 워크로드
+- decision: 포트폴리오 매매 결정 사이클 (PM → 종목선정/거시/기술적 분석 → GPT → 주문)
+- stop_loss: 보유 종목 급락 후 손절 점검 + 손절 주문 동시 폭주 (/ws/orders)
+- dashboard: 대시보드 폴링 (API 프록시 경유, 주기 압축)
+- crawl: 뉴스 크롤링 + 파이프라인 배치
+- macro: 거시경제 분석 배치
+"""
+import sys
+import json
+import time
+import uuid
+import asyncio
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+import websockets
+
+from harness import AGENT_URLS, PROXY_URL, SIMULATOR_URL, REPO_ROOT, AGENTS_DIR, Harness
+from stats import LatencyRecorder
+
+PM_URL = AGENT_URLS["portfolio-manager"]
+TRADING_URL = AGENT_URLS["trading-agent"]
+TRADING_WS_URL = "ws://127.0.0.1:8005/ws/orders"
+ORDER_SETTLE_SECONDS = 2.0  # 체결통보가 저널에 반영될 때까지 대기
+
+# 대시보드 폴링 주기 (초, frontend 기준)
+DASHBOARD_POLLS = [
+    ("GET", "/api/health/agents", 10),
+    ("GET", "/api/portfolio", 30),
+    ("POST", "/api/candidates", 60),
+    ("GET", "/api/token-status", 60),
+]
+
+STORM_TICKERS = ["005930", "000660", "373220", "207940", "005380", "035420", "051910", "006400"]
+
+
+async def run_decision(recorder: LatencyRecorder, cycles: int, concurrency: int = 1):
+    """매매 결정 사이클 반복"""
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(timeout=300.0) as client:
+        async def cycle():
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"{PM_URL}/api/decision")
+                    recorder.record("pm.decision", started, response.status_code == 200)
+                except httpx.HTTPError:
+                    recorder.record("pm.decision", started, False)
+
+        await asyncio.gather(*(cycle() for _ in range(cycles)))
+
+
+async def _sim_token(client: httpx.AsyncClient, env: Dict[str, str]) -> Dict[str, str]:
+    """시뮬레이터 직접 주문용 헤더"""
+    response = await client.post(f"{SIMULATOR_URL}/oauth2/tokenP", json={
+        "grant_type": "client_credentials",
+        "appkey": env["HANSEC_INVESTMENT_APP_KEY"],
+        "appsecret": env["HANSEC_INVESTMENT_APP_SECRET_KEY"],
+    })
+    response.raise_for_status()
+    return {
+        "authorization": f"Bearer {response.json()['access_token']}",
+        "appkey": env["HANSEC_INVESTMENT_APP_KEY"],
+        "appsecret": env["HANSEC_INVESTMENT_APP_SECRET_KEY"],
+    }
+
+
+async def _seed_positions(client: httpx.AsyncClient, env: Dict[str, str], tickers: List[str], qty: int):
+    """시장가 매수로 보유 종목 생성"""
+    headers = await _sim_token(client, env)
+    for ticker in tickers:
+        response = await client.post(
+            f"{SIMULATOR_URL}/uapi/domestic-stock/v1/trading/order-cash",
+            headers={**headers, "tr_id": "TTTC0802U"},
+            json={
+                "CANO": env["HANSEC_INVESTMENT_CANO"],
+                "ACNT_PRDT_CD": env["HANSEC_INVESTMENT_ACNT_PRDT_CD"],
+                "PDNO": ticker,
+                "ORD_DVSN": "01",
+                "ORD_QTY": str(qty),
+                "ORD_UNPR": "0",
+            }
+        )
+        response.raise_for_status()
+
+
+async def _send_order_burst(recorder: LatencyRecorder, orders: List[Dict[str, Any]]):
+    """한 연결로 주문을 한꺼번에 보내고 request_id 별 응답 시간 기록"""
+    sent_at: Dict[str, float] = {}
+    async with websockets.connect(TRADING_WS_URL, max_size=None) as ws:
+        for order in orders:
+            sent_at[order["request_id"]] = time.perf_counter()
+            await ws.send(json.dumps(order))
+
+        pending = set(sent_at)
+        while pending:
+            message = json.loads(await asyncio.wait_for(ws.recv(), timeout=120))
+            if message.get("type") == "ping":
+                await ws.send(json.dumps({"type": "pong"}))
+                continue
+            request_id = message.get("request_id")
+            if request_id not in pending:
+                continue
+            pending.discard(request_id)
+            ok = message.get("status") == "success"
+            name = "trading.ws_order" if ok else f"trading.ws_order.{message.get('status', 'failed')}"
+            recorder.record(name, sent_at[request_id], ok)
+
+
+async def run_stop_loss(
+    recorder: LatencyRecorder, env: Dict[str, str], positions: int, burst: int
+) -> Dict[str, Any]:
+    """
+    손절 폭주 시나리오
+    1) 보유 종목 생성 → 2) 10% 급락 → 3) 손절 주문 burst 건 동시 전송 → 4) PM 손절 점검 (잔량 청산)
+    5) 확인: 시장가 주문은 주문 응답보다 체결통보가 먼저 오므로, 체결된 주문이 저널에 미체결로 남지 않아야 함
+    """
+    tickers = STORM_TICKERS[:positions]
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        await client.post(f"{SIMULATOR_URL}/sim/reset")
+        await _seed_positions(client, env, tickers, qty=burst // len(tickers) + 10)
+
+        state = (await client.get(f"{SIMULATOR_URL}/sim/state")).json()
+        for holding in state["holdings"]:
+            await client.post(f"{SIMULATOR_URL}/sim/price", json={
+                "ticker": holding["ticker"],
+                "price": int(holding["avg_price"] * 0.9),
+            })
+
+        now = datetime.utcnow().isoformat() + "Z"
+        orders = [
+            {
+                "request_id": f"bench-{uuid.uuid4().hex[:12]}",
+                "action": "sell",
+                "ticker": tickers[i % len(tickers)],
+                "qty": 1,
+                "order_type": "market",
+                "price": 0,
+                "timestamp": now,
+                "reason": "stop_loss",
+            }
+            for i in range(burst)
+        ]
+        await _send_order_burst(recorder, orders)
+
+        started = time.perf_counter()
+        response = await client.post(f"{PM_URL}/api/risk-check")
+        recorder.record("pm.risk_check", started, response.status_code == 200)
+
+        await asyncio.sleep(ORDER_SETTLE_SECONDS)
+        sent = {order["request_id"] for order in orders}
+        open_orders = (await client.get(f"{TRADING_URL}/api/open-orders")).json()
+        stale = [o for o in open_orders["orders"] if o.get("request_id") in sent]
+        if stale:
+            print(f"WARNING: {len(stale)} burst orders still open in the journal", file=sys.stderr)
+        return {"stale_open_orders": len(stale), "journal": open_orders["stats"]}
+
+
+async def run_dashboard(recorder: LatencyRecorder, duration: float, dashboards: int, speedup: float):
+    """대시보드 폴링 (frontend 주기를 speedup 배 압축)"""
+    deadline = time.perf_counter() + duration
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        async def poll(method: str, path: str, interval: float):
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, f"{PROXY_URL}{path}", json={} if method == "POST" else None)
+                    recorder.record(f"proxy.{method} {path}", started, response.status_code == 200)
+                except httpx.HTTPError:
+                    recorder.record(f"proxy.{method} {path}", started, False)
+                await asyncio.sleep(max(0.0, interval / speedup - (time.perf_counter() - started)))
+
+        await asyncio.gather(*(
+            poll(method, path, interval)
+            for _ in range(dashboards)
+            for method, path, interval in DASHBOARD_POLLS
+        ))
+
+
+def _run_driver(harness: Harness, job: str, agent_dir: str, *args: str) -> Dict[str, Any]:
+    """배치 작업을 임시 작업 디렉터리에서 하위 프로세스로 실행"""
+    work_dir = harness.work_dir / job
+    work_dir.mkdir(parents=True, exist_ok=True)
+    env = {**harness.env, "PYTHONPATH": str(AGENTS_DIR / agent_dir)}
+    completed = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "benchmarks" / "drivers.py"), job, *args],
+        cwd=work_dir, env=env, capture_output=True, text=True, timeout=3600
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{job} driver failed: {completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_crawl(recorder: LatencyRecorder, harness: Harness, pages: int) -> Dict[str, Any]:
+    """뉴스 크롤링 + 파이프라인 1회, 이어서 재크롤링 1회"""
+    started = time.perf_counter()
+    timings = _run_driver(harness, "crawl", "stockSelectionAgent", str(pages))
+    crawl_end = started + timings["crawl_seconds"]
+    recorder.record("crawler.crawl", started, ended=crawl_end)
+    recorder.record("crawler.pipeline", crawl_end, ended=crawl_end + timings["pipeline_seconds"])
+    recrawl_start = crawl_end + timings["pipeline_seconds"]
+    recorder.record("crawler.recrawl", recrawl_start, ended=recrawl_start + timings["recrawl_seconds"])
+    return timings
+
+
+def run_macro(recorder: LatencyRecorder, harness: Harness) -> Dict[str, Any]:
+    """거시경제 분석 1회"""
+    started = time.perf_counter()
+    timings = _run_driver(harness, "macro", "macroAnalysisAgent")
+    recorder.record("macro.analysis", started, timings["success"], ended=started + timings["analysis_seconds"])
+    return timings
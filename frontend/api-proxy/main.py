@@ -5,9 +5,11 @@ Quartz Frontend API Proxy Server
 - 포트: 8080
 """
 import os
+import sys
 import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 import httpx
@@ -15,6 +17,11 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+# 공용 모듈 (agents/common, 컨테이너에서는 /app/common)
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "agents"))
+from common.metrics import setup_metrics, http_client  # noqa: E402
+from common.tracing import setup_tracing  # noqa: E402
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -45,6 +52,8 @@ app = FastAPI(
     description="프론트엔드용 API 프록시 서버",
     version="1.0.0"
 )
+setup_metrics(app)
+setup_tracing(app, "api-proxy")
 
 # CORS 설정
 app.add_middleware(
@@ -111,7 +120,7 @@ async def check_all_agents_health():
         ready = False
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with http_client(timeout=5.0) as client:
                 # Liveness check
                 try:
                     response = await client.get(f"{agent['url']}/health/live")
@@ -150,7 +159,7 @@ async def check_all_agents_health():
 async def get_portfolio():
     """포트폴리오 현황 조회"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(f"{PORTFOLIO_MANAGER_URL}/api/portfolio")
             
             if response.status_code == 200:
@@ -169,7 +178,7 @@ async def get_portfolio():
 async def get_candidates(request: CandidatesRequest):
     """후보 종목 조회"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.post(
                 f"{TICKER_SELECTOR_URL}/api/candidates",
                 json={"top_n": request.top_n}
@@ -202,7 +211,7 @@ async def get_candidates(request: CandidatesRequest):
 async def get_technical_analysis(request: TechnicalRequest):
     """기술적 분석 조회"""
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client(timeout=60.0) as client:
             response = await client.post(
                 f"{TECHNICAL_AGENT_URL}/result/analysis",
                 json={"ticker": request.ticker}
@@ -224,7 +233,7 @@ async def get_technical_analysis(request: TechnicalRequest):
 async def get_token_status():
     """인증 토큰 상태 조회"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             response = await client.get(f"{AUTH_AGENT_URL}/result/auth-token/status")
             
             if response.status_code == 200:
@@ -243,7 +252,7 @@ async def get_token_status():
 async def get_macro_summary():
     """거시경제 요약 조회 (요약본)"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(f"{MACRO_AGENT_URL}/result/analysis")
             
             if response.status_code == 200:
@@ -268,7 +277,7 @@ async def get_macro_summary():
 async def get_macro_full():
     """거시경제 원본 보고서 조회"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client(timeout=30.0) as client:
             response = await client.get(f"{MACRO_AGENT_URL}/result/analysis/full")
             
             if response.status_code == 200:
@@ -295,7 +304,7 @@ async def get_macro_full():
 async def trigger_decision():
     """수동 매매 결정 트리거"""
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client(timeout=120.0) as client:
             response = await client.post(f"{PORTFOLIO_MANAGER_URL}/api/decision")
             
             if response.status_code == 200:
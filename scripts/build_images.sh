@@ -27,7 +27,7 @@ IMAGES=(
     "trading-agent:agents/tradingAgent/Dockerfile:."
     "portfolio-manager:agents/portfolioManager/Dockerfile:."
     "frontend:frontend/Dockerfile:frontend/"
-    "api-proxy:frontend/api-proxy/Dockerfile:frontend/api-proxy/"
+    "api-proxy:frontend/api-proxy/Dockerfile:."
 )
 
 TOTAL=${#IMAGES[@]}
@@ -0,0 +1,174 @@
+"""
+추적 결과 보기 (agents/common/tracing.py 가 TRACE_DIR 에 기록한 span)
+
+사용 예:
+    python scripts/trace_view.py /tmp/traces --list                      # trace 목록
+    python scripts/trace_view.py /tmp/traces                             # 가장 최근 매매 결정 사이클
+    python scripts/trace_view.py /tmp/traces --root "POST /api/risk-check"
+    python scripts/trace_view.py /tmp/traces --trace <trace_id>
+
+span 트리(서비스/시작 오프셋/소요 시간)와 임계 경로(critical path)를 출력합니다.
+임계 경로의 각 구간은 '*' 로 표시되고, 마지막에 구간별 고유 시간(임계 경로 위 자식 구간 제외)을 요약합니다.
+"""
+import sys
+import json
+import argparse
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_ROOTS = ("POST /api/decision", "decision_cycle")
+BAR_WIDTH = 40
+
+
+class SpanNode:
+    """트리 표시용 span"""
+
+    def __init__(self, raw: Dict):
+        self.raw = raw
+        self.span_id: str = raw["spanId"]
+        self.parent_id: Optional[str] = raw.get("parentSpanId")
+        self.name: str = raw["name"]
+        self.service: str = raw.get("service", "?")
+        self.status: str = raw.get("status", "ok")
+        self.start: int = raw["startTimeUnixNano"]
+        self.end: int = raw["endTimeUnixNano"]
+        self.children: List["SpanNode"] = []
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) / 1e6
+
+
+def load_spans(paths: Iterable[str]) -> Dict[str, List[Dict]]:
+    """*.jsonl 파일(또는 디렉터리)을 읽어 trace id 별로 묶기"""
+    traces: Dict[str, List[Dict]] = defaultdict(list)
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        span = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 기록 중이던 마지막 줄
+                    traces[span["traceId"]].append(span)
+    return traces
+
+
+def build_tree(spans: List[Dict]) -> List[SpanNode]:
+    """부모-자식 연결 후 최상위 span 목록 반환 (부모가 기록되지 않은 span 도 최상위로)"""
+    nodes = {span["spanId"]: SpanNode(span) for span in spans}
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id) if node.parent_id else None
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+    for node in nodes.values():
+        node.children.sort(key=lambda n: n.start)
+    return sorted(roots, key=lambda n: n.start)
+
+
+def critical_path(node: SpanNode) -> List[SpanNode]:
+    """
+    임계 경로: 끝에서부터 거슬러 올라가며 '현재 시점 이전에 끝난 자식 중 가장 늦게 끝난 것'을 선택
+    (그 자식이 늦어지면 부모 완료도 그만큼 늦어짐)
+    """
+    chosen = []
+    cursor = node.end
+    for child in sorted(node.children, key=lambda n: n.end, reverse=True):
+        if child.end <= cursor:
+            chosen.append(child)
+            cursor = child.start
+    path = [node]
+    for child in reversed(chosen):
+        path.extend(critical_path(child))
+    return path
+
+
+def self_time_ms(node: SpanNode, path_ids: set) -> float:
+    """임계 경로 위의 자식 구간을 뺀 고유 시간"""
+    on_path = sum(c.end - c.start for c in node.children if c.span_id in path_ids)
+    return max(0, node.end - node.start - on_path) / 1e6
+
+
+def render(root: SpanNode, top: int = 15) -> str:
+    path = critical_path(root)
+    path_ids = {n.span_id for n in path}
+    total = max(root.end - root.start, 1)
+    lines = [f"trace {root.raw['traceId']}  {root.name}  {root.duration_ms:.1f} ms", ""]
+
+    def walk(node: SpanNode, depth: int):
+        offset = (node.start - root.start) / total
+        width = max(1, round((node.end - node.start) / total * BAR_WIDTH))
+        left = min(BAR_WIDTH - 1, round(offset * BAR_WIDTH))
+        bar = " " * left + "█" * min(width, BAR_WIDTH - left)
+        mark = "*" if node.span_id in path_ids else " "
+        status = "" if node.status == "ok" else f"  [{node.status}]"
+        label = f"{'  ' * depth}{node.name}"
+        lines.append(
+            f"{mark} {bar:<{BAR_WIDTH}} {(node.start - root.start) / 1e6:>9.1f} {node.duration_ms:>9.1f}  "
+            f"{node.service:<18} {label}{status}"
+        )
+        for child in node.children:
+            walk(child, depth + 1)
+
+    lines.append(f"  {'':<{BAR_WIDTH}} {'start ms':>9} {'dur ms':>9}  {'service':<18} span")
+    walk(root, 0)
+
+    # 같은 서비스/이름의 구간은 합산 (예: 종목별 기술적 분석 호출)
+    summary: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+    for node in path:
+        entry = summary[(node.service, node.name)]
+        entry[0] += self_time_ms(node, path_ids)
+        entry[1] += 1
+
+    lines += ["", f"critical path (self time, top {top}):"]
+    ranked = sorted(summary.items(), key=lambda item: item[1][0], reverse=True)
+    for (service, name), (own, count) in ranked[:top]:
+        lines.append(
+            f"  {own:>9.1f} ms {own / (total / 1e6) * 100:>5.1f}%  x{count:<3d} {service:<18} {name}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render span tree and critical path")
+    parser.add_argument("paths", nargs="+", help="TRACE_DIR 또는 *.jsonl 파일")
+    parser.add_argument("--trace", help="trace id")
+    parser.add_argument("--root", action="append", help=f"최상위 span 이름 (기본: {', '.join(DEFAULT_ROOTS)})")
+    parser.add_argument("--last", type=int, default=1, help="최근 N개 표시")
+    parser.add_argument("--top", type=int, default=15, help="임계 경로 요약 항목 수")
+    parser.add_argument("--list", action="store_true", help="trace 목록만 출력")
+    args = parser.parse_args()
+
+    traces = load_spans(args.paths)
+    roots = [root for spans in traces.values() for root in build_tree(spans) if root.parent_id is None]
+    roots.sort(key=lambda n: n.start)
+
+    if args.list:
+        for root in roots:
+            count = len(traces[root.raw["traceId"]])
+            print(f"{root.raw['traceId']}  {root.duration_ms:>9.1f} ms  {count:>4} spans  {root.service:<18} {root.name}")
+        return
+
+    if args.trace:
+        selected = [root for root in roots if root.raw["traceId"] == args.trace]
+    else:
+        names = args.root or DEFAULT_ROOTS
+        selected = [root for root in roots if root.name in names][-args.last:]
+
+    if not selected:
+        print("no matching trace (use --list)", file=sys.stderr)
+        sys.exit(1)
+
+    print("\n\n".join(render(root, args.top) for root in selected))
+
+
+if __name__ == "__main__":
+    main()